@@ -0,0 +1,143 @@
+"""Batch mode for PPTChecker: check a directory or glob of presentations"""
+
+import argparse
+import glob
+import html
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from lazypackage import lazy_presentation
+from pptchecker import check_presentation
+from util import (
+    DEFAULT_CONFIG_PATH,
+    display_comments_on_webpage,
+    initialize_word_set,
+    read_config_yaml,
+)
+
+parser = argparse.ArgumentParser(description='Analyze a batch of presentations')
+parser.add_argument('presentations', type=str,
+                    help="directory or glob pattern of .pptx files")
+parser.add_argument('-o', '--output-dir', type=str, default="reports")
+parser.add_argument('-c', '--config', type=str, default=DEFAULT_CONFIG_PATH)
+parser.add_argument('-j', '--jobs', type=int, default=None,
+                    help="number of worker processes (default: CPU count)")
+
+# Loaded once per worker process by init_worker
+_worker_config = None
+_worker_wordset = None
+
+
+def find_presentations(pattern):
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.pptx")
+    return sorted(path for path in glob.glob(pattern) if path.endswith(".pptx"))
+
+
+def assign_report_names(paths):
+    report_names = []
+    used = set()
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        report_name = f"{stem}.html"
+        suffix = 1
+        while report_name in used:
+            suffix += 1
+            report_name = f"{stem}_{suffix}.html"
+        used.add(report_name)
+        report_names.append(report_name)
+    return report_names
+
+
+def init_worker(config_path):
+    global _worker_config, _worker_wordset
+    _worker_config = read_config_yaml(config_path)
+    _worker_wordset = initialize_word_set()
+
+
+def check_one(path_to_presentation, report_path):
+    result = {
+        "presentation": path_to_presentation,
+        "report": report_path,
+        "passed": False,
+        "time_estimate": None,
+        "error": None,
+    }
+    # A bad deck is reported in the index instead of stopping the batch
+    try:
+        with lazy_presentation(path_to_presentation) as prs:
+            time_estimate, display_info, pass_all_checks = check_presentation(
+                prs, _worker_config, _worker_wordset)
+        display_comments_on_webpage(time_estimate, display_info, pass_all_checks,
+                                    report_path, open_browser=False)
+        result["passed"] = pass_all_checks and not display_info["general_feedback"]
+        result["time_estimate"] = time_estimate
+    except Exception as err:
+        result["report"] = None
+        result["error"] = f"{type(err).__name__}: {err}"
+    return result
+
+
+def write_index(results, index_path):
+    num_passed = sum(1 for result in results if result["passed"])
+    num_failed = sum(1 for result in results if result["error"])
+    with open(index_path, 'w') as wfile:
+        wfile.write("<h3>Batch Summary:</h3>")
+        wfile.write(f"<p>{len(results)} presentations checked, {num_passed} passed "
+                    f"all checks, {num_failed} could not be checked.</p>")
+        wfile.write("<table><tr><th>Presentation</th><th>Result</th>"
+                    "<th>Estimated Time</th></tr>")
+        for result in results:
+            name = html.escape(result["presentation"])
+            if result["error"]:
+                status = "Error: " + html.escape(result["error"])
+            else:
+                report = html.escape(os.path.basename(result["report"]))
+                status = "Passed" if result["passed"] else "Needs changes"
+                name = f'<a href="{report}">{name}</a>'
+            time_estimate = result["time_estimate"] or ""
+            wfile.write(f"<tr><td>{name}</td><td>{status}</td>"
+                        f"<td>{time_estimate}</td></tr>")
+        wfile.write("</table>")
+
+
+def run_batch(paths, output_dir, config_path, max_workers=None):
+    os.makedirs(output_dir, exist_ok=True)
+    report_paths = [os.path.join(output_dir, report_name)
+                    for report_name in assign_report_names(paths)]
+
+    results = [None] * len(paths)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(config_path,)) as executor:
+        futures = {executor.submit(check_one, path, report_path): i
+                   for i, (path, report_path) in enumerate(zip(paths, report_paths))}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as err:
+                # The worker itself died, e.g. BrokenProcessPool
+                results[i] = {"presentation": paths[i], "report": None,
+                              "passed": False, "time_estimate": None,
+                              "error": f"{type(err).__name__}: {err}"}
+
+    write_index(results, os.path.join(output_dir, "index.html"))
+    return results
+
+
+def main():
+    args = parser.parse_args()
+    paths = find_presentations(args.presentations)
+    if not paths:
+        print("No '.pptx' files found.")
+        sys.exit(1)
+
+    results = run_batch(paths, args.output_dir, args.config, args.jobs)
+    for result in results:
+        if result["error"]:
+            print(f"{result['presentation']}: {result['error']}")
+    print(f"Wrote {len(results)} reports to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
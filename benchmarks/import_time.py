@@ -0,0 +1,58 @@
+"""Import-time benchmark for the PPTChecker CLI
+
+Imports pptchecker in fresh interpreters and fails if the median import
+time exceeds the budget or if a heavy optional module is loaded eagerly.
+
+    python benchmarks/import_time.py --runs 10 --budget 0.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported once a rule actually needs them
+LAZY_MODULES = ["pandas", "numpy", "nltk", "yaml", "pretty_html_table", "webbrowser",
+                "http.server"]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import pptchecker
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed,
+                  "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def measure_import(module_dir=PACKAGE_DIR):
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], cwd=module_dir,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pptchecker import time')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget', type=float, default=0.5,
+                        help="maximum median import time in seconds")
+    args = parser.parse_args()
+
+    measurements = [measure_import() for _ in range(args.runs)]
+    median = statistics.median(m["elapsed"] for m in measurements)
+    loaded = sorted({module for m in measurements for module in m["loaded"]})
+
+    print(f"Median import time over {args.runs} runs: {median * 1000:.1f} ms "
+          f"(budget {args.budget * 1000:.0f} ms)")
+    if loaded:
+        print("Eagerly imported heavy modules: " + ", ".join(loaded))
+    if median > args.budget or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Scaling benchmark for PPTChecker
+
+Generates synthetic decks of increasing size, times every rule and the
+end-to-end main_controller run on each, records peak memory, and prints
+the scaling curve of each measurement. Results can be saved as a
+baseline and later runs compared against it; the run fails if anything
+got slower (or bigger) than the baseline by more than the threshold.
+
+    python benchmarks/scaling.py --sizes 10,100,500 --save-baseline
+    python benchmarks/scaling.py --sizes 10,100,500 --threshold 0.25
+
+Timings depend on the machine, so a baseline should be recorded on the
+machine it is compared on.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE_PATH = os.path.join(PACKAGE_DIR, "benchmarks", "baseline.json")
+# Differences smaller than this are noise, whatever the relative change
+NOISE_FLOOR_SECONDS = 0.02
+
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
+
+from benchmarks.synthetic_deck import generate_deck # noqa: E402
+
+
+def time_end_to_end(path, config, output_file):
+    from lazypackage import lazy_presentation
+    from pptchecker import main_controller
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), lazy_presentation(path) as prs:
+        main_controller(prs, config, output_file, open_browser=False)
+    return time.perf_counter() - start
+
+
+def peak_memory(path, config, output_file):
+    tracemalloc.start()
+    try:
+        time_end_to_end(path, config, output_file)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def time_rules(path, config):
+    from lazypackage import lazy_presentation
+    from profiling import profile_presentation
+
+    with lazy_presentation(path) as prs:
+        _, profile = profile_presentation(prs, config)
+    timings = {name: timing.wall for name, timing in profile.phases.items()}
+    timings.update((name, timing.wall) for name, timing in profile.rules.items())
+    return timings
+
+
+def measure(path, config, output_file, repeat):
+    """Best-of-repeat timings of one deck."""
+    end_to_end = min(time_end_to_end(path, config, output_file) for _ in range(repeat))
+    rules = {}
+    for _ in range(repeat):
+        for name, seconds in time_rules(path, config).items():
+            rules[name] = min(seconds, rules.get(name, seconds))
+    return {"end_to_end": end_to_end,
+            "peak_memory_mb": peak_memory(path, config, output_file) / 2**20,
+            "rules": rules}
+
+
+def run_benchmark(sizes, deck_params, repeat=3, work_dir=None):
+    from util import read_config_yaml
+
+    config = read_config_yaml()
+    results = {"params": deck_params, "sizes": []}
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        output_file = os.path.join(tmp_dir, "output.html")
+        for num_slides in sizes:
+            path = os.path.join(tmp_dir, f"deck_{num_slides}.pptx")
+            generate_deck(path, num_slides, **deck_params)
+            result = {"slides": num_slides, "deck_bytes": os.path.getsize(path)}
+            result.update(measure(path, config, output_file, repeat))
+            results["sizes"].append(result)
+            print(f"{num_slides:>6} slides: {result['end_to_end']:.3f}s end to end, "
+                  f"peak {result['peak_memory_mb']:.1f} MB")
+    return results
+
+
+def metrics(result):
+    yield "end_to_end", result["end_to_end"]
+    yield "peak_memory_mb", result["peak_memory_mb"]
+    for name, seconds in result["rules"].items():
+        yield name, seconds
+
+
+def scaling_exponent(small, large):
+    """k in time ~ slides**k between two sizes (1 is linear)."""
+    if small["slides"] == large["slides"]:
+        return None
+    exponents = {}
+    large_metrics = dict(metrics(large))
+    for name, small_value in metrics(small):
+        large_value = large_metrics.get(name)
+        if small_value > 0 and large_value:
+            exponents[name] = (math.log(large_value / small_value) /
+                               math.log(large["slides"] / small["slides"]))
+    return exponents
+
+
+def print_curves(results):
+    sizes = results["sizes"]
+    names = [name for name, _ in metrics(sizes[-1])]
+    print(f"\n{'':<42}" + "".join(f"{size['slides']:>10}" for size in sizes) + f"{'exponent':>10}")
+    exponents = scaling_exponent(sizes[0], sizes[-1]) or {}
+    for name in names:
+        values = [dict(metrics(size)).get(name, 0) for size in sizes]
+        exponent = exponents.get(name)
+        print(f"{name:<42}" + "".join(f"{value:>10.3f}" for value in values) +
+              (f"{exponent:>10.2f}" if exponent is not None else ""))
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """Measurements that regressed by more than threshold, as messages."""
+    regressions = []
+    baseline_sizes = {size["slides"]: size for size in baseline["sizes"]}
+    for result in results["sizes"]:
+        baseline_result = baseline_sizes.get(result["slides"])
+        if baseline_result is None:
+            continue
+        baseline_metrics = dict(metrics(baseline_result))
+        for name, value in metrics(result):
+            expected = baseline_metrics.get(name)
+            if expected is None:
+                continue
+            if name != "peak_memory_mb" and value - expected < NOISE_FLOOR_SECONDS:
+                continue
+            if value > expected * (1 + threshold):
+                regressions.append(f"{result['slides']} slides, {name}: {value:.3f} "
+                                   f"vs baseline {expected:.3f} "
+                                   f"(+{(value / expected - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PPTChecker on synthetic decks')
+    parser.add_argument('--sizes', type=str, default="10,100,300",
+                        help="comma-separated slide counts")
+    parser.add_argument('--shapes', type=int, default=10, help="shapes per slide")
+    parser.add_argument('--runs', type=int, default=3, help="text runs per shape")
+    parser.add_argument('--notes', type=int, default=60, help="words of speaker notes per slide")
+    parser.add_argument('--rgb-colors', action='store_true',
+                        help="colour text with RGB values instead of theme colours")
+    parser.add_argument('--media-kb', type=int, default=0,
+                        help="size of an image placed on every slide")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', type=str, default=None,
+                        help="write the results as JSON")
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed relative slowdown against the baseline")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    deck_params = {"shapes_per_slide": args.shapes, "runs_per_shape": args.runs,
+                   "notes_words": args.notes, "theme_colors": not args.rgb_colors,
+                   "media_bytes": args.media_kb * 1024}
+    results = run_benchmark(sizes, deck_params, args.repeat)
+    print_curves(results)
+
+    if args.output:
+        with open(args.output, "w") as wfile:
+            json.dump(results, wfile, indent=1)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as wfile:
+            json.dump(results, wfile, indent=1)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+    with open(args.baseline) as rfile:
+        baseline = json.load(rfile)
+    if baseline["params"] != deck_params:
+        print("\nBaseline was recorded with different deck parameters; not comparing")
+        return
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions over {args.threshold * 100:.0f}%:")
+        for regression in regressions:
+            print("  " + regression)
+        sys.exit(1)
+    print(f"\nNo regressions over {args.threshold * 100:.0f}% against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Synthetic presentation generator for PPTChecker benchmarks
+
+Builds .pptx decks of any size with python-pptx. Every slide gets a title,
+a mix of text boxes, filled shapes and lines, a slide number and speaker
+notes, so all of the rules have work to do.
+
+    python benchmarks/synthetic_deck.py deck.pptx --slides 500 --media-kb 256
+"""
+
+import argparse
+import random
+import struct
+import zlib
+
+WORDS = ("deck slide chart revenue growth team model data result plan review "
+         "customer market product launch quarter target risk cost design").split()
+
+
+def make_png(num_bytes, rng):
+    """A PNG of random pixels, which is about num_bytes large as it cannot compress."""
+    side = max(1, int((num_bytes / 3) ** 0.5))
+    rows = b"".join(b"\x00" + rng.randbytes(side * 3) for _ in range(side))
+
+    def chunk(chunk_type, data):
+        return (struct.pack(">I", len(data)) + chunk_type + data +
+                struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+    return (b"\x89PNG\r\n\x1a\n" +
+            chunk(b"IHDR", struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0)) +
+            chunk(b"IDAT", zlib.compress(rows, 1)) +
+            chunk(b"IEND", b""))
+
+
+def make_words(rng, num_words):
+    return " ".join(rng.choice(WORDS) for _ in range(num_words))
+
+
+def make_notes(rng, num_words):
+    lines = []
+    while num_words > 0:
+        sentence_length = min(num_words, rng.randint(5, 15))
+        lines.append(make_words(rng, sentence_length).capitalize() + rng.choice(".?!,"))
+        num_words -= sentence_length
+        if rng.random() < 0.1:
+            lines.append("[Break]")
+    return "\n".join(lines)
+
+
+def generate_deck(path, num_slides=50, shapes_per_slide=10, runs_per_shape=3,
+                  notes_words=60, theme_colors=True, media_bytes=0, seed=0):
+    """Write a synthetic deck to path.
+
+    theme_colors switches run colours between theme colours (resolved
+    through the theme on every slide) and plain RGB values. When
+    media_bytes is non-zero, an image of roughly that size is placed on
+    every slide; the package stores it once.
+    """
+    from io import BytesIO
+    from pptx import Presentation
+    from pptx.dml.color import RGBColor
+    from pptx.enum.dml import MSO_THEME_COLOR
+    from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+    from pptx.util import Emu, Pt
+
+    rng = random.Random(seed)
+    prs = Presentation()
+    slide_width, slide_height = prs.slide_width, prs.slide_height
+    layout = prs.slide_layouts[5] # Title Only
+    media = make_png(media_bytes, rng) if media_bytes else None
+    theme_palette = [MSO_THEME_COLOR.TEXT_1, MSO_THEME_COLOR.ACCENT_1,
+                     MSO_THEME_COLOR.ACCENT_2, MSO_THEME_COLOR.ACCENT_5,
+                     MSO_THEME_COLOR.BACKGROUND_1]
+    rgb_palette = ["000000", "1F4E79", "C00000", "7F7F7F", "FFFF00"]
+    sizes = [(Emu(slide_width // 4), Emu(slide_height // 8)),
+             (Emu(slide_width // 3), Emu(slide_height // 4)),
+             (Emu(slide_width // 8), Emu(slide_width // 8))]
+
+    for slide_index in range(num_slides):
+        slide = prs.slides.add_slide(layout)
+        is_last = slide_index == num_slides - 1
+        slide.shapes.title.text = "Summary" if is_last else make_words(rng, 3).title()
+
+        for shape_index in range(shapes_per_slide):
+            width, height = rng.choice(sizes)
+            left = Emu(rng.randrange(0, slide_width - width))
+            top = Emu(rng.randrange(slide_height // 5, slide_height - height))
+            kind = shape_index % 4
+            if kind == 3:
+                slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, left, top,
+                                           left + width, top).line.width = Pt(rng.choice([0.5, 2]))
+                continue
+            if kind == 2:
+                shape = slide.shapes.add_shape(rng.choice([MSO_SHAPE.OVAL, MSO_SHAPE.RECTANGLE]),
+                                               left, top, width, height)
+                shape.fill.solid()
+                shape.fill.fore_color.rgb = RGBColor.from_string(rng.choice(rgb_palette))
+            else:
+                shape = slide.shapes.add_textbox(left, top, width, height)
+
+            paragraph = shape.text_frame.paragraphs[0]
+            for _ in range(runs_per_shape):
+                run = paragraph.add_run()
+                run.text = make_words(rng, rng.randint(1, 8)) + " "
+                run.font.size = Pt(rng.choice([10, 14, 18, 24, 32]))
+                if theme_colors:
+                    run.font.color.theme_color = rng.choice(theme_palette)
+                else:
+                    run.font.color.rgb = RGBColor.from_string(rng.choice(rgb_palette))
+
+        number_box = slide.shapes.add_textbox(Emu(slide_width * 9 // 10),
+                                              Emu(slide_height * 9 // 10),
+                                              Emu(slide_width // 20), Emu(slide_height // 20))
+        number_box.text_frame.text = str(slide_index + 1)
+
+        if media is not None:
+            slide.shapes.add_picture(BytesIO(media), Emu(0), Emu(0),
+                                     Emu(slide_width // 10), Emu(slide_width // 10))
+
+        if notes_words:
+            slide.notes_slide.notes_text_frame.text = make_notes(rng, notes_words)
+
+    prs.save(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic presentation')
+    parser.add_argument('output', type=str)
+    parser.add_argument('--slides', type=int, default=50)
+    parser.add_argument('--shapes', type=int, default=10, help="shapes per slide")
+    parser.add_argument('--runs', type=int, default=3, help="text runs per shape")
+    parser.add_argument('--notes', type=int, default=60, help="words of speaker notes per slide")
+    parser.add_argument('--rgb-colors', action='store_true',
+                        help="colour text with RGB values instead of theme colours")
+    parser.add_argument('--media-kb', type=int, default=0,
+                        help="size of an image placed on every slide")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generate_deck(args.output, args.slides, args.shapes, args.runs, args.notes,
+                  not args.rgb_colors, args.media_kb * 1024, args.seed)
+
+
+if __name__ == "__main__":
+    main()
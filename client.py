@@ -0,0 +1,100 @@
+"""Thin client for the PPTChecker server
+
+Sends the presentation to a running server.py and writes the same report
+as pptchecker.py. When no server is running, the presentation is checked
+in this process instead. Nothing heavy is imported unless that happens.
+
+Only the report options of pptchecker.py are supported, as the server
+runs every rule with its own config; use pptchecker.py for rule
+selection, --fail-fast and the other modes.
+"""
+
+import argparse
+import json
+import sys
+import urllib.error
+import urllib.request
+from report import DEFAULT_PAGE_SIZE, findings_from_dict
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:8766"
+
+parser = argparse.ArgumentParser(description='Analyze, using the PPTChecker server if it is running')
+parser.add_argument('-p', '--presentation', type=str)
+parser.add_argument('-o', '--output', type=str, default="output.html")
+parser.add_argument('--no-open', action='store_true',
+                    help="do not open the report in a browser")
+parser.add_argument('--failures-only', action='store_true',
+                    help="only list slides with feedback in the report")
+parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, metavar="SLIDES",
+                    help="split reports with more rows than this into pages with an index "
+                         f"(default: {DEFAULT_PAGE_SIZE}; 0: never)")
+parser.add_argument('--server', type=str, default=DEFAULT_SERVER_URL)
+
+
+class ServerError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+def server_is_running(server_url=DEFAULT_SERVER_URL, timeout=0.5):
+    try:
+        with urllib.request.urlopen(server_url + "/health", timeout=timeout) as response:
+            return json.load(response).get("status") == "ok"
+    except (OSError, ValueError):
+        return False
+
+
+def check_remote(path_to_presentation, server_url=DEFAULT_SERVER_URL):
+    with open(path_to_presentation, "rb") as rfile:
+        data = rfile.read()
+    request = urllib.request.Request(server_url + "/check", data=data, method="POST",
+                                     headers={"Content-Type": "application/octet-stream"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return findings_from_dict(json.load(response))
+    except urllib.error.HTTPError as err:
+        try:
+            message = json.load(err)["error"]
+        except (ValueError, KeyError):
+            message = err.reason
+        raise ServerError(err.code, message) from None
+
+
+def check_local(path_to_presentation):
+    from lazypackage import lazy_presentation
+    from pptchecker import check_presentation
+    from util import read_config_yaml
+
+    with lazy_presentation(path_to_presentation) as prs:
+        return check_presentation(prs, read_config_yaml())
+
+
+def main():
+    args = parser.parse_args()
+    if not args.presentation:
+        print("Must provide a presentation file.")
+        sys.exit()
+    if not args.presentation.endswith(".pptx"):
+        print("Input file must be of '.pptx' type.")
+        sys.exit()
+
+    if server_is_running(args.server):
+        try:
+            findings = check_remote(args.presentation, args.server)
+        except ServerError as err:
+            if err.code != 503:
+                print(f"Server could not check the presentation: {err}")
+                sys.exit(1)
+            # The server is at capacity; do the work here instead of waiting
+            findings = check_local(args.presentation)
+    else:
+        findings = check_local(args.presentation)
+
+    from util import display_findings
+    display_findings(findings, args.output, not args.no_open, args.failures_only,
+                     args.page_size)
+
+
+if __name__ == "__main__":
+    main()
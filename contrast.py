@@ -0,0 +1,67 @@
+"""Batched colour contrast computation for PPTChecker
+
+A deck only uses a handful of colours, so every (colour_a, colour_b) pair is
+computed once, in a single NumPy batch, and looked up from then on.
+"""
+
+
+def relative_luminance(channels):
+    """Relative luminance of an array of 0-255 RGB values (last axis)."""
+    import numpy as np
+
+    index = channels / 255
+    luminance = np.where(index < 0.03928, index / 12.92,
+                         ((index + 0.055) / 1.055) ** 2.4)
+    return luminance @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def hex_channels(color):
+    code = int(color, 16)
+    return (code >> 16) & 0xFF, (code >> 8) & 0xFF, code & 0xFF
+
+
+def batch_contrast_ratios(pairs):
+    """Vectorized calculate_contrast_ratio over a list of hex colour pairs."""
+    import numpy as np
+
+    codes = np.array([[int(color_a, 16), int(color_b, 16)] for color_a, color_b in pairs],
+                     dtype=np.int64).reshape(-1, 2)
+    channels = np.stack([(codes >> 16) & 0xFF, (codes >> 8) & 0xFF, codes & 0xFF],
+                        axis=-1)
+    luminance = relative_luminance(channels)
+
+    # Same ordering as calculate_contrast_ratio: the colour with the larger
+    # channel sum is "light", and equal sums compare a colour with itself
+    sums = channels.sum(axis=-1)
+    lum_a = luminance[:, 0]
+    lum_b = luminance[:, 1]
+    light = np.where(sums[:, 0] > sums[:, 1], lum_a, lum_b)
+    dark = np.where(sums[:, 0] < sums[:, 1], lum_a, lum_b)
+    return ((light + 0.05) / (dark + 0.05)).tolist()
+
+
+class ContrastCache:
+    """Memo table of contrast ratios keyed by (colour_a, colour_b)."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._ratios = {}
+
+    def __len__(self):
+        return len(self._ratios)
+
+    def prefetch(self, pairs):
+        pending = list({pair for pair in pairs if pair not in self._ratios})
+        if pending:
+            self._ratios.update(zip(pending, batch_contrast_ratios(pending)))
+
+    def ratio(self, color_a, color_b):
+        pair = (color_a, color_b)
+        contrast_ratio = self._ratios.get(pair)
+        if contrast_ratio is None:
+            self.misses += 1
+            self.prefetch([pair])
+            return self._ratios[pair]
+        self.hits += 1
+        return contrast_ratio
@@ -0,0 +1,288 @@
+"""Corpus mode for PPTChecker: re-check a library of presentations
+
+Results are kept in a SQLite database: one row per deck with its content
+hash, the hash of the config and the checker version they were produced
+with, plus the deck's rule results and findings. A deck is only checked
+again when one of the three changed, and a deck whose size and
+modification time are unchanged is not even hashed. Each result is
+committed as soon as it arrives, so an interrupted run resumes where it
+stopped. Decks that could not be checked are tried again on every run.
+
+    python corpus.py path/to/library --db corpus.sqlite
+    python corpus.py --db corpus.sqlite --summary
+    python corpus.py --db corpus.sqlite --failing should_have_high_contrast_fonts_colours
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from batch import find_presentations
+from engine import get_deck_snapshot, run_visitors
+from findings import SEVERITY_NAMES, FindingsStore
+from lazypackage import lazy_presentation
+from pptchecker import summarize_findings
+from rules import RULES, RULES_VERSION, SLIDE_RULES, make_visitors, must_end_with_summary_slide
+from util import DEFAULT_CONFIG_PATH, initialize_word_set, read_config_yaml
+
+parser = argparse.ArgumentParser(description='Check a library of presentations, '
+                                             'skipping decks that did not change')
+parser.add_argument('presentations', type=str, nargs='?',
+                    help="directory or glob pattern of .pptx files")
+parser.add_argument('--db', type=str, default="corpus.sqlite",
+                    help="SQLite database of results (default: corpus.sqlite)")
+parser.add_argument('-c', '--config', type=str, default=DEFAULT_CONFIG_PATH)
+parser.add_argument('-j', '--jobs', type=int, default=None,
+                    help="number of worker processes (default: CPU count)")
+parser.add_argument('--summary', action='store_true',
+                    help="print the number of failing decks per rule")
+parser.add_argument('--failing', type=str, default=None, metavar="RULE",
+                    help="print the decks that fail this rule")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    content_hash TEXT,
+    config_hash TEXT,
+    version INTEGER,
+    passed INTEGER,
+    time_estimate TEXT,
+    error TEXT,
+    checked_at REAL
+);
+CREATE TABLE IF NOT EXISTS rule_results (
+    path TEXT,
+    rule TEXT,
+    passed INTEGER,
+    PRIMARY KEY (path, rule)
+);
+CREATE TABLE IF NOT EXISTS findings (
+    path TEXT,
+    rule TEXT,
+    slide INTEGER,
+    severity TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_by_path ON findings (path);
+CREATE INDEX IF NOT EXISTS findings_by_rule ON findings (rule);
+CREATE INDEX IF NOT EXISTS rule_results_by_rule ON rule_results (rule, passed);
+"""
+
+# Rules with a pass or fail result; the time estimate has none
+CHECKED_RULES = [rule for rule in RULES if rule != "estimate_presentation_length"]
+
+# Loaded once per worker process by init_worker
+_worker_config = None
+_worker_wordset = None
+
+
+def file_hash(path):
+    content_hash = hashlib.sha1()
+    with open(path, "rb") as rfile:
+        for chunk in iter(lambda: rfile.read(1 << 20), b""):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+def config_hash(config):
+    return hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def open_database(db_path):
+    connection = sqlite3.connect(db_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def init_worker(config_path):
+    global _worker_config, _worker_wordset
+    _worker_config = read_config_yaml(config_path)
+    _worker_wordset = initialize_word_set()
+
+
+def check_deck(path, known_hash=None):
+    """Result record of the deck at path, or only its hash if it equals known_hash."""
+    result = {
+        "path": path,
+        "content_hash": file_hash(path),
+        "passed": False,
+        "time_estimate": None,
+        "error": None,
+        "rule_results": {},
+        "findings": [],
+    }
+    # Touched but unchanged, e.g. copied again by a sync job
+    if result["content_hash"] == known_hash:
+        result["unchanged"] = True
+        return result
+
+    # A bad deck is recorded with its error instead of stopping the run
+    try:
+        with lazy_presentation(path) as prs:
+            deck = get_deck_snapshot(prs)
+            findings = FindingsStore(_worker_config.get("max_findings_per_rule"))
+            visitors = make_visitors(deck, _worker_config, findings, _worker_wordset)
+            satisfied_all = run_visitors(deck, visitors)
+        time_estimate, display_info, pass_all_checks = summarize_findings(
+            deck, _worker_config, findings, satisfied_all)
+    except Exception as err:
+        result["error"] = f"{type(err).__name__}: {err}"
+        return result
+
+    rule_results = {rule: bool(satisfied) and not findings.count(rule)
+                    for rule, satisfied in zip(SLIDE_RULES, satisfied_all)}
+    rule_results["must_end_with_summary_slide"] = must_end_with_summary_slide(deck)
+    result["rule_results"] = rule_results
+    result["findings"] = [(finding.rule, finding.slide_index + 1,
+                           SEVERITY_NAMES[finding.severity], finding.message)
+                          for finding in findings.findings()]
+    result["passed"] = pass_all_checks and not display_info["general_feedback"]
+    result["time_estimate"] = time_estimate
+    return result
+
+
+def store_result(connection, result, stat, config_key):
+    path = result["path"]
+    with connection:
+        if result.get("unchanged"):
+            connection.execute("UPDATE decks SET size = ?, mtime_ns = ? WHERE path = ?",
+                               (stat.st_size, stat.st_mtime_ns, path))
+            return
+        connection.execute("DELETE FROM rule_results WHERE path = ?", (path,))
+        connection.execute("DELETE FROM findings WHERE path = ?", (path,))
+        connection.execute(
+            "INSERT OR REPLACE INTO decks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns, result["content_hash"], config_key,
+             RULES_VERSION, result["passed"], result["time_estimate"], result["error"],
+             time.time()))
+        connection.executemany("INSERT INTO rule_results VALUES (?, ?, ?)",
+                               [(path, rule, passed)
+                                for rule, passed in result["rule_results"].items()])
+        connection.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?)",
+                               [(path, *finding) for finding in result["findings"]])
+
+
+def plan_corpus(connection, paths, config_key):
+    """(path, stat, known content hash or None) of the decks that may have changed."""
+    stored = {path: row for path, *row in connection.execute(
+        "SELECT path, size, mtime_ns, content_hash, config_hash, version, error IS NOT NULL "
+        "FROM decks")}
+    plan = []
+    for path in paths:
+        stat = os.stat(path)
+        row = stored.get(path)
+        # Errors may come from the environment (e.g. WordNet missing), so are retried
+        if row is None or row[3:] != [config_key, RULES_VERSION, 0]:
+            plan.append((path, stat, None))
+        elif row[:2] != [stat.st_size, stat.st_mtime_ns]:
+            plan.append((path, stat, row[2]))
+    return plan
+
+
+def prune_missing(connection):
+    """Forget decks that no longer exist."""
+    missing = [(path,) for path, in connection.execute("SELECT path FROM decks")
+               if not os.path.exists(path)]
+    with connection:
+        for table in ("decks", "rule_results", "findings"):
+            connection.executemany(f"DELETE FROM {table} WHERE path = ?", missing)
+
+
+def run_corpus(paths, db_path, config_path, max_workers=None):
+    """Check the decks that changed since the last run; returns the number checked."""
+    config_key = config_hash(read_config_yaml(config_path))
+    connection = open_database(db_path)
+    try:
+        prune_missing(connection)
+        plan = plan_corpus(connection, [os.path.abspath(path) for path in paths], config_key)
+        if not plan:
+            return 0
+
+        num_checked = 0
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                 initargs=(config_path,)) as executor:
+            futures = {executor.submit(check_deck, path, known_hash): (path, stat)
+                       for path, stat, known_hash in plan}
+            for future in as_completed(futures):
+                path, stat = futures[future]
+                try:
+                    result = future.result()
+                except Exception as err:
+                    # The worker itself died, e.g. BrokenProcessPool; checked again next run
+                    print(f"{path}: {type(err).__name__}: {err}")
+                    continue
+                store_result(connection, result, stat, config_key)
+                if not result.get("unchanged"):
+                    num_checked += 1
+        return num_checked
+    finally:
+        connection.close()
+
+
+def failing_decks(connection, rule):
+    """Paths of the decks that fail rule, in path order."""
+    return [path for path, in connection.execute(
+        "SELECT path FROM rule_results WHERE rule = ? AND NOT passed ORDER BY path", (rule,))]
+
+
+def rule_summary(connection):
+    """(rule, failing decks, findings) for every rule with a pass or fail result."""
+    failing = dict(connection.execute(
+        "SELECT rule, COUNT(*) FROM rule_results WHERE NOT passed GROUP BY rule"))
+    num_findings = dict(connection.execute("SELECT rule, COUNT(*) FROM findings GROUP BY rule"))
+    return [(rule, failing.get(rule, 0), num_findings.get(rule, 0)) for rule in CHECKED_RULES]
+
+
+def deck_counts(connection):
+    """(decks, passed, could not be checked)."""
+    return connection.execute(
+        "SELECT COUNT(*), COALESCE(SUM(passed), 0), COUNT(error) FROM decks").fetchone()
+
+
+def print_summary(connection, wfile):
+    num_decks, num_passed, num_errors = deck_counts(connection)
+    wfile.write(f"{num_decks} presentations, {num_passed} passed all checks, "
+                f"{num_errors} could not be checked.\n")
+    wfile.write(f"{'Rule':<42} {'failing':>8} {'findings':>9}\n")
+    for rule, num_failing, num_findings in rule_summary(connection):
+        wfile.write(f"{rule:<42} {num_failing:>8} {num_findings:>9}\n")
+
+
+def main():
+    args = parser.parse_args()
+    if args.failing is not None and args.failing not in CHECKED_RULES:
+        parser.error(f"unknown rule '{args.failing}'; choose from: "
+                     + ", ".join(CHECKED_RULES))
+    if args.summary or args.failing:
+        if not os.path.exists(args.db):
+            parser.error(f"no database at {args.db}")
+        connection = open_database(args.db)
+        try:
+            if args.failing:
+                for path in failing_decks(connection, args.failing):
+                    print(path)
+            if args.summary:
+                print_summary(connection, sys.stdout)
+        finally:
+            connection.close()
+        return
+
+    if not args.presentations:
+        parser.error("must provide a directory or glob pattern of presentations")
+    paths = find_presentations(args.presentations)
+    if not paths:
+        print("No '.pptx' files found.")
+        sys.exit(1)
+
+    num_checked = run_corpus(paths, args.db, args.config, args.jobs)
+    print(f"Checked {num_checked} of {len(paths)} presentations; results in {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""Single-pass rule engine for PPTChecker
+
+The deck is traversed once and every property the rules need is copied into
+plain Python objects, so rules never go back to the python-pptx object graph
+(which re-parses XML on every property access).
+"""
+
+import weakref
+from pptx.enum.dml import MSO_FILL, MSO_COLOR_TYPE, MSO_THEME_COLOR
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.oxml.ns import qn
+from pptx.util import Emu
+from images import PictureRef, load_image_info
+from theme import ThemeResolver
+
+# (scale_x, scale_y, offset_x, offset_y) from a group's child coordinates to
+# slide coordinates; shapes directly on the slide use the identity
+IDENTITY_TRANSFORM = (1.0, 1.0, 0, 0)
+
+
+class ColorInfo:
+    __slots__ = ("color_type", "rgb", "theme_color", "brightness")
+
+    def __init__(self, color_type, rgb, theme_color, brightness):
+        self.color_type = color_type
+        self.rgb = rgb
+        self.theme_color = theme_color
+        self.brightness = brightness
+
+
+class RunInfo:
+    __slots__ = ("text", "font_size", "color")
+
+    def __init__(self, text, font_size, color):
+        self.text = text
+        self.font_size = font_size
+        self.color = color
+
+
+class ShapeInfo:
+    __slots__ = ("shape_id", "shape_type", "auto_shape_type", "left", "top",
+                 "width", "height", "has_text_frame", "text",
+                 "num_paragraphs", "runs", "fill_type", "fill_color",
+                 "line_width_pt", "image", "children")
+
+    def __init__(self):
+        self.shape_id = None
+        self.shape_type = None
+        self.auto_shape_type = None
+        self.left = None
+        self.top = None
+        self.width = None
+        self.height = None
+        self.has_text_frame = False
+        self.text = ""
+        self.num_paragraphs = 0
+        self.runs = []
+        self.fill_type = None
+        self.fill_color = None
+        self.line_width_pt = None
+        self.image = None # PictureRef of a picture
+        self.children = [] # Shapes in a group, positioned in slide coordinates
+
+    @property
+    def descriptor(self):
+        if self.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
+            return str(self.auto_shape_type)
+        return str(self.shape_type)
+
+
+class SlideInfo:
+    __slots__ = ("index", "number", "title", "is_backup", "background_rgb",
+                 "shapes", "notes_runs")
+
+    def __init__(self, index):
+        self.index = index
+        self.number = index + 1
+        self.title = None
+        self.is_backup = False
+        self.background_rgb = None # None unless the effective background is solid
+        self.shapes = []
+        self.notes_runs = []
+
+
+class DeckSnapshot:
+    def __init__(self, slide_width, slide_height, slides):
+        self.slide_width = slide_width
+        self.slide_height = slide_height
+        self.slides = slides
+
+        self.num_active_slides = len(slides)
+        for slide in slides:
+            if slide.is_backup:
+                self.num_active_slides = slide.index
+                break
+
+    @property
+    def num_slides(self):
+        return len(self.slides)
+
+    @property
+    def active_slides(self):
+        return self.slides[:self.num_active_slides]
+
+
+def iter_shapes(shapes):
+    """Shapes in document order, including the contents of groups."""
+    for shape in shapes:
+        yield shape
+        if shape.children:
+            yield from iter_shapes(shape.children)
+
+
+def text_fingerprint(shape):
+    """What the text rules read from a shape; equal for repeated footers etc."""
+    return tuple(run.text for run in shape.runs)
+
+
+def style_fingerprint(shape):
+    """What the contrast rule reads from a shape, besides the slide background."""
+    fill_rgb = shape.fill_color.rgb if shape.fill_color is not None else None
+    return (shape.shape_type, shape.auto_shape_type, shape.line_width_pt,
+            shape.fill_type, fill_rgb, shape.has_text_frame,
+            tuple((run.text, run.font_size, run.color.rgb) for run in shape.runs))
+
+
+def read_color(color_format, context):
+    color_type = color_format.type
+    if color_type == MSO_COLOR_TYPE.RGB:
+        return ColorInfo(color_type, str(color_format.rgb), None, 0)
+    if not color_type:
+        # Default to the theme's dark text colour if no colour is found
+        theme_color, brightness = MSO_THEME_COLOR.DARK_1, 0
+    else:
+        theme_color, brightness = color_format.theme_color, color_format.brightness
+    return ColorInfo(color_type, context.theme_color_rgb(theme_color, brightness),
+                     theme_color, brightness)
+
+
+def read_fill(shape_info, fill_format, context):
+    shape_info.fill_type = fill_format.type
+    if shape_info.fill_type == MSO_FILL.SOLID:
+        shape_info.fill_color = read_color(fill_format.fore_color, context)
+
+
+def group_transform(grp_sp, transform=IDENTITY_TRANSFORM):
+    """Transform for the children of the p:grpSp element, inside transform."""
+    xfrm = grp_sp.find(f"{qn('p:grpSpPr')}/{qn('a:xfrm')}")
+    if xfrm is None:
+        return transform
+    off, ext, ch_off, ch_ext = (xfrm.find(qn(tag)) for tag in
+                                ("a:off", "a:ext", "a:chOff", "a:chExt"))
+    if off is None or ext is None or ch_off is None or ch_ext is None:
+        return transform
+
+    parent_scale_x, parent_scale_y, parent_offset_x, parent_offset_y = transform
+    ch_cx, ch_cy = int(ch_ext.get("cx")), int(ch_ext.get("cy"))
+    scale_x = int(ext.get("cx")) / ch_cx if ch_cx else 1.0
+    scale_y = int(ext.get("cy")) / ch_cy if ch_cy else 1.0
+    offset_x = int(off.get("x")) - int(ch_off.get("x")) * scale_x
+    offset_y = int(off.get("y")) - int(ch_off.get("y")) * scale_y
+    return (parent_scale_x * scale_x, parent_scale_y * scale_y,
+            parent_scale_x * offset_x + parent_offset_x,
+            parent_scale_y * offset_y + parent_offset_y)
+
+
+def place_shape(shape_info, left, top, width, height, transform):
+    if transform is IDENTITY_TRANSFORM:
+        shape_info.left, shape_info.top = left, top
+        shape_info.width, shape_info.height = width, height
+        return
+    scale_x, scale_y, offset_x, offset_y = transform
+    if left is not None:
+        shape_info.left = Emu(round(left * scale_x + offset_x))
+    if top is not None:
+        shape_info.top = Emu(round(top * scale_y + offset_y))
+    if width is not None:
+        shape_info.width = Emu(round(width * scale_x))
+    if height is not None:
+        shape_info.height = Emu(round(height * scale_y))
+
+
+def read_picture(picture):
+    r_id = picture._element.blip_rId
+    if r_id is None:
+        # Linked pictures have no image part to read
+        return None
+    try:
+        image_part = picture.part.related_part(r_id)
+    except KeyError:
+        return None
+    # ImagePart.sha1 reads the blob too, so nothing is read until the picture is used
+    return PictureRef(image_part.partname.lstrip("/"),
+                      lambda: load_image_info(image_part.blob))
+
+
+def read_shape(shape, context, transform=IDENTITY_TRANSFORM):
+    shape_info = ShapeInfo()
+    shape_info.shape_id = shape.shape_id
+    shape_info.shape_type = shape.shape_type
+    if shape_info.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
+        shape_info.auto_shape_type = shape.auto_shape_type
+    place_shape(shape_info, shape.left, shape.top, shape.width, shape.height, transform)
+
+    if shape_info.shape_type == MSO_SHAPE_TYPE.GROUP:
+        child_transform = group_transform(shape._element, transform)
+        shape_info.children = [read_shape(child, context, child_transform)
+                               for child in shape.shapes]
+
+    if shape_info.shape_type == MSO_SHAPE_TYPE.LINE:
+        shape_info.line_width_pt = shape.line.width.pt
+        read_fill(shape_info, shape.line.fill, context)
+    elif shape_info.shape_type not in (MSO_SHAPE_TYPE.PICTURE,
+                                       MSO_SHAPE_TYPE.CHART,
+                                       MSO_SHAPE_TYPE.TABLE):
+        if hasattr(shape, "fill"):
+            read_fill(shape_info, shape.fill, context)
+
+    if shape_info.shape_type == MSO_SHAPE_TYPE.PICTURE:
+        shape_info.image = read_picture(shape)
+
+    shape_info.has_text_frame = shape.has_text_frame
+    if shape_info.has_text_frame:
+        paragraphs = shape.text_frame.paragraphs
+        shape_info.text = shape.text
+        shape_info.num_paragraphs = len(paragraphs)
+        for paragraph in paragraphs:
+            for run in paragraph.runs:
+                font = run.font
+                shape_info.runs.append(RunInfo(run.text, font.size,
+                                               read_color(font.color, context)))
+    return shape_info
+
+
+def read_notes(slide_info, slide):
+    if not slide.has_notes_slide:
+        return
+    notes_text_frame = slide.notes_slide.notes_text_frame
+    if notes_text_frame is None:
+        return
+    for paragraph in notes_text_frame.paragraphs:
+        for run in paragraph.runs:
+            slide_info.notes_runs.append(run.text)
+
+
+def read_slide(index, slide, theme_resolver):
+    slide_info = SlideInfo(index)
+    title_shape = slide.shapes.title
+    if title_shape is not None:
+        slide_info.title = title_shape.text
+        slide_info.is_backup = "backup" in slide_info.title.lower()
+
+    context = theme_resolver.context_for_slide(slide)
+    slide_info.background_rgb = theme_resolver.background_for_slide(slide, context)
+    slide_info.shapes = [read_shape(shape, context) for shape in slide.shapes]
+    read_notes(slide_info, slide)
+    return slide_info
+
+
+def build_deck_snapshot(prs):
+    theme_resolver = ThemeResolver()
+    slides = [read_slide(index, slide, theme_resolver)
+              for index, slide in enumerate(prs.slides)]
+    return DeckSnapshot(prs.slide_width, prs.slide_height, slides)
+
+
+_snapshot_cache = weakref.WeakKeyDictionary()
+
+
+def get_deck_snapshot(prs):
+    """Return the snapshot for prs, building it on first use.
+
+    Accepts either a python-pptx Presentation or an existing DeckSnapshot.
+    Snapshots are cached per Presentation, so changes made to prs after the
+    first call are not reflected.
+    """
+    if isinstance(prs, DeckSnapshot):
+        return prs
+    # Presentation itself is unhashable, so key the cache on its part
+    deck = _snapshot_cache.get(prs.part)
+    if deck is None:
+        deck = build_deck_snapshot(prs)
+        _snapshot_cache[prs.part] = deck
+    return deck
+
+
+def run_visitors(deck, visitors):
+    """Visit every active slide once, dispatching it to each rule visitor."""
+    for slide in deck.active_slides:
+        for visitor in visitors:
+            visitor.visit(slide)
+    return [visitor.result() for visitor in visitors]
@@ -0,0 +1,565 @@
+"""Streaming deck extraction for PPTChecker
+
+Builds the same DeckSnapshot as engine.build_deck_snapshot, but reads the
+slide and notes XML straight from the .pptx zip with lxml's iterparse
+instead of going through python-pptx. Only the fields the rules use are
+kept, and every top-level shape element is cleared as soon as it has been
+read, so peak memory stays flat for very large decks. Layouts, masters and
+themes are small and shared between slides; they are parsed once each.
+"""
+
+import functools
+import posixpath
+import zipfile
+from lxml import etree
+from pptx.enum.dml import MSO_COLOR_TYPE, MSO_FILL, MSO_THEME_COLOR
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE, MSO_SHAPE_TYPE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import ns
+from pptx.util import Centipoints, Emu
+from engine import (
+    IDENTITY_TRANSFORM,
+    ColorInfo,
+    DeckSnapshot,
+    RunInfo,
+    ShapeInfo,
+    SlideInfo,
+    group_transform,
+    iter_shapes,
+    place_shape,
+)
+from images import IMAGE_CACHE, PictureRef, load_image_info
+from theme import ThemeResolver, effective_color_map, first_background, read_brightness
+
+# Tags are looked up for every element read, so resolve each name only once
+qn = functools.lru_cache(maxsize=None)(ns.qn)
+
+SHAPE_TAGS = {qn("p:sp"), qn("p:grpSp"), qn("p:graphicFrame"), qn("p:cxnSp"),
+              qn("p:pic"), qn("p:contentPart")}
+SP_TREE = qn("p:spTree")
+BG = qn("p:bg")
+CLR_MAP_OVR = qn("p:clrMapOvr")
+
+COLOR_TYPES = {
+    qn("a:srgbClr"): MSO_COLOR_TYPE.RGB,
+    qn("a:schemeClr"): MSO_COLOR_TYPE.SCHEME,
+    qn("a:sysClr"): MSO_COLOR_TYPE.SYSTEM,
+    qn("a:prstClr"): MSO_COLOR_TYPE.PRESET,
+    qn("a:hslClr"): MSO_COLOR_TYPE.HSL,
+    qn("a:scrgbClr"): MSO_COLOR_TYPE.SCRGB,
+}
+
+FILL_TYPES = {
+    qn("a:noFill"): MSO_FILL.BACKGROUND,
+    qn("a:solidFill"): MSO_FILL.SOLID,
+    qn("a:gradFill"): MSO_FILL.GRADIENT,
+    qn("a:blipFill"): MSO_FILL.PICTURE,
+    qn("a:pattFill"): MSO_FILL.PATTERNED,
+    qn("a:grpFill"): MSO_FILL.GROUP,
+}
+
+GRAPHIC_TYPES = {
+    "http://schemas.openxmlformats.org/drawingml/2006/chart": MSO_SHAPE_TYPE.CHART,
+    "http://schemas.openxmlformats.org/drawingml/2006/table": MSO_SHAPE_TYPE.TABLE,
+}
+GRAPHIC_DATA_URI_OLEOBJ = "http://schemas.openxmlformats.org/presentationml/2006/ole"
+
+# Layout placeholder type -> master placeholder type it inherits from
+BASE_PLACEHOLDER_TYPES = {
+    "body": "body", "chart": "body", "clipArt": "body", "dgm": "body",
+    "media": "body", "obj": "body", "pic": "body", "subTitle": "body",
+    "tbl": "body", "ctrTitle": "title", "title": "title",
+    "dt": "dt", "ftr": "ftr", "sldNum": "sldNum",
+}
+
+POSITION_ATTRS = (("left", "off", "x"), ("top", "off", "y"),
+                  ("width", "ext", "cx"), ("height", "ext", "cy"))
+
+
+def read_placeholder(element):
+    """The p:ph element of a shape, or None if it is not a placeholder."""
+    for nv_pr in element:
+        # nvSpPr / nvPicPr / nvGraphicFramePr etc. always come first
+        nv = nv_pr.find(qn("p:nvPr"))
+        return nv.find(qn("p:ph")) if nv is not None else None
+    return None
+
+
+def placeholder_idx(ph):
+    return int(ph.get("idx", 0))
+
+
+def placeholder_type(ph):
+    return ph.get("type", "obj")
+
+
+def read_xfrm(element):
+    tag = element.tag
+    if tag == qn("p:graphicFrame"):
+        return element.find(qn("p:xfrm"))
+    properties = element.find(qn("p:grpSpPr") if tag == qn("p:grpSp") else qn("p:spPr"))
+    if properties is None:
+        return None
+    return properties.find(qn("a:xfrm"))
+
+
+def read_position(element):
+    """Directly applied left, top, width and height (None where missing)."""
+    xfrm = read_xfrm(element)
+    position = {}
+    for attr, child_tag, xml_attr in POSITION_ATTRS:
+        value = None
+        if xfrm is not None:
+            child = xfrm.find(qn(f"a:{child_tag}"))
+            if child is not None:
+                value = Emu(int(child.get(xml_attr)))
+        position[attr] = value
+    return position
+
+
+def read_paragraph_text(p):
+    parts = []
+    for child in p:
+        if child.tag == qn("a:br"):
+            parts.append("\v")
+        elif child.tag in (qn("a:r"), qn("a:fld")):
+            t = child.find(qn("a:t"))
+            parts.append((t.text or "") if t is not None else "")
+    return "".join(parts)
+
+
+def read_color_element(fill_parent):
+    """ColorInfo for a fill parent, with rgb left to be resolved later."""
+    fill = None
+    if fill_parent is not None:
+        for child in fill_parent:
+            if child.tag in FILL_TYPES:
+                fill = child
+                break
+    if fill is None or fill.tag != qn("a:solidFill") or not len(fill):
+        # Default to the theme's dark text colour if no colour is found
+        return ColorInfo(None, None, MSO_THEME_COLOR.DARK_1, 0)
+
+    color_element = fill[0]
+    color_type = COLOR_TYPES.get(color_element.tag)
+    if color_type == MSO_COLOR_TYPE.RGB:
+        return ColorInfo(color_type, color_element.get("val").upper(), None, 0)
+    theme_color = MSO_THEME_COLOR.NOT_THEME_COLOR
+    if color_type == MSO_COLOR_TYPE.SCHEME:
+        theme_color = MSO_THEME_COLOR.from_xml(color_element.get("val"))
+    return ColorInfo(color_type, None, theme_color, read_brightness(color_element))
+
+
+def read_fill_type(fill_parent):
+    if fill_parent is None:
+        return None
+    for child in fill_parent:
+        if child.tag in FILL_TYPES:
+            return FILL_TYPES[child.tag]
+    return None
+
+
+def read_fill(shape_info, fill_parent):
+    shape_info.fill_type = read_fill_type(fill_parent)
+    if shape_info.fill_type == MSO_FILL.SOLID:
+        shape_info.fill_color = read_color_element(fill_parent)
+
+
+def read_text_body(shape_info, tx_body):
+    paragraphs = tx_body.findall(qn("a:p")) if tx_body is not None else []
+    shape_info.has_text_frame = True
+    shape_info.text = "\n".join(read_paragraph_text(p) for p in paragraphs)
+    # python-pptx reports an empty text frame as a single paragraph
+    shape_info.num_paragraphs = len(paragraphs) or 1
+    for p in paragraphs:
+        for r in p.iterfind(qn("a:r")):
+            t = r.find(qn("a:t"))
+            r_pr = r.find(qn("a:rPr"))
+            sz = r_pr.get("sz") if r_pr is not None else None
+            shape_info.runs.append(RunInfo(
+                (t.text or "") if t is not None else "",
+                Centipoints(int(sz)) if sz is not None else None,
+                read_color_element(r_pr)))
+
+
+def read_shape_type(element, ph):
+    tag = element.tag
+    if tag == qn("p:sp"):
+        if ph is not None:
+            return MSO_SHAPE_TYPE.PLACEHOLDER
+        sp_pr = element.find(qn("p:spPr"))
+        if sp_pr is not None and sp_pr.find(qn("a:custGeom")) is not None:
+            return MSO_SHAPE_TYPE.FREEFORM
+        c_nv_sp_pr = element.find(f"{qn('p:nvSpPr')}/{qn('p:cNvSpPr')}")
+        is_textbox = (c_nv_sp_pr is not None and
+                      c_nv_sp_pr.get("txBox") in ("1", "true"))
+        if sp_pr is not None and sp_pr.find(qn("a:prstGeom")) is not None and not is_textbox:
+            return MSO_SHAPE_TYPE.AUTO_SHAPE
+        return MSO_SHAPE_TYPE.TEXT_BOX if is_textbox else None
+    if tag == qn("p:pic"):
+        if ph is not None:
+            return MSO_SHAPE_TYPE.PLACEHOLDER
+        if element.find(f"{qn('p:nvPicPr')}/{qn('p:nvPr')}/{qn('a:videoFile')}") is not None:
+            return MSO_SHAPE_TYPE.MEDIA
+        return MSO_SHAPE_TYPE.PICTURE
+    if tag == qn("p:graphicFrame"):
+        graphic_data = element.find(f"{qn('a:graphic')}/{qn('a:graphicData')}")
+        uri = graphic_data.get("uri") if graphic_data is not None else None
+        if uri == GRAPHIC_DATA_URI_OLEOBJ:
+            ole_obj = graphic_data.find(qn("p:oleObj"))
+            is_embedded = ole_obj is not None and ole_obj.find(qn("p:embed")) is not None
+            return (MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT if is_embedded
+                    else MSO_SHAPE_TYPE.LINKED_OLE_OBJECT)
+        return GRAPHIC_TYPES.get(uri)
+    if tag == qn("p:cxnSp"):
+        return MSO_SHAPE_TYPE.LINE
+    if tag == qn("p:grpSp"):
+        return MSO_SHAPE_TYPE.GROUP
+    return None
+
+
+def read_shape(element, layout, transform=IDENTITY_TRANSFORM, load_image=None):
+    ph = read_placeholder(element)
+    tag = element.tag
+
+    shape_info = ShapeInfo()
+    c_nv_pr = element.find(f"*/{qn('p:cNvPr')}")
+    shape_info.shape_id = int(c_nv_pr.get("id")) if c_nv_pr is not None else None
+    shape_info.shape_type = read_shape_type(element, ph)
+    if shape_info.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
+        prst_geom = element.find(f"{qn('p:spPr')}/{qn('a:prstGeom')}")
+        shape_info.auto_shape_type = MSO_AUTO_SHAPE_TYPE.from_xml(prst_geom.get("prst"))
+
+    position = read_position(element)
+    if ph is not None and tag in (qn("p:sp"), qn("p:pic")):
+        # Slide placeholders inherit missing geometry from their layout
+        position = layout.inherit_position(position, placeholder_idx(ph))
+    place_shape(shape_info, position["left"], position["top"], position["width"],
+                position["height"], transform)
+
+    if tag == qn("p:grpSp"):
+        child_transform = group_transform(element, transform)
+        shape_info.children = [read_shape(child, layout, child_transform, load_image)
+                               for child in element if child.tag in SHAPE_TAGS]
+
+    if tag == qn("p:cxnSp"):
+        sp_pr = element.find(qn("p:spPr"))
+        ln = sp_pr.find(qn("a:ln")) if sp_pr is not None else None
+        width = int(ln.get("w", 0)) if ln is not None else 0
+        shape_info.line_width_pt = Emu(width).pt
+        read_fill(shape_info, ln)
+    elif tag == qn("p:sp"):
+        read_fill(shape_info, element.find(qn("p:spPr")))
+
+    if shape_info.shape_type == MSO_SHAPE_TYPE.PICTURE and load_image is not None:
+        blip = element.find(f"{qn('p:blipFill')}/{qn('a:blip')}")
+        r_id = blip.get(qn("r:embed")) if blip is not None else None
+        if r_id:
+            shape_info.image = load_image(r_id)
+
+    if tag == qn("p:sp"):
+        read_text_body(shape_info, element.find(qn("p:txBody")))
+    return shape_info
+
+
+class PackageReader:
+    """Resolves parts and relationships of an open .pptx zip."""
+
+    def __init__(self, zip_file):
+        self.zip_file = zip_file
+        self._rels = {}
+
+    def read(self, partname):
+        return self.zip_file.read(partname)
+
+    def open(self, partname):
+        return self.zip_file.open(partname)
+
+    def rels(self, partname):
+        rels = self._rels.get(partname)
+        if rels is None:
+            rels = {}
+            directory, filename = posixpath.split(partname)
+            rels_name = posixpath.join(directory, "_rels", filename + ".rels")
+            if rels_name in self.zip_file.NameToInfo:
+                for rel in etree.fromstring(self.read(rels_name)):
+                    if rel.get("TargetMode") == "External":
+                        continue
+                    target = rel.get("Target")
+                    if target.startswith("/"):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join(directory, target))
+                    rels[rel.get("Id")] = (rel.get("Type"), target)
+            self._rels[partname] = rels
+        return rels
+
+    def related(self, partname, reltype):
+        for rel_type, target in self.rels(partname).values():
+            if rel_type == reltype:
+                return target
+        return None
+
+
+class MasterInfo:
+    def __init__(self, package, partname):
+        element = etree.fromstring(package.read(partname))
+        self.element = element
+        self.theme_partname = package.related(partname, RT.THEME)
+        self.bg = element.find(f"{qn('p:cSld')}/{BG}")
+        self._placeholders = [(ph, shape) for ph, shape in iter_placeholders(element)]
+
+    def position_for_type(self, ph_type):
+        for ph, shape in self._placeholders:
+            if placeholder_type(ph) == ph_type:
+                return read_position(shape)
+        return None
+
+
+class LayoutInfo:
+    def __init__(self, package, partname, master):
+        element = etree.fromstring(package.read(partname))
+        self.master = master
+        self.clr_map_ovr = element.find(CLR_MAP_OVR)
+        self.bg = element.find(f"{qn('p:cSld')}/{BG}")
+        self._placeholders = list(iter_placeholders(element))
+        self._positions = {}
+
+    def position_for_idx(self, idx):
+        if idx not in self._positions:
+            position = None
+            for ph, shape in self._placeholders:
+                if placeholder_idx(ph) != idx:
+                    continue
+                position = read_position(shape)
+                if shape.tag == qn("p:sp"):
+                    # Layout placeholders in turn inherit from the master
+                    base_type = BASE_PLACEHOLDER_TYPES.get(placeholder_type(ph))
+                    base = self.master.position_for_type(base_type)
+                    if base is not None:
+                        position = {attr: value if value is not None else base[attr]
+                                    for attr, value in position.items()}
+                break
+            self._positions[idx] = position
+        return self._positions[idx]
+
+    def inherit_position(self, position, idx):
+        if all(value is not None for value in position.values()):
+            return position
+        base = self.position_for_idx(idx)
+        if base is None:
+            return position
+        return {attr: value if value is not None else base[attr]
+                for attr, value in position.items()}
+
+
+def iter_placeholders(element):
+    sp_tree = element.find(f"{qn('p:cSld')}/{SP_TREE}")
+    if sp_tree is None:
+        return
+    for shape in sp_tree:
+        if shape.tag in SHAPE_TAGS:
+            ph = read_placeholder(shape)
+            if ph is not None:
+                yield ph, shape
+
+
+def read_notes_runs(package, notes_partname):
+    element = etree.fromstring(package.read(notes_partname))
+    for ph, shape in iter_placeholders(element):
+        if placeholder_type(ph) != "body":
+            continue
+        if shape.tag != qn("p:sp"):
+            return []
+        tx_body = shape.find(qn("p:txBody"))
+        if tx_body is None:
+            return []
+        return [(t.text or "") if t is not None else ""
+                for t in (r.find(qn("a:t")) for r in tx_body.iterfind(f"{qn('a:p')}/{qn('a:r')}"))]
+    return []
+
+
+def read_slide_title(package, partname):
+    """Text of the slide's title placeholder, reading no further than it."""
+    for _, element in etree.iterparse(package.open(partname), events=("end",),
+                                      tag=qn("p:sp")):
+        parent = element.getparent()
+        if parent is None or parent.tag != SP_TREE:
+            continue
+        ph = read_placeholder(element)
+        if ph is not None and placeholder_idx(ph) == 0:
+            tx_body = element.find(qn("p:txBody"))
+            paragraphs = tx_body.findall(qn("a:p")) if tx_body is not None else []
+            return "\n".join(read_paragraph_text(p) for p in paragraphs)
+        element.clear()
+    return None
+
+
+def resolve_color(color, context):
+    if color is not None and color.color_type != MSO_COLOR_TYPE.RGB:
+        color.rgb = context.theme_color_rgb(color.theme_color, color.brightness)
+
+
+def stream_slide(index, package, partname, layout, load_image=None):
+    slide_info = SlideInfo(index)
+    slide_bg = None
+    clr_map_ovr = None
+
+    events = etree.iterparse(package.open(partname), events=("end",),
+                             tag=list(SHAPE_TAGS) + [BG, CLR_MAP_OVR])
+    for _, element in events:
+        parent = element.getparent()
+        if element.tag == BG:
+            slide_bg = element
+            continue
+        if element.tag == CLR_MAP_OVR:
+            clr_map_ovr = element
+            continue
+        if parent is None or parent.tag != SP_TREE:
+            # Shapes nested in a group are read (and cleared) with the group
+            continue
+
+        ph = read_placeholder(element)
+        shape_info = read_shape(element, layout, load_image=load_image)
+        if (slide_info.title is None and ph is not None and placeholder_idx(ph) == 0
+                and element.tag == qn("p:sp")):
+            slide_info.title = shape_info.text
+            slide_info.is_backup = "backup" in slide_info.title.lower()
+        slide_info.shapes.append(shape_info)
+
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
+    return slide_info, slide_bg, clr_map_ovr
+
+
+class ZipDeck:
+    """Slide-by-slide access to a .pptx zip.
+
+    Layouts, masters and themes are loaded the first time a slide that uses
+    them is read. Pictures are only read when load_images is set, i.e. when
+    the contrast rule will run.
+    """
+
+    def __init__(self, path_to_presentation, load_images=True):
+        self.zip_file = zipfile.ZipFile(path_to_presentation)
+        self.package = PackageReader(self.zip_file)
+        self.theme_resolver = ThemeResolver()
+        self.load_images = load_images
+        self.image_cache = IMAGE_CACHE
+        self._images = {}
+        self._masters = {}
+        self._layouts = {}
+
+        package = self.package
+        presentation_partname = next(target for rel_type, target in package.rels("").values()
+                                     if rel_type == RT.OFFICE_DOCUMENT)
+        presentation = etree.fromstring(package.read(presentation_partname))
+        sld_sz = presentation.find(qn("p:sldSz"))
+        self.slide_width = Emu(int(sld_sz.get("cx"))) if sld_sz is not None else None
+        self.slide_height = Emu(int(sld_sz.get("cy"))) if sld_sz is not None else None
+
+        presentation_rels = package.rels(presentation_partname)
+        sld_id_lst = presentation.find(qn("p:sldIdLst"))
+        self.slide_partnames = [presentation_rels[sld_id.get(qn("r:id"))][1]
+                                for sld_id in (sld_id_lst if sld_id_lst is not None else [])]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.zip_file.close()
+
+    @property
+    def num_slides(self):
+        return len(self.slide_partnames)
+
+    def slide_parts(self, index):
+        """Partnames of the slide, its notes, layout, master, theme and pictures."""
+        package = self.package
+        partname = self.slide_partnames[index]
+        layout_partname = package.related(partname, RT.SLIDE_LAYOUT)
+        master_partname = package.related(layout_partname, RT.SLIDE_MASTER)
+        images = sorted(target for rel_type, target in package.rels(partname).values()
+                        if rel_type == RT.IMAGE)
+        return (partname, package.related(partname, RT.NOTES_SLIDE), layout_partname,
+                master_partname, package.related(master_partname, RT.THEME), *images)
+
+    def get_layout(self, layout_partname):
+        layout = self._layouts.get(layout_partname)
+        if layout is None:
+            master_partname = self.package.related(layout_partname, RT.SLIDE_MASTER)
+            master = self._masters.get(master_partname)
+            if master is None:
+                master = MasterInfo(self.package, master_partname)
+                self._masters[master_partname] = master
+            layout = LayoutInfo(self.package, layout_partname, master)
+            self._layouts[layout_partname] = layout
+        return layout
+
+    def get_image(self, partname, r_id):
+        """PictureRef of a slide's picture relationship; each part is decoded once.
+
+        The zip is closed after extraction, so pictures are decoded to their
+        luminance grid right away and only the grid is kept, not the bytes.
+        """
+        rel = self.package.rels(partname).get(r_id)
+        if rel is None or rel[1] not in self.zip_file.NameToInfo:
+            return None
+        image_partname = rel[1]
+        image = self._images.get(image_partname)
+        if image is None:
+            image = PictureRef(image_partname, info=load_image_info(
+                self.package.read(image_partname), self.image_cache))
+            self._images[image_partname] = image
+        return image
+
+    def read_slide(self, index):
+        package = self.package
+        partname = self.slide_partnames[index]
+        layout = self.get_layout(package.related(partname, RT.SLIDE_LAYOUT))
+        master = layout.master
+
+        load_image = ((lambda r_id: self.get_image(partname, r_id))
+                      if self.load_images else None)
+        slide_info, slide_bg, clr_map_ovr = stream_slide(index, package, partname, layout,
+                                                         load_image)
+
+        # The colour map override follows the shape tree, so colours are
+        # resolved once the whole slide has been read
+        color_map = effective_color_map(master.element, [layout.clr_map_ovr, clr_map_ovr])
+        theme_partname = master.theme_partname
+        context = self.theme_resolver.get_context(
+            theme_partname, lambda: package.read(theme_partname), color_map)
+        slide_info.background_rgb = first_background([slide_bg, layout.bg, master.bg], context)
+        for shape_info in iter_shapes(slide_info.shapes):
+            resolve_color(shape_info.fill_color, context)
+            for run in shape_info.runs:
+                resolve_color(run.color, context)
+
+        notes_partname = package.related(partname, RT.NOTES_SLIDE)
+        if notes_partname is not None:
+            slide_info.notes_runs = read_notes_runs(package, notes_partname)
+        return slide_info
+
+    def iter_titles_and_notes(self):
+        """(title, notes_runs) of every slide, without reading any shapes.
+
+        Layouts, masters and themes are not loaded at all.
+        """
+        package = self.package
+        for partname in self.slide_partnames:
+            notes_partname = package.related(partname, RT.NOTES_SLIDE)
+            notes_runs = (read_notes_runs(package, notes_partname)
+                          if notes_partname is not None else [])
+            yield read_slide_title(package, partname), notes_runs
+
+
+def build_deck_snapshot_from_zip(path_to_presentation, load_images=True):
+    """DeckSnapshot of the .pptx at path_to_presentation, without python-pptx."""
+    with ZipDeck(path_to_presentation, load_images) as zip_deck:
+        slides = [zip_deck.read_slide(index) for index in range(zip_deck.num_slides)]
+        return DeckSnapshot(zip_deck.slide_width, zip_deck.slide_height, slides)
@@ -0,0 +1,69 @@
+"""Fail-fast checking for PPTChecker
+
+For CI gates that only need to know whether a deck passes. Slides are read
+one at a time from the zip and the selected rules visit each slide as soon
+as it has been read; the check stops at the first finding of any severity,
+so a failing deck is usually rejected after a few slides and no report is
+built. Deck-level rules (slide numbers overall, the summary slide) can only
+fail once every slide has been read.
+"""
+
+from engine import DeckSnapshot
+from extract import ZipDeck
+from findings import FindingsStore
+from incremental import make_stub
+from ndjson import DeckHeader
+from rules import is_selected, make_visitors, must_end_with_summary_slide
+from util import initialize_word_set
+
+
+class Violation:
+    def __init__(self, rule, message, slide_number=None):
+        self.rule = rule
+        self.message = message
+        self.slide_number = slide_number
+
+    def __str__(self):
+        if self.slide_number is None:
+            return f"{self.rule}: {self.message}"
+        return f"Slide {self.slide_number}: {self.rule}: {self.message}"
+
+
+def first_violation(path_to_presentation, config, rules=None, wordset=None):
+    """The first Violation of the selected rules, or None if the deck passes."""
+    findings = FindingsStore()
+
+    # Pictures are only read when the contrast rule is selected
+    load_images = is_selected("should_have_high_contrast_fonts_colours", rules)
+    with ZipDeck(path_to_presentation, load_images) as zip_deck:
+        header = DeckHeader(zip_deck)
+        # WordNet is only loaded when the sentence rule is selected
+        if is_selected("does_not_have_complete_sentences", rules):
+            wordset = wordset if wordset else initialize_word_set()
+        visitors = make_visitors(header, config, findings, wordset, rules=rules)
+
+        stubs = []
+        is_active = True
+        for index in range(zip_deck.num_slides):
+            slide = zip_deck.read_slide(index)
+            stubs.append(make_stub(slide, index))
+            # Like DeckSnapshot.active_slides, rules stop at the first backup slide
+            is_active = is_active and not slide.is_backup
+            if not is_active:
+                continue
+            for visitor in visitors:
+                visitor.visit(slide)
+                if len(findings):
+                    finding = findings[0]
+                    return Violation(finding.rule, finding.message, slide.number)
+
+    for visitor in visitors:
+        if not visitor.result():
+            return Violation(visitor.rule, "Not satisfied by any slide.")
+
+    deck = DeckSnapshot(header.slide_width, header.slide_height, stubs)
+    if (is_selected("must_end_with_summary_slide", rules) and
+            not must_end_with_summary_slide(deck)):
+        return Violation("must_end_with_summary_slide",
+                         "The presentation does not end with a summary slide.")
+    return None
@@ -0,0 +1,153 @@
+"""Structured findings for PPTChecker
+
+Rules record each finding as a rule name, slide index, shape id, severity
+and a message template with its arguments, instead of appending text to a
+per-slide string. Findings are kept in parallel arrays of small integers;
+rule names and messages are interned, so a message repeated on hundreds
+of slides is stored once. A finding repeated on the same slide and shape
+is only kept once, and at most max_per_rule findings are kept per rule
+(the rest are only counted). Text is rendered when the report is written.
+"""
+
+import array
+
+INFO = 0
+WARNING = 1
+ERROR = 2
+SEVERITY_NAMES = ("info", "warning", "error")
+
+NO_SHAPE = -1
+
+
+class Finding:
+    __slots__ = ("rule", "slide_index", "shape_id", "severity", "template", "args")
+
+    def __init__(self, rule, slide_index, template, args=(), shape_id=None, severity=WARNING):
+        self.rule = rule
+        self.slide_index = slide_index
+        self.template = template
+        self.args = args
+        self.shape_id = shape_id
+        self.severity = severity
+
+    @property
+    def message(self):
+        return self.template.format(*self.args)
+
+    def to_dict(self):
+        return {"rule": self.rule, "shape_id": self.shape_id,
+                "severity": SEVERITY_NAMES[self.severity], "message": self.message}
+
+
+class FindingsStore:
+    def __init__(self, max_per_rule=None):
+        self.max_per_rule = max_per_rule
+        self._rule_names = []
+        self._rule_ids = {}
+        self._rule_counts = []
+        self._messages = []
+        self._message_ids = {}
+
+        self._rules = array.array("H")
+        self._slides = array.array("l")
+        self._shapes = array.array("l")
+        self._message_refs = array.array("L")
+        self._severities = array.array("B")
+
+        # Findings of the slide being added, to drop exact repeats
+        self._seen_slide = None
+        self._seen = set()
+
+    def __len__(self):
+        return len(self._rules)
+
+    def intern_rule(self, rule):
+        rule_id = self._rule_ids.get(rule)
+        if rule_id is None:
+            rule_id = self._rule_ids[rule] = len(self._rule_names)
+            self._rule_names.append(rule)
+            self._rule_counts.append(0)
+        return rule_id
+
+    def intern_message(self, template, args):
+        key = (template, args)
+        message_id = self._message_ids.get(key)
+        if message_id is None:
+            message_id = self._message_ids[key] = len(self._messages)
+            self._messages.append(key)
+        return message_id
+
+    def add(self, rule, slide_index, template, args=(), shape_id=None, severity=WARNING):
+        """Record a finding; False if it repeats one or the rule is over its cap."""
+        rule_id = self.intern_rule(rule)
+        message_id = self.intern_message(template, tuple(args))
+        shape_ref = NO_SHAPE if shape_id is None else shape_id
+
+        if slide_index != self._seen_slide:
+            self._seen_slide = slide_index
+            self._seen = set()
+        key = (rule_id, shape_ref, message_id)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+
+        self._rule_counts[rule_id] += 1
+        if self.max_per_rule is not None and self._rule_counts[rule_id] > self.max_per_rule:
+            return False
+
+        self._rules.append(rule_id)
+        self._slides.append(slide_index)
+        self._shapes.append(shape_ref)
+        self._message_refs.append(message_id)
+        self._severities.append(severity)
+        return True
+
+    def add_finding(self, finding, slide_index=None):
+        """Add a Finding, optionally moved to slide_index."""
+        return self.add(finding.rule,
+                        finding.slide_index if slide_index is None else slide_index,
+                        finding.template, finding.args, finding.shape_id, finding.severity)
+
+    def __getitem__(self, position):
+        template, args = self._messages[self._message_refs[position]]
+        shape_ref = self._shapes[position]
+        return Finding(self._rule_names[self._rules[position]], self._slides[position],
+                       template, args, None if shape_ref == NO_SHAPE else shape_ref,
+                       self._severities[position])
+
+    def findings(self, start=0):
+        return [self[position] for position in range(start, len(self))]
+
+    def findings_by_slide(self):
+        by_slide = {}
+        for finding in self.findings():
+            by_slide.setdefault(finding.slide_index, []).append(finding)
+        return by_slide
+
+    def count(self, rule):
+        """Findings of rule, including those over the cap."""
+        rule_id = self._rule_ids.get(rule)
+        return 0 if rule_id is None else self._rule_counts[rule_id]
+
+    @property
+    def num_omitted(self):
+        """Rule name -> findings dropped by max_per_rule."""
+        if self.max_per_rule is None:
+            return {}
+        return {rule: count - self.max_per_rule
+                for rule, count in zip(self._rule_names, self._rule_counts)
+                if count > self.max_per_rule}
+
+    def slide_feedback(self, num_slides):
+        """Feedback text per slide, one line per finding."""
+        rendered = [None] * len(self._messages)
+        feedback = [[] for _ in range(num_slides)]
+        for slide_index, message_id in zip(self._slides, self._message_refs):
+            if slide_index >= num_slides:
+                continue
+            text = rendered[message_id]
+            if text is None:
+                template, args = self._messages[message_id]
+                text = rendered[message_id] = template.format(*args) + "\n"
+            feedback[slide_index].append(text)
+        return ["".join(lines) for lines in feedback]
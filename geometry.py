@@ -0,0 +1,58 @@
+"""Columnar shape geometry for PPTChecker
+
+Shapes are laid out in NumPy structured arrays, one row per shape and one
+column per property, so shape matching between consecutive slides finds
+the pairs within the position tolerance with array operations instead of
+comparing every pair of shapes.
+"""
+
+SHAPE_DTYPE = [
+    ("placed", "?"), # False if the position or size is not set
+    ("left", "i8"),
+    ("top", "i8"),
+]
+
+
+def shape_row(shape):
+    placed = None not in (shape.left, shape.top, shape.width, shape.height)
+    return (placed, *((shape.left, shape.top) if placed else (0, 0)))
+
+
+def shape_table(shapes):
+    """Table of shapes, without the contents of groups."""
+    import numpy as np
+
+    return np.array([shape_row(shape) for shape in shapes], dtype=SHAPE_DTYPE)
+
+
+def pairs_within_bounds(prev, curr, shape_pos_threshold, slide_width, slide_height):
+    """(prev rows, curr rows) of the pairs of placed shapes within the threshold.
+
+    A pair is within bounds if the current shape's top-left corner is within
+    shape_pos_threshold of the slide size of the previous shape's, in both
+    directions. Pairs are ordered by previous row, then current row.
+    """
+    import numpy as np
+
+    step_x = slide_width * shape_pos_threshold
+    step_y = slide_height * shape_pos_threshold
+    prev_rows = np.flatnonzero(prev["placed"])
+    curr_rows = np.flatnonzero(curr["placed"])
+
+    # Candidates by left edge, through a sorted column rather than all pairs
+    curr_rows = curr_rows[np.argsort(curr["left"][curr_rows], kind="stable")]
+    curr_left = curr["left"][curr_rows]
+    prev_left = prev["left"][prev_rows]
+    start = np.searchsorted(curr_left, prev_left - step_x, side="left")
+    end = np.searchsorted(curr_left, prev_left + step_x, side="right")
+    counts = end - start
+    first = np.repeat(start - (np.cumsum(counts) - counts), counts)
+    curr_pairs = curr_rows[first + np.arange(counts.sum())]
+    prev_pairs = np.repeat(prev_rows, counts)
+
+    prev_top = prev["top"][prev_pairs]
+    curr_top = curr["top"][curr_pairs]
+    within = (prev_top - step_y <= curr_top) & (curr_top <= prev_top + step_y)
+    prev_pairs, curr_pairs = prev_pairs[within], curr_pairs[within]
+    order = np.lexsort((curr_pairs, prev_pairs))
+    return prev_pairs[order], curr_pairs[order]
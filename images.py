@@ -0,0 +1,135 @@
+"""Picture luminance for PPTChecker contrast checks
+
+Each picture is decoded once, reduced to at most GRID_SIZE pixels on its
+longer side, and kept as a grid of relative luminances (NaN where the
+picture is transparent). Grids are cached by the SHA1 of the image part,
+so a logo repeated on every slide is only decoded once per process.
+Contrast against a picture is the median contrast ratio over the pixels
+in question, so a few dark or light pixels do not decide the result.
+"""
+
+import hashlib
+import io
+from collections import OrderedDict
+from contrast import hex_channels, relative_luminance
+
+GRID_SIZE = 64
+# Pixels less opaque than this are treated as transparent
+MIN_ALPHA = 128
+
+
+class ImageInfo:
+    __slots__ = ("sha1", "luminance")
+
+    def __init__(self, sha1, luminance):
+        self.sha1 = sha1
+        # None if the picture could not be decoded (e.g. EMF or SVG)
+        self.luminance = luminance
+
+
+def decode_luminance(blob):
+    """Luminance grid of the image in blob, or None if it cannot be decoded."""
+    import numpy as np
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(blob)) as image:
+            # JPEGs are decoded straight at (close to) the reduced size
+            image.draft("RGB", (GRID_SIZE, GRID_SIZE))
+            image.thumbnail((GRID_SIZE, GRID_SIZE))
+            pixels = np.asarray(image.convert("RGBA"), dtype=np.float64)
+    except Exception:
+        return None
+    luminance = relative_luminance(pixels[..., :3])
+    luminance[pixels[..., 3] < MIN_ALPHA] = np.nan
+    return luminance
+
+
+class ImageCache:
+    """Decoded pictures by SHA1, least recently used first out."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+
+    def __len__(self):
+        return len(self._images)
+
+    def get(self, sha1, read_blob):
+        """ImageInfo for sha1; read_blob() is only called to decode a new picture."""
+        image = self._images.get(sha1)
+        if image is not None:
+            self.hits += 1
+            self._images.move_to_end(sha1)
+            return image
+        self.misses += 1
+        image = self._images[sha1] = ImageInfo(sha1, decode_luminance(read_blob()))
+        if len(self._images) > self.maxsize:
+            self._images.popitem(last=False)
+        return image
+
+
+IMAGE_CACHE = ImageCache()
+
+
+def load_image_info(blob, image_cache=IMAGE_CACHE):
+    """ImageInfo of the image bytes in blob, decoded unless already cached."""
+    return image_cache.get(hashlib.sha1(blob).hexdigest(), lambda: blob)
+
+
+class PictureRef:
+    """The image part of a picture, hashed and decoded the first time it is used.
+
+    Reading a deck therefore never touches picture bytes unless a rule asks
+    for them.
+    """
+
+    def __init__(self, partname, load=None, info=None):
+        self.partname = partname
+        self._load = load
+        self._info = info
+
+    @property
+    def info(self):
+        if self._info is None and self._load is not None:
+            self._info = self._load()
+            self._load = None
+        return self._info
+
+    def __repr__(self):
+        return f"PictureRef({self.partname!r})"
+
+
+def median_contrast(luminance, color):
+    """Median contrast ratio of the hex colour with the opaque pixels, or None."""
+    import numpy as np
+
+    pixels = luminance[~np.isnan(luminance)]
+    if pixels.size == 0:
+        return None
+    color_luminance = relative_luminance(np.array(hex_channels(color), dtype=np.float64))
+    ratios = ((np.maximum(pixels, color_luminance) + 0.05) /
+              (np.minimum(pixels, color_luminance) + 0.05))
+    return float(np.median(ratios))
+
+
+def covered_region(luminance, picture, left, top, width, height):
+    """(row0, row1, column0, column1) of the picture's grid under the slide area, or None."""
+    if None in (picture.left, picture.top, picture.width, picture.height,
+                left, top, width, height) or not picture.width or not picture.height:
+        return None
+    rows, columns = luminance.shape
+    x0 = max(left, picture.left)
+    y0 = max(top, picture.top)
+    x1 = min(left + width, picture.left + picture.width)
+    y1 = min(top + height, picture.top + picture.height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+
+    column0 = int((x0 - picture.left) * columns // picture.width)
+    row0 = int((y0 - picture.top) * rows // picture.height)
+    column1 = max(column0 + 1, -int(-(x1 - picture.left) * columns // picture.width))
+    row1 = max(row0 + 1, -int(-(y1 - picture.top) * rows // picture.height))
+    return row0, row1, column0, column1
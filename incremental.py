@@ -0,0 +1,262 @@
+"""Incremental re-checking for PPTChecker
+
+Findings are cached on disk per slide, keyed by the slide's XML, its notes,
+layout, master and theme (by the CRC-32 and size that the zip directory
+already records for each part), the slide size and the config. On a re-run
+only slides whose key changed are parsed and analysed:
+
+- contrast, excessive text and complete sentences only look at one slide,
+  so their findings are reused as they are;
+- slide transitions compare neighbouring slides, so they are cached per
+  pair of slide keys and a changed slide re-checks both of its neighbours;
+- slide numbers, the summary slide and the time estimate depend on the
+  whole deck, but only need titles, notes and slide-number shapes, which
+  are kept in a small stub per slide and re-run every time.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from engine import DeckSnapshot, ShapeInfo, SlideInfo, run_visitors
+from extract import ZipDeck
+from contrast import ContrastCache
+from findings import FindingsStore
+from rules import (
+    SlideNumbersVisitor,
+    SlideTransitionsVisitor,
+    ContrastVisitor,
+    ExcessiveTextVisitor,
+    CompleteSentencesVisitor,
+    RULES_VERSION,
+)
+from util import initialize_word_set
+
+# Bump whenever the format of the cache changes; rule changes bump RULES_VERSION
+CACHE_VERSION = 4
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pptchecker")
+
+
+class SlideDigest:
+    """Everything a later run needs from a slide without reading it again."""
+    __slots__ = ("stub", "feedback")
+
+    def __init__(self, stub, feedback=None):
+        self.stub = stub
+        # Contrast, excessive text and complete sentence findings, or None
+        # while the slide has not been analysed (e.g. it is a backup slide)
+        self.feedback = feedback
+
+
+def is_slide_number_candidate(shape):
+    if not shape.has_text_frame or shape.num_paragraphs != 1:
+        return False
+    shape_text = shape.text.strip()
+    return shape_text.isdigit() or shape_text == "‹#›"
+
+
+def make_stub(slide, index):
+    """Copy of slide with only what the deck-level rules look at."""
+    stub = SlideInfo(index)
+    stub.title = slide.title
+    stub.is_backup = slide.is_backup
+    stub.notes_runs = slide.notes_runs
+    for shape in slide.shapes:
+        if is_slide_number_candidate(shape):
+            shape_stub = ShapeInfo()
+            shape_stub.shape_id = shape.shape_id
+            shape_stub.shape_type = shape.shape_type
+            shape_stub.left = shape.left
+            shape_stub.top = shape.top
+            shape_stub.has_text_frame = True
+            shape_stub.num_paragraphs = 1
+            shape_stub.text = shape.text
+            stub.shapes.append(shape_stub)
+    return stub
+
+
+def assemble_findings(deck, config, transition_feedback, per_slide):
+    """findings and satisfied_all, as run_visitors would produce them.
+
+    deck holds the stubs of every slide; transition_feedback and per_slide
+    (contrast, text and sentence findings) are lists of findings for each
+    active slide. Slide numbers are checked on the stubs here.
+    """
+    number_findings = FindingsStore()
+    has_slide_numbers, = run_visitors(deck, [SlideNumbersVisitor(deck, number_findings)])
+    number_feedback = number_findings.findings_by_slide()
+
+    # Added in the order a single pass over the deck would add them
+    findings = FindingsStore(config.get("max_findings_per_rule"))
+    for index in range(deck.num_active_slides):
+        for finding in number_feedback.get(index, ()):
+            findings.add_finding(finding)
+        for finding in transition_feedback[index]:
+            findings.add_finding(finding, index)
+        for rule_findings in per_slide[index]:
+            for finding in rule_findings:
+                findings.add_finding(finding, index)
+    satisfied_all = [
+        has_slide_numbers,
+        not any(transition_feedback),
+        not any(feedback[0] for feedback in per_slide),
+        not any(feedback[1] for feedback in per_slide),
+        not any(feedback[2] for feedback in per_slide),
+    ]
+    return findings, satisfied_all
+
+
+def split_by_slide(findings, indices):
+    """Findings for each of indices, as lists."""
+    by_slide = findings.findings_by_slide()
+    return [by_slide.get(index, []) for index in indices]
+
+
+class IncrementalChecker:
+    """Runs the per-slide rules on changed slides only.
+
+    With a cache_dir the cache survives between processes; without one it
+    is only kept in memory, e.g. for a long-running watch process.
+    """
+
+    def __init__(self, config, wordset=None, cache_dir=None):
+        self.config = config
+        self.wordset = wordset if wordset else initialize_word_set()
+        self.cache_dir = cache_dir
+        self.contrast_cache = ContrastCache()
+        self.num_parsed = 0
+        self.num_analysed = 0
+        self._config_key = json.dumps(config, sort_keys=True, default=str)
+        self._caches = {}
+
+    def cache_path(self, path_to_presentation):
+        name = hashlib.sha1(os.path.abspath(path_to_presentation).encode()).hexdigest()
+        return os.path.join(self.cache_dir, name + ".pickle")
+
+    def load_cache(self, path_to_presentation):
+        path_to_presentation = os.path.abspath(path_to_presentation)
+        cache = self._caches.get(path_to_presentation)
+        if cache is None and self.cache_dir:
+            # A missing, corrupt or outdated cache just means a full check
+            try:
+                with open(self.cache_path(path_to_presentation), "rb") as rfile:
+                    cache = pickle.load(rfile)
+                if (cache.get("version"), cache.get("rules_version")) != (CACHE_VERSION,
+                                                                         RULES_VERSION):
+                    cache = None
+            except Exception:
+                cache = None
+        return cache or {"version": CACHE_VERSION, "rules_version": RULES_VERSION,
+                         "slides": {}, "transitions": {}}
+
+    def save_cache(self, path_to_presentation, cache):
+        path_to_presentation = os.path.abspath(path_to_presentation)
+        self._caches[path_to_presentation] = cache
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = self.cache_path(path_to_presentation)
+        with open(cache_path + ".tmp", "wb") as wfile:
+            pickle.dump(cache, wfile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(cache_path + ".tmp", cache_path)
+
+    def slide_keys(self, zip_deck):
+        name_to_info = zip_deck.zip_file.NameToInfo
+        deck_key = (f"{CACHE_VERSION}|{RULES_VERSION}|{self._config_key}|"
+                    f"{zip_deck.slide_width}|{zip_deck.slide_height}")
+
+        keys = []
+        for index in range(zip_deck.num_slides):
+            slide_key = hashlib.sha1(deck_key.encode())
+            for partname in zip_deck.slide_parts(index):
+                info = name_to_info.get(partname) if partname else None
+                if info is None:
+                    slide_key.update(b"|-")
+                else:
+                    slide_key.update(f"|{partname}:{info.CRC}:{info.file_size}".encode())
+            keys.append(slide_key.hexdigest())
+        return keys
+
+    def check(self, path_to_presentation):
+        """Return (deck, findings, satisfied_all), like the full check.
+
+        deck only holds the stubs, which is all that summarize_findings needs.
+        """
+        config = self.config
+        cache = self.load_cache(path_to_presentation)
+        cached_slides = cache["slides"]
+        cached_transitions = cache["transitions"]
+
+        with ZipDeck(path_to_presentation) as zip_deck:
+            keys = self.slide_keys(zip_deck)
+            parsed = {}
+
+            def read_slide(index):
+                if index not in parsed:
+                    parsed[index] = zip_deck.read_slide(index)
+                return parsed[index]
+
+            digests = []
+            for index, key in enumerate(keys):
+                digest = cached_slides.get(key)
+                if digest is None:
+                    digest = SlideDigest(make_stub(read_slide(index), index))
+                    cached_slides[key] = digest
+                digests.append(digest)
+
+            deck = DeckSnapshot(zip_deck.slide_width, zip_deck.slide_height,
+                                [make_stub(digest.stub, index)
+                                 for index, digest in enumerate(digests)])
+            num_active_slides = deck.num_active_slides
+
+            # Single-slide rules, for active slides that were never analysed
+            pending = [index for index in range(num_active_slides)
+                       if digests[index].feedback is None]
+            if pending:
+                contrast_feedback = FindingsStore()
+                text_feedback = FindingsStore()
+                sentence_feedback = FindingsStore()
+                changed = DeckSnapshot(deck.slide_width, deck.slide_height,
+                                       [read_slide(index) for index in pending])
+                run_visitors(changed, [
+                    ContrastVisitor(changed, config, contrast_feedback, self.contrast_cache),
+                    ExcessiveTextVisitor(config, text_feedback),
+                    CompleteSentencesVisitor(sentence_feedback, self.wordset),
+                ])
+                per_rule = [split_by_slide(rule_findings, pending) for rule_findings in
+                            (contrast_feedback, text_feedback, sentence_feedback)]
+                for position, index in enumerate(pending):
+                    digests[index].feedback = tuple(rule_feedback[position]
+                                                    for rule_feedback in per_rule)
+
+            # Transitions, per pair of neighbouring slides
+            transitions = {}
+            transition_feedback = [[] for _ in range(num_active_slides)]
+            for index in range(1, num_active_slides):
+                pair = (keys[index - 1], keys[index])
+                feedback = cached_transitions.get(pair)
+                if feedback is None:
+                    pair_feedback = FindingsStore()
+                    visitor = SlideTransitionsVisitor(deck, config, pair_feedback)
+                    visitor.visit(read_slide(index - 1))
+                    visitor.visit(read_slide(index))
+                    feedback = pair_feedback.findings()
+                transitions[pair] = feedback
+                transition_feedback[index] = feedback
+
+            self.num_parsed = len(parsed)
+            self.num_analysed = len(pending)
+
+        # Deck-level rules are cheap on the stubs, so they always re-run
+        findings, satisfied_all = assemble_findings(
+            deck, config, transition_feedback,
+            [digests[index].feedback for index in range(num_active_slides)])
+
+        # Only keep what this version of the deck uses
+        self.save_cache(path_to_presentation, {
+            "version": CACHE_VERSION,
+            "rules_version": RULES_VERSION,
+            "slides": {key: digests[index] for index, key in enumerate(keys)},
+            "transitions": transitions,
+        })
+        return deck, findings, satisfied_all
@@ -0,0 +1,194 @@
+"""Lazy package loading for PPTChecker
+
+python-pptx reads every member of the .pptx zip into memory when a
+presentation is opened, including embedded videos and images that no rule
+looks at. open_presentation memory-maps the file instead and only reads
+the XML parts up front. Binary parts (images, media, embedded objects)
+keep a reference to their zip member and are read the first time
+something asks for their bytes, so the mapping stays open until the
+presentation is closed with close_presentation (or opened with
+lazy_presentation, which closes it on exit).
+"""
+
+import contextlib
+import mmap
+import os
+import zipfile
+from pptx.exc import PackageNotFoundError
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.package import PartFactory, XmlPart, _PackageLoader
+from pptx.opc.packuri import PACKAGE_URI, PackURI
+from pptx.opc.serialized import PackageReader, _PhysPkgReader
+from pptx.package import Package
+from pptx.util import lazyproperty
+
+
+class MappedFile:
+    """Minimal read-only file interface over an mmap, for zipfile."""
+
+    def __init__(self, mapped):
+        self._mmap = mapped
+
+    def read(self, size=-1):
+        return self._mmap.read(size)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._mmap.seek(offset, whence)
+
+    def tell(self):
+        return self._mmap.tell()
+
+    def seekable(self):
+        return True
+
+
+class MappedZipReader(_PhysPkgReader):
+    """Reads zip members on demand from a memory-mapped .pptx file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as pkg_file:
+            self._mmap = mmap.mmap(pkg_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._zip_file = zipfile.ZipFile(MappedFile(self._mmap))
+        self._names = {PackURI("/" + name): name for name in self._zip_file.namelist()}
+        self.num_reads = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._zip_file.close()
+        self._mmap.close()
+
+    def __contains__(self, pack_uri):
+        return pack_uri in self._names
+
+    def __getitem__(self, pack_uri):
+        if pack_uri not in self._names:
+            raise KeyError("no member '%s' in package" % pack_uri)
+        self.num_reads += 1
+        return self._zip_file.read(self._names[pack_uri])
+
+
+class LazyBlob:
+    """Part mixin whose bytes are read from the package on first access."""
+
+    _loaded_blob = None
+    _source = None
+
+    @property
+    def _blob(self):
+        if self._source is not None:
+            reader, partname = self._source
+            self._loaded_blob = reader[partname]
+            self._source = None
+        return self._loaded_blob
+
+    @_blob.setter
+    def _blob(self, blob):
+        self._loaded_blob = blob
+        self._source = None
+
+    @property
+    def is_loaded(self):
+        return self._source is None
+
+
+_lazy_part_classes = {}
+
+
+def lazy_part_class(part_class):
+    lazy_class = _lazy_part_classes.get(part_class)
+    if lazy_class is None:
+        lazy_class = type(f"Lazy{part_class.__name__}", (LazyBlob, part_class), {})
+        _lazy_part_classes[part_class] = lazy_class
+    return lazy_class
+
+
+class LazyPackageReader(PackageReader):
+    @lazyproperty
+    def _blob_reader(self):
+        pkg_file = self._pkg_file
+        # Streams and unzipped directories are read the usual way
+        if not isinstance(pkg_file, str) or os.path.isdir(pkg_file):
+            return _PhysPkgReader.factory(pkg_file)
+        if not zipfile.is_zipfile(pkg_file):
+            raise PackageNotFoundError("Package not found at '%s'" % pkg_file)
+        return MappedZipReader(pkg_file)
+
+    def close(self):
+        # Only a memory-mapped zip holds on to anything
+        if isinstance(self._blob_reader, MappedZipReader):
+            self._blob_reader.close()
+
+
+class LazyPackageLoader(_PackageLoader):
+    @lazyproperty
+    def _package_reader(self):
+        return LazyPackageReader(self._pkg_file)
+
+    @lazyproperty
+    def _parts(self):
+        content_types = self._content_types
+        package = self._package
+        package_reader = self._package_reader
+        package._reader = package_reader
+
+        parts = {}
+        for partname in self._xml_rels:
+            # Invalid partnames are ignored, as python-pptx does
+            if partname == "/" or partname not in package_reader:
+                continue
+            content_type = content_types[partname]
+            part_class = PartFactory._part_cls_for(content_type)
+            if issubclass(part_class, XmlPart):
+                part = part_class.load(partname, content_type, package,
+                                       package_reader[partname])
+            else:
+                part = lazy_part_class(part_class).load(partname, content_type, package, None)
+                part._source = (package_reader, partname)
+            parts[partname] = part
+        return parts
+
+
+class LazyPackage(Package):
+    _reader = None
+
+    def close(self):
+        """Release the file; binary parts not read by now can no longer be read."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _load(self):
+        pkg_xml_rels, parts = LazyPackageLoader.load(self._pkg_file, self)
+        self._rels.load_from_xml(PACKAGE_URI, pkg_xml_rels, parts)
+        return self
+
+
+def open_presentation(path_to_presentation):
+    """Drop-in replacement for pptx.Presentation(path) that defers binary parts."""
+    presentation_part = LazyPackage.open(path_to_presentation).main_document_part
+    if presentation_part.content_type not in (CT.PML_PRESENTATION_MAIN, CT.PML_PRES_MACRO_MAIN):
+        raise ValueError("file '%s' is not a PowerPoint file, content type is '%s'"
+                         % (path_to_presentation, presentation_part.content_type))
+    return presentation_part.presentation
+
+
+def close_presentation(prs):
+    """Close a presentation from open_presentation; other presentations are left as they are."""
+    package = prs.part.package
+    if isinstance(package, LazyPackage):
+        package.close()
+
+
+@contextlib.contextmanager
+def lazy_presentation(path_to_presentation):
+    """open_presentation, closing the presentation when the block ends."""
+    prs = open_presentation(path_to_presentation)
+    try:
+        yield prs
+    finally:
+        close_presentation(prs)
@@ -0,0 +1,131 @@
+"""Precompiled word lexicon for PPTChecker
+
+Compiles data/verbs.txt, data/prepositions.txt and the WordNet parts of
+speech into one versioned binary file, so that words can be classified
+without importing nltk or loading the WordNet corpus.
+
+File layout (little-endian):
+    magic (8 bytes), version (u32), word count N (u32),
+    N + 1 word offsets (u32), N flag bytes, sorted UTF-8 word blob
+
+Build it with:
+    python lexicon.py
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+LEXICON_MAGIC = b"PPTLEX\0\0"
+LEXICON_VERSION = 1
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "data", "lexicon.bin")
+
+_HEADER = struct.Struct("<8sII")
+
+# One flag bit per WordNet part of speech, plus the word list memberships
+POS_FLAGS = {'n': 1, 'v': 2, 'a': 4, 's': 8, 'r': 16}
+PREPOSITION = 32
+VERB = 64
+
+
+def wordnet_parts_of_speech(word):
+    from nltk.corpus import wordnet
+
+    pos_l = set()
+    for tmp in wordnet.synsets(word):
+        if tmp.name().split('.')[0] == word:
+            pos_l.add(tmp.pos())
+    return pos_l
+
+
+def wordnet_words():
+    from nltk.corpus import wordnet
+    return wordnet.all_lemma_names()
+
+
+def build_lexicon(output_path, verbs, prepositions, words=(),
+                  parts_of_speech=wordnet_parts_of_speech):
+    flags = {}
+    for word in words:
+        for pos in parts_of_speech(word):
+            flags[word] = flags.get(word, 0) | POS_FLAGS[pos]
+    for word in prepositions:
+        flags[word] = flags.get(word, 0) | PREPOSITION
+    for word in verbs:
+        flags[word] = flags.get(word, 0) | VERB
+
+    entries = sorted((word.encode("utf-8"), flag) for word, flag in flags.items())
+    offsets = [0]
+    for word, _ in entries:
+        offsets.append(offsets[-1] + len(word))
+
+    with open(output_path, "wb") as wfile:
+        wfile.write(_HEADER.pack(LEXICON_MAGIC, LEXICON_VERSION, len(entries)))
+        wfile.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        wfile.write(bytes(flag for _, flag in entries))
+        wfile.write(b"".join(word for word, _ in entries))
+    return len(entries)
+
+
+class Lexicon:
+    """Memory-mapped, binary-searched view of a compiled lexicon file."""
+
+    def __init__(self, path=LEXICON_PATH):
+        with open(path, "rb") as rfile:
+            self._mm = mmap.mmap(rfile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != LEXICON_MAGIC:
+            raise ValueError(f"{path} is not a PPTChecker lexicon")
+        if version != LEXICON_VERSION:
+            raise ValueError(f"{path} has lexicon version {version}, expected "
+                             f"{LEXICON_VERSION}; rebuild it with lexicon.py")
+
+        self.count = count
+        self._offsets_pos = _HEADER.size
+        self._flags_pos = self._offsets_pos + 4 * (count + 1)
+        self._words_pos = self._flags_pos + count
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, word):
+        key = word.encode("utf-8")
+        mm = self._mm
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            start, end = struct.unpack_from("<II", mm, self._offsets_pos + 4 * mid)
+            probe = mm[self._words_pos + start:self._words_pos + end]
+            if probe < key:
+                low = mid + 1
+            elif probe > key:
+                high = mid
+            else:
+                return mm[self._flags_pos + mid]
+        return 0
+
+    def close(self):
+        self._mm.close()
+
+
+def parts_of_speech_from_flags(flags):
+    return {pos for pos, flag in POS_FLAGS.items() if flags & flag}
+
+
+def main():
+    from util import load_words
+
+    parser = argparse.ArgumentParser(description='Build the PPTChecker lexicon')
+    parser.add_argument('-o', '--output', type=str, default=LEXICON_PATH)
+    args = parser.parse_args()
+
+    num_words = build_lexicon(args.output, load_words("verbs"),
+                              load_words("prepositions"), wordnet_words())
+    print(f"Wrote {num_words} words to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
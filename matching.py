@@ -0,0 +1,145 @@
+"""Shape matching between consecutive slides for PPTChecker
+
+A shape on one slide is matched with a shape of the same type and size on
+the next. Shapes are bucketed by (type, width, height); within a bucket,
+shapes that stay in place are paired first and the rest are paired with
+the nearest identical shape (same kind and text) within the position
+threshold, by increasing distance. Candidates are found with array
+operations over shape tables (see geometry.py), so a slide with hundreds
+of identical connectors costs about as much as one with a few. Groups
+matched in place are matched child by child; children of unmatched groups
+are matched with each other.
+"""
+
+from engine import iter_shapes
+from geometry import pairs_within_bounds, shape_table
+
+
+def shape_key(shape):
+    return shape.shape_type, shape.width, shape.height
+
+
+def shape_identity(shape):
+    """The shape kind and its text, which must be equal for a moved pair."""
+    if shape.has_text_frame and shape.text:
+        return shape.descriptor, shape.text
+    return (shape.descriptor,)
+
+
+class ShapeMatcher:
+    """Finds the shapes that moved slightly between two slides."""
+
+    def __init__(self, shape_pos_threshold, slide_width, slide_height):
+        self.shape_pos_threshold = shape_pos_threshold
+        self.slide_width = slide_width
+        self.slide_height = slide_height
+
+    def moved_shapes(self, prev_shapes, curr_shapes):
+        """(prev_shape, curr_shape) pairs that moved, in previous slide order."""
+        order = {id(shape): index for index, shape in enumerate(iter_shapes(prev_shapes))}
+        moved = list(self.match(prev_shapes, curr_shapes))
+        moved.sort(key=lambda pair: order[id(pair[0])])
+        return moved
+
+    def match(self, prev_shapes, curr_shapes):
+        pairs, prev_unmatched, curr_unmatched = self.assign(prev_shapes, curr_shapes)
+        for prev_shape, curr_shape in pairs:
+            if (prev_shape.left, prev_shape.top) != (curr_shape.left, curr_shape.top):
+                yield prev_shape, curr_shape
+            elif prev_shape.children and curr_shape.children:
+                yield from self.match(prev_shape.children, curr_shape.children)
+
+        prev_loose = [child for shape in prev_unmatched for child in shape.children]
+        curr_loose = [child for shape in curr_unmatched for child in shape.children]
+        if prev_loose and curr_loose:
+            yield from self.match(prev_loose, curr_loose)
+
+    def assign(self, prev_shapes, curr_shapes):
+        """Pair shapes; returns (pairs, unmatched previous, unmatched current)."""
+        buckets = {}
+        for index, shape in enumerate(prev_shapes):
+            buckets.setdefault(shape_key(shape), ([], []))[0].append((index, shape))
+        for index, shape in enumerate(curr_shapes):
+            bucket = buckets.get(shape_key(shape))
+            if bucket is not None:
+                bucket[1].append((index, shape))
+
+        pairs = []
+        prev_matched = set()
+        curr_matched = set()
+        for prev_bucket, curr_bucket in buckets.values():
+            if not curr_bucket:
+                continue
+            for (prev_index, prev_shape), (curr_index, curr_shape) in self.assign_bucket(
+                    prev_bucket, curr_bucket):
+                pairs.append((prev_shape, curr_shape))
+                prev_matched.add(prev_index)
+                curr_matched.add(curr_index)
+
+        prev_unmatched = [shape for index, shape in enumerate(prev_shapes)
+                          if index not in prev_matched]
+        curr_unmatched = [shape for index, shape in enumerate(curr_shapes)
+                          if index not in curr_matched]
+        return pairs, prev_unmatched, curr_unmatched
+
+    def assign_bucket(self, prev_bucket, curr_bucket):
+        # Shapes that did not move are paired first, in document order
+        in_place = {}
+        for entry in curr_bucket:
+            shape = entry[1]
+            in_place.setdefault((shape.left, shape.top), []).append(entry)
+
+        pairs = []
+        prev_left = []
+        curr_taken = set()
+        for prev_entry in prev_bucket:
+            prev_shape = prev_entry[1]
+            candidates = in_place.get((prev_shape.left, prev_shape.top))
+            if candidates:
+                curr_entry = candidates.pop(0)
+                curr_taken.add(curr_entry[0])
+                pairs.append((prev_entry, curr_entry))
+            else:
+                prev_left.append(prev_entry)
+
+        curr_left = [entry for entry in curr_bucket if entry[0] not in curr_taken]
+        if prev_left and curr_left:
+            pairs.extend(self.assign_nearest(prev_left, curr_left))
+        return pairs
+
+    def assign_nearest(self, prev_entries, curr_entries):
+        import numpy as np
+
+        prev_table = shape_table(entry[1] for entry in prev_entries)
+        curr_table = shape_table(entry[1] for entry in curr_entries)
+        prev_rows, curr_rows = pairs_within_bounds(
+            prev_table, curr_table, self.shape_pos_threshold,
+            self.slide_width, self.slide_height)
+
+        identities = {}
+        prev_codes = np.array([identities.setdefault(shape_identity(entry[1]), len(identities))
+                               for entry in prev_entries], dtype=np.int64)
+        curr_codes = np.array([identities.get(shape_identity(entry[1]), -1)
+                               for entry in curr_entries], dtype=np.int64)
+        same = prev_codes[prev_rows] == curr_codes[curr_rows]
+        prev_rows, curr_rows = prev_rows[same], curr_rows[same]
+
+        # Positions are integral EMUs, so squared distances are exact
+        distances = ((prev_table["left"][prev_rows] - curr_table["left"][curr_rows]) ** 2 +
+                     (prev_table["top"][prev_rows] - curr_table["top"][curr_rows]) ** 2)
+        candidates = [(distance, prev_entries[prev_row][0], curr_entries[curr_row][0],
+                       prev_entries[prev_row], curr_entries[curr_row])
+                      for prev_row, curr_row, distance in zip(
+                          prev_rows.tolist(), curr_rows.tolist(), distances.tolist())]
+
+        candidates.sort(key=lambda candidate: candidate[:3])
+        pairs = []
+        prev_taken = set()
+        curr_taken = set()
+        for _, prev_index, curr_index, prev_entry, curr_entry in candidates:
+            if prev_index in prev_taken or curr_index in curr_taken:
+                continue
+            prev_taken.add(prev_index)
+            curr_taken.add(curr_index)
+            pairs.append((prev_entry, curr_entry))
+        return pairs
@@ -0,0 +1,78 @@
+"""Streaming NDJSON output for PPTChecker
+
+Slides are read one at a time from the zip and every rule visits a slide
+before the next one is read, so each slide's findings are final as soon as
+it has been visited. They are written as one JSON line per slide and
+flushed straight away; only the slide titles and notes are kept for the
+deck-level summary line written at the end.
+
+    {"type": "deck", "slides": 42}
+    {"type": "slide", "slide": 1, "title": "...", "active": true, "findings": [...]}
+    ...
+    {"type": "summary", "time_estimate": "00:12:30", "passed": false, ...}
+"""
+
+import json
+from engine import DeckSnapshot
+from extract import ZipDeck
+from incremental import make_stub
+from pptchecker import summarize_findings
+from findings import FindingsStore
+from rules import make_visitors
+from util import initialize_word_set
+
+
+class DeckHeader:
+    """The deck-wide values rule visitors read before any slide is visited."""
+
+    def __init__(self, zip_deck):
+        self.slide_width = zip_deck.slide_width
+        self.slide_height = zip_deck.slide_height
+        self.num_slides = zip_deck.num_slides
+        self.active_slides = []
+
+
+def write_line(wfile, record):
+    wfile.write(json.dumps(record) + "\n")
+    wfile.flush()
+
+
+def stream_findings(path_to_presentation, config, wfile, wordset=None):
+    """Check the presentation, writing NDJSON to wfile slide by slide."""
+    wordset = wordset if wordset else initialize_word_set()
+    findings = FindingsStore(config.get("max_findings_per_rule"))
+
+    with ZipDeck(path_to_presentation) as zip_deck:
+        header = DeckHeader(zip_deck)
+        visitors = make_visitors(header, config, findings, wordset)
+        write_line(wfile, {"type": "deck", "slides": zip_deck.num_slides})
+
+        stubs = []
+        is_active = True
+        passed_slides = True
+        for index in range(zip_deck.num_slides):
+            slide = zip_deck.read_slide(index)
+            stubs.append(make_stub(slide, index))
+            # Like DeckSnapshot.active_slides, rules stop at the first backup slide
+            is_active = is_active and not slide.is_backup
+            num_findings = len(findings)
+            if is_active:
+                for visitor in visitors:
+                    visitor.visit(slide)
+
+            slide_findings = [finding.to_dict() for finding in findings.findings(num_findings)]
+            passed_slides = passed_slides and not slide_findings
+            write_line(wfile, {"type": "slide", "slide": slide.number, "title": slide.title,
+                               "active": is_active, "findings": slide_findings})
+
+    deck = DeckSnapshot(header.slide_width, header.slide_height, stubs)
+    satisfied_all = [visitor.result() for visitor in visitors]
+    time_estimate, display_info, _ = summarize_findings(deck, config, findings, satisfied_all)
+    general_feedback = [message for message in display_info["general_feedback"].split("<br>")
+                        if message]
+    write_line(wfile, {"type": "summary",
+                       "time_estimate": time_estimate,
+                       "slide_times": display_info["slide_times"],
+                       "cumul_slide_times": display_info["cumul_slide_times"],
+                       "general_feedback": general_feedback,
+                       "passed": passed_slides and not general_feedback})
@@ -0,0 +1,124 @@
+"""Intra-deck parallel checking for PPTChecker
+
+The slides of one deck are split into contiguous chunks and each chunk is
+checked in a worker process that opens the .pptx on its own:
+
+- contrast, excessive text and complete sentences only look at one slide;
+- slide transitions compare a slide with the one before it, so each chunk
+  also reads the slide just before its range;
+- slide numbers, the summary slide and the time estimate depend on the
+  whole deck, so workers return a small stub per slide (see incremental)
+  and those rules run on the stubs once every chunk is back.
+
+Chunks are merged in slide order, so the findings are identical to a
+sequential check.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from engine import DeckSnapshot
+from extract import ZipDeck
+from findings import FindingsStore
+from incremental import assemble_findings, make_stub, split_by_slide
+from lexicon import LEXICON_PATH
+from rules import (
+    SlideTransitionsVisitor,
+    ContrastVisitor,
+    ExcessiveTextVisitor,
+    CompleteSentencesVisitor,
+)
+from util import initialize_word_set
+
+# Chunks per worker, so that a slow chunk does not hold up the others
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_SLIDES = 16
+
+# Loaded once per worker process by init_worker
+_worker_config = None
+_worker_wordset = None
+
+
+class ChunkDeck:
+    """The deck-wide values visitors read, with only a chunk's slides active."""
+
+    def __init__(self, zip_deck, slides):
+        self.slide_width = zip_deck.slide_width
+        self.slide_height = zip_deck.slide_height
+        self.num_slides = zip_deck.num_slides
+        self.active_slides = slides
+
+
+def init_worker(config, lexicon_path=LEXICON_PATH):
+    global _worker_config, _worker_wordset
+    _worker_config = config
+    _worker_wordset = initialize_word_set(lexicon_path)
+
+
+def check_chunk(path_to_presentation, start, stop):
+    """(stub, transition findings, per-slide findings) for slides start..stop-1."""
+    config = _worker_config
+    with ZipDeck(path_to_presentation) as zip_deck:
+        previous = zip_deck.read_slide(start - 1) if start > 0 else None
+        slides = [zip_deck.read_slide(index) for index in range(start, stop)]
+        deck = ChunkDeck(zip_deck, slides)
+
+    transition_feedback = FindingsStore()
+    contrast_feedback = FindingsStore()
+    text_feedback = FindingsStore()
+    sentence_feedback = FindingsStore()
+
+    transitions = SlideTransitionsVisitor(deck, config, transition_feedback)
+    if previous is not None:
+        transitions.visit(previous)
+    visitors = [
+        transitions,
+        ContrastVisitor(deck, config, contrast_feedback),
+        ExcessiveTextVisitor(config, text_feedback),
+        CompleteSentencesVisitor(sentence_feedback, _worker_wordset),
+    ]
+    for slide in slides:
+        for visitor in visitors:
+            visitor.visit(slide)
+
+    indices = [slide.index for slide in slides]
+    per_rule = [split_by_slide(rule_findings, indices) for rule_findings in
+                (contrast_feedback, text_feedback, sentence_feedback)]
+    transition_findings = split_by_slide(transition_feedback, indices)
+    return [(make_stub(slide, slide.index), transition_findings[position],
+             tuple(rule_feedback[position] for rule_feedback in per_rule))
+            for position, slide in enumerate(slides)]
+
+
+def chunk_ranges(num_slides, jobs, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SLIDES, math.ceil(num_slides / (jobs * CHUNKS_PER_WORKER)))
+    return [(start, min(start + chunk_size, num_slides))
+            for start in range(0, num_slides, chunk_size)]
+
+
+def check_parallel(path_to_presentation, config, jobs=None, chunk_size=None,
+                   lexicon_path=LEXICON_PATH):
+    """Return (deck, findings, satisfied_all), like the sequential check.
+
+    deck only holds the stubs, which is all that summarize_findings needs.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    with ZipDeck(path_to_presentation) as zip_deck:
+        slide_width, slide_height = zip_deck.slide_width, zip_deck.slide_height
+        num_slides = zip_deck.num_slides
+
+    ranges = chunk_ranges(num_slides, jobs, chunk_size)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(ranges) or 1), initializer=init_worker,
+                             initargs=(config, lexicon_path)) as executor:
+        futures = [executor.submit(check_chunk, path_to_presentation, start, stop)
+                   for start, stop in ranges]
+        results = [result for future in futures for result in future.result()]
+
+    deck = DeckSnapshot(slide_width, slide_height, [stub for stub, _, _ in results])
+    # Slides after the first backup slide were checked too, but are dropped here
+    active = results[:deck.num_active_slides]
+    findings, satisfied_all = assemble_findings(
+        deck, config, [transition for _, transition, _ in active],
+        [per_slide for _, _, per_slide in active])
+    return deck, findings, satisfied_all
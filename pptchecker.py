@@ -2,62 +2,128 @@
 
 import argparse
 import sys
-from pptx import Presentation
-from util import display_comments_on_webpage, is_backup_slide, read_config_yaml
+from engine import get_deck_snapshot, run_visitors
+from extract import ZipDeck, build_deck_snapshot_from_zip
+from findings import FindingsStore
+from incremental import DEFAULT_CACHE_DIR, IncrementalChecker
+from lazypackage import close_presentation, lazy_presentation, open_presentation
+from report import DEFAULT_PAGE_SIZE
+from util import DEFAULT_CONFIG_PATH, display_findings, read_config_yaml
 from rules import (
     must_end_with_summary_slide,
-    should_have_slide_numbers,
-    has_smooth_slide_transitions,
-    should_have_high_contrast_fonts_colours,
-    should_not_have_excessive_text,
-    does_not_have_complete_sentences,
-    estimate_presentation_length
+    estimate_presentation_length,
+    estimate_talk_length,
+    is_selected,
+    make_visitors,
+    select_rules,
+    slide_rule_results,
+    COST_TIERS,
+    RULES,
 )
 
 parser = argparse.ArgumentParser(description='Analyze')
 parser.add_argument('-p', '--presentation', type=str)
 parser.add_argument('-o', '--output', type=str, default="output.html")
-args = parser.parse_args()
+parser.add_argument('--no-open', action='store_true',
+                    help="do not open the report in a browser (e.g. on a headless CI machine)")
+parser.add_argument('--failures-only', action='store_true',
+                    help="only list slides with feedback in the report")
+parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, metavar="SLIDES",
+                    help="split reports with more rows than this into pages with an index "
+                         f"(default: {DEFAULT_PAGE_SIZE}; 0: never)")
+parser.add_argument('--streaming', action='store_true',
+                    help="read the slide XML straight from the zip (for very large decks)")
+parser.add_argument('--profile', nargs='?', const="profile.json", default=None,
+                    metavar="JSON_PATH",
+                    help="time every rule and slide, print a summary and write "
+                         "a JSON report (default: profile.json)")
+parser.add_argument('--time-only', action='store_true',
+                    help="only estimate the presentation length, from titles and speaker notes")
+parser.add_argument('--ndjson', action='store_true',
+                    help="write findings to stdout as NDJSON, one line per slide")
+parser.add_argument('-j', '--jobs', type=int, default=None,
+                    help="split the slides across this many worker processes (0: CPU count)")
+parser.add_argument('--incremental', action='store_true',
+                    help="only re-check slides that changed since the last run")
+parser.add_argument('--watch', action='store_true',
+                    help="re-check on every save and serve a live report")
+parser.add_argument('--port', type=int, default=None,
+                    help="local port for the --watch report (default: 8765)")
+parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR,
+                    help="where --incremental keeps its per-slide cache")
+parser.add_argument('--rules', type=str, default=None, metavar="RULE,...",
+                    help="only run these rules (comma-separated): " + ", ".join(RULES))
+parser.add_argument('--skip-rules', type=str, default=None, metavar="RULE,...",
+                    help="do not run these rules (comma-separated)")
+parser.add_argument('--max-cost', choices=COST_TIERS, default=None,
+                    help="only run rules up to this cost tier")
+parser.add_argument('--fail-fast', action='store_true',
+                    help="stop at the first violation and exit with status 1, "
+                         "without writing a report")
 
 
-def main_controller(prs, config):
-    slide_feedback = []
-    for slide in prs.slides:
-        if is_backup_slide(slide):
-            break
-        slide_feedback.append("")
+def check_presentation(prs, config, wordset=None, rules=None):
+    deck = get_deck_snapshot(prs)
+    findings = FindingsStore(config.get("max_findings_per_rule"))
 
+    # All per-slide rules share a single pass over the deck
+    visitors = make_visitors(deck, config, findings, wordset, rules=rules)
+    satisfied_all = slide_rule_results(visitors, run_visitors(deck, visitors))
+    return summarize_findings(deck, config, findings, satisfied_all, rules)
+
+
+def check_presentation_incremental(checker, path_to_presentation):
+    deck, findings, satisfied_all = checker.check(path_to_presentation)
+    return summarize_findings(deck, checker.config, findings, satisfied_all)
+
+
+def check_presentation_parallel(path_to_presentation, config, jobs=None):
+    from parallel import check_parallel
+
+    deck, findings, satisfied_all = check_parallel(path_to_presentation, config, jobs)
+    return summarize_findings(deck, config, findings, satisfied_all)
+
+
+def summarize_findings(deck, config, findings, satisfied_all, rules=None):
+    # Rules that were not selected are treated as satisfied
+    ends_with_summary = (must_end_with_summary_slide(deck)
+                         if is_selected("must_end_with_summary_slide", rules) else True)
+    presentation_length = (estimate_presentation_length(deck, config)
+                           if is_selected("estimate_presentation_length", rules)
+                           else (None, None, None))
+
+    # Feedback text is only rendered here, once every rule has run
+    return combine_findings(findings.slide_feedback(deck.num_active_slides), satisfied_all,
+                            ends_with_summary, presentation_length, findings.num_omitted)
+
+
+def combine_findings(slide_feedback, satisfied_all, ends_with_summary, presentation_length,
+                     num_omitted=None):
     general_feedback = ""
     pass_all_checks = True
 
-    satisfied = must_end_with_summary_slide(prs)
-    if not satisfied:
+    (has_slide_numbers, has_smooth_transitions, has_high_contrast,
+     has_concise_text, _) = satisfied_all
+
+    if not ends_with_summary:
         general_feedback += "Please end the presention with a summary slide.<br>"
 
-    satisfied = should_have_slide_numbers(prs, slide_feedback)
-    if not satisfied:
+    if not has_slide_numbers:
         general_feedback += "Please add slide numbers.<br>"
 
-    satisfied = has_smooth_slide_transitions(prs, config, slide_feedback)
-    if not satisfied:
+    if not has_smooth_transitions:
         general_feedback += "Please check slide transitions.<br>"
 
-    satisfied = should_have_high_contrast_fonts_colours(prs, config, slide_feedback)
-    if not satisfied:
+    if not has_high_contrast:
         general_feedback += "Please check colours and fonts.<br>"
 
-    satisfied = should_not_have_excessive_text(prs, config, slide_feedback)
-    if not satisfied:
+    if not has_concise_text:
         general_feedback += "Please ensure that slides do not have too much text.<br>"
 
-    does_not_have_complete_sentences(prs, slide_feedback)
-
-    time_estimate, slide_times, cumul_slide_times = estimate_presentation_length(prs, config)
-    if time_estimate:
-        print("Estimate total time for presentation: ", time_estimate)
-    else:
-        print("Cannot estimate presentation time without any speaker notes provided!\n")
+    for rule, count in (num_omitted or {}).items():
+        general_feedback += f"{count} more findings of {rule} are not shown.<br>"
 
+    time_estimate, slide_times, cumul_slide_times = presentation_length
 
     for slide_i, _ in enumerate(slide_feedback):
         feedback = slide_feedback[slide_i]
@@ -71,11 +137,85 @@ def main_controller(prs, config):
     display_info["cumul_slide_times"] = cumul_slide_times
     display_info["general_feedback"] = general_feedback
 
-    display_comments_on_webpage(time_estimate, display_info,
-                                pass_all_checks, args.output)
+    return time_estimate, display_info, pass_all_checks
+
+
+def main_controller(prs, config, output_file="output.html", open_browser=True, rules=None,
+                    failures_only=False, page_size=DEFAULT_PAGE_SIZE):
+    display_findings(check_presentation(prs, config, rules=rules), output_file, open_browser,
+                     failures_only, page_size)
+
+
+def estimate_presentation_file(path_to_presentation, config):
+    """estimate_presentation_length, reading only titles and notes from the zip."""
+    with ZipDeck(path_to_presentation) as zip_deck:
+        return estimate_talk_length(zip_deck.iter_titles_and_notes(), config)
+
+
+def print_time_estimate(presentation_length, wfile):
+    time_estimate, slide_times, cumul_slide_times = presentation_length
+    if not time_estimate:
+        wfile.write("Not enough speaker notes to estimate the time for the presentation.\n")
+        return
+    wfile.write(f"Estimate total time for presentation: {time_estimate}\n")
+    for slide_i, (slide_time, cumul_slide_time) in enumerate(zip(slide_times,
+                                                                 cumul_slide_times)):
+        wfile.write(f"Slide {slide_i + 1}: starts at {cumul_slide_time}, takes {slide_time}\n")
+
+
+def profile_presentation_file(path_to_presentation, config, output_file, profile_path,
+                              streaming=False, **report_options):
+    from profiling import Profile, profile_presentation
+
+    profile = Profile()
+    with profile.phase("open"):
+        if streaming:
+            prs = build_deck_snapshot_from_zip(path_to_presentation)
+        else:
+            prs = open_presentation(path_to_presentation)
+    try:
+        findings, profile = profile_presentation(prs, config, profile=profile)
+    finally:
+        if not streaming:
+            close_presentation(prs)
+    with profile.phase("report"):
+        display_findings(findings, output_file, **report_options)
+
+    profile.write_json(profile_path)
+    print(profile.summary_table())
+    print(f"Profile written to {profile_path}")
+
+
+def watch_presentation(path_to_presentation, config, port=None, open_browser=True):
+    from watch import DEFAULT_PORT, PresentationWatcher
+
+    # The checker stays loaded, so only changed slides are re-checked per save
+    checker = IncrementalChecker(config)
+    watcher = PresentationWatcher(
+        path_to_presentation,
+        lambda path: check_presentation_incremental(checker, path),
+        port if port is not None else DEFAULT_PORT)
+    print(f"Watching {path_to_presentation}, report at {watcher.url} (Ctrl+C to stop)")
+
+    if open_browser:
+        import webbrowser
+        webbrowser.open_new_tab(watcher.url)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def split_names(names):
+    if names is None:
+        return None
+    return [name.strip() for name in names.split(",") if name.strip()]
 
 
 def main():
+    args = parser.parse_args()
     if not args.presentation:
         print("Must provide a presentation file.")
         sys.exit()
@@ -83,13 +223,68 @@ def main():
         print("Input file must be of '.pptx' type.")
         sys.exit()
 
-    yaml_file = "./config/default.yaml"
-    config = read_config_yaml(yaml_file)
+    config = read_config_yaml(DEFAULT_CONFIG_PATH)
+
+    try:
+        rules = select_rules(split_names(args.rules), split_names(args.skip_rules) or (),
+                             args.max_cost)
+    except ValueError as error:
+        parser.error(str(error))
+    if rules is not None and (args.time_only or args.ndjson or args.watch or args.incremental
+                              or args.jobs is not None or args.profile):
+        parser.error("--rules, --skip-rules and --max-cost only apply to a full check "
+                     "or --fail-fast")
+
+    report_options = {"open_browser": not args.no_open, "failures_only": args.failures_only,
+                      "page_size": args.page_size}
 
     path_to_presentation = args.presentation
-    prs = Presentation(path_to_presentation)
+    if args.fail_fast:
+        from failfast import first_violation
+        violation = first_violation(path_to_presentation, config, rules)
+        if violation is not None:
+            print(violation)
+            sys.exit(1)
+        return
+
+    if args.time_only:
+        print_time_estimate(estimate_presentation_file(path_to_presentation, config), sys.stdout)
+        return
+
+    if args.ndjson:
+        from ndjson import stream_findings
+        stream_findings(path_to_presentation, config, sys.stdout)
+        return
+
+    if args.watch:
+        watch_presentation(path_to_presentation, config, args.port, not args.no_open)
+        return
+
+    if args.incremental:
+        checker = IncrementalChecker(config, cache_dir=args.cache_dir)
+        display_findings(check_presentation_incremental(checker, path_to_presentation),
+                         args.output, **report_options)
+        return
+
+    if args.jobs is not None:
+        display_findings(check_presentation_parallel(path_to_presentation, config,
+                                                     args.jobs or None),
+                         args.output, **report_options)
+        return
+
+    if args.profile:
+        profile_presentation_file(path_to_presentation, config, args.output,
+                                  args.profile, args.streaming, **report_options)
+        return
+
+    if args.streaming:
+        load_images = is_selected("should_have_high_contrast_fonts_colours", rules)
+        main_controller(build_deck_snapshot_from_zip(path_to_presentation, load_images),
+                        config, args.output, rules=rules, **report_options)
+        return
 
-    main_controller(prs, config)
+    with lazy_presentation(path_to_presentation) as prs:
+        main_controller(prs, config, args.output, rules=rules, **report_options)
 
 
 if __name__ == "__main__":
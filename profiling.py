@@ -0,0 +1,208 @@
+"""Profiling for PPTChecker
+
+Runs the same checks as check_presentation while recording wall and CPU
+time per rule, per slide and per phase (opening, snapshot, setup), along
+with counters for the work done: shapes, runs, word lookups and contrast
+computations. The report is plain JSON, so runs can be diffed to catch
+regressions, and summary_table prints the slowest rules and slides.
+
+    findings, profile = profile_presentation(prs, config)
+    print(profile.summary_table())
+"""
+
+import contextlib
+import json
+import time
+from contrast import ContrastCache
+from engine import get_deck_snapshot
+from pptchecker import combine_findings
+from findings import FindingsStore
+from rules import (
+    SLIDE_RULES,
+    estimate_presentation_length,
+    make_visitors,
+    must_end_with_summary_slide,
+)
+from util import initialize_word_set
+
+NUM_SLOWEST_SLIDES = 10
+
+
+class Timing:
+    __slots__ = ("wall", "cpu", "calls")
+
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.calls = 0
+
+    def add(self, wall, cpu, calls=1):
+        self.wall += wall
+        self.cpu += cpu
+        self.calls += calls
+
+    def to_dict(self):
+        return {"wall": self.wall, "cpu": self.cpu, "calls": self.calls}
+
+
+class Profile:
+    """Timings and counters of one check, filled in by profile_presentation."""
+
+    def __init__(self):
+        self.phases = {}
+        self.rules = {}
+        self.slides = {}
+        self.slide_titles = {}
+        self.slide_sizes = {}
+        self.counters = {}
+
+    def timing(self, table, key):
+        timing = table.get(key)
+        if timing is None:
+            timing = table[key] = Timing()
+        return timing
+
+    @contextlib.contextmanager
+    def measure(self, table, key):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.timing(table, key).add(time.perf_counter() - wall,
+                                        time.process_time() - cpu)
+
+    def phase(self, name):
+        return self.measure(self.phases, name)
+
+    def rule(self, name):
+        return self.measure(self.rules, name)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @property
+    def total(self):
+        total = Timing()
+        for timing in self.phases.values():
+            total.add(timing.wall, timing.cpu)
+        for timing in self.rules.values():
+            total.add(timing.wall, timing.cpu)
+        return total
+
+    def slowest_slides(self, num_slides=NUM_SLOWEST_SLIDES):
+        return sorted(self.slides, key=lambda number: self.slides[number].wall,
+                      reverse=True)[:num_slides]
+
+    def slide_dict(self, number):
+        num_shapes, num_runs = self.slide_sizes[number]
+        return {"slide": number, "title": self.slide_titles[number],
+                "wall": self.slides[number].wall, "cpu": self.slides[number].cpu,
+                "shapes": num_shapes, "runs": num_runs}
+
+    def to_dict(self, num_slowest=NUM_SLOWEST_SLIDES):
+        total = self.total
+        return {
+            "total": {"wall": total.wall, "cpu": total.cpu},
+            "phases": {name: timing.to_dict() for name, timing in self.phases.items()},
+            "rules": {name: timing.to_dict() for name, timing in self.rules.items()},
+            "counters": dict(self.counters),
+            "slowest_slides": [self.slide_dict(number)
+                               for number in self.slowest_slides(num_slowest)],
+            "slides": [self.slide_dict(number) for number in sorted(self.slides)],
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as wfile:
+            json.dump(self.to_dict(), wfile, indent=1)
+
+    def summary_table(self, num_slowest=NUM_SLOWEST_SLIDES):
+        lines = [f"{'Phase / rule':<42} {'calls':>6} {'wall (ms)':>10} {'cpu (ms)':>10}"]
+        rows = list(self.phases.items()) + sorted(self.rules.items(),
+                                                  key=lambda item: item[1].wall,
+                                                  reverse=True)
+        for name, timing in rows:
+            lines.append(f"{name:<42} {timing.calls:>6} {timing.wall * 1000:>10.1f} "
+                         f"{timing.cpu * 1000:>10.1f}")
+        total = self.total
+        lines.append(f"{'total':<42} {'':>6} {total.wall * 1000:>10.1f} "
+                     f"{total.cpu * 1000:>10.1f}")
+
+        lines.append("")
+        lines.append(f"{'Slowest slides':<14} {'wall (ms)':>10} {'shapes':>7} {'runs':>6}  title")
+        for number in self.slowest_slides(num_slowest):
+            slide = self.slide_dict(number)
+            title = (slide["title"] or "")[:40]
+            lines.append(f"{number:<14} {slide['wall'] * 1000:>10.2f} {slide['shapes']:>7} "
+                         f"{slide['runs']:>6}  {title}")
+
+        lines.append("")
+        for name, value in self.counters.items():
+            lines.append(f"{name:<42} {value:>10}")
+        return "\n".join(lines)
+
+
+def profile_visitors(deck, visitors, profile):
+    """run_visitors, timing every visit per rule and per slide."""
+    rule_timings = [profile.timing(profile.rules, rule) for rule in SLIDE_RULES]
+    for slide in deck.active_slides:
+        slide_timing = profile.timing(profile.slides, slide.number)
+        for visitor, rule_timing in zip(visitors, rule_timings):
+            wall, cpu = time.perf_counter(), time.process_time()
+            visitor.visit(slide)
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            rule_timing.add(wall, cpu)
+            slide_timing.add(wall, cpu)
+    return [visitor.result() for visitor in visitors]
+
+
+def count_deck(deck, profile):
+    profile.count("slides", deck.num_slides)
+    profile.count("active_slides", deck.num_active_slides)
+    for slide in deck.slides:
+        num_runs = sum(len(shape.runs) for shape in slide.shapes)
+        profile.slide_titles[slide.number] = slide.title
+        profile.slide_sizes[slide.number] = (len(slide.shapes), num_runs)
+        profile.count("shapes", len(slide.shapes))
+        profile.count("runs", num_runs)
+        profile.count("notes_runs", len(slide.notes_runs))
+
+
+def profile_presentation(prs, config, wordset=None, profile=None):
+    """Check prs like check_presentation, returning (findings, profile)."""
+    profile = profile if profile is not None else Profile()
+    with profile.phase("snapshot"):
+        deck = get_deck_snapshot(prs)
+    count_deck(deck, profile)
+
+    with profile.phase("setup"):
+        wordset = wordset if wordset else initialize_word_set()
+        findings = FindingsStore(config.get("max_findings_per_rule"))
+        contrast_cache = ContrastCache()
+
+    # Visitors may do deck-wide work up front (e.g. the contrast rule computes
+    # every colour pair), which counts towards their rule but not as a call
+    visitors = []
+    for rule in SLIDE_RULES:
+        wall, cpu = time.perf_counter(), time.process_time()
+        visitors += make_visitors(deck, config, findings, wordset, contrast_cache, {rule})
+        profile.timing(profile.rules, rule).add(time.perf_counter() - wall,
+                                                time.process_time() - cpu, calls=0)
+
+    pos_cache = wordset.pos_cache
+    pos_hits, pos_misses = pos_cache.hits, pos_cache.misses
+    satisfied_all = profile_visitors(deck, visitors, profile)
+
+    with profile.rule("must_end_with_summary_slide"):
+        ends_with_summary = must_end_with_summary_slide(deck)
+    with profile.rule("estimate_presentation_length"):
+        presentation_length = estimate_presentation_length(deck, config)
+
+    # Every parts-of-speech cache miss is one WordNet (or lexicon) lookup
+    profile.count("word_lookups", pos_cache.misses - pos_misses)
+    profile.count("word_cache_hits", pos_cache.hits - pos_hits)
+    profile.count("contrast_computations", len(contrast_cache))
+    profile.count("contrast_lookups", contrast_cache.hits + contrast_cache.misses)
+
+    result = combine_findings(findings.slide_feedback(deck.num_active_slides), satisfied_all,
+                              ends_with_summary, presentation_length, findings.num_omitted)
+    return result, profile
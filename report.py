@@ -0,0 +1,163 @@
+"""Streaming HTML table writer for PPTChecker reports
+
+Writes rows straight to the output file with the same markup and
+'blue_dark' styling that pretty_html_table produced, without building a
+pandas DataFrame first. Reports for very large decks are split into pages
+of at most page_size slides, each written as soon as its rows are ready,
+with the general feedback and links to every page on the index page.
+"""
+
+import os
+
+TABLE_STYLE = ("font-family: Century Gothic, sans-serif;font-size: medium;"
+               "text-align: left;padding: 0px 20px 0px 0px;width: auto")
+HEADER_STYLE = ("background-color: #305496;font-family: Century Gothic, sans-serif;"
+                "font-size: medium;color: #FFFFFF;text-align: left;"
+                "border-bottom: 2px solid #305496;padding: 0px 20px 0px 0px;"
+                "width: auto")
+ODD_ROW_STYLE = "background-color: #D9E1F2;" + TABLE_STYLE
+EVEN_ROW_STYLE = "background-color: white; color: black;" + TABLE_STYLE
+
+FEEDBACK_COLUMNS = ["Slide #", "Feedback", "Time at Slide Start", "Time Spent on Slide"]
+INDEX_COLUMNS = ["Page", "Slides", "Slides with feedback"]
+
+# Reports with more rows than this are split into pages
+DEFAULT_PAGE_SIZE = 1000
+
+
+class HtmlTableWriter:
+    """Writes a table one row at a time; cell values are not escaped."""
+
+    def __init__(self, wfile, columns):
+        self.wfile = wfile
+        self.columns = columns
+        self.num_rows = 0
+
+    def write_row(self, row):
+        wfile = self.wfile
+        if self.num_rows == 0:
+            wfile.write('<p><table class="dataframe">\n  <thead>\n'
+                        '    <tr style="text-align: right;">\n')
+            for column in self.columns:
+                wfile.write(f'      <th style = "{HEADER_STYLE}">{column}</th>\n')
+            wfile.write('    </tr>\n  </thead>\n  <tbody>\n')
+
+        style = ODD_ROW_STYLE if self.num_rows % 2 == 0 else EVEN_ROW_STYLE
+        wfile.write('    <tr>\n')
+        for value in row:
+            wfile.write(f'      <td style = "{style}">{value}</td>\n')
+        wfile.write('    </tr>\n')
+        self.num_rows += 1
+
+    def close(self):
+        # Like pretty_html_table, an empty table produces no output
+        if self.num_rows:
+            self.wfile.write('  </tbody>\n</table></p>')
+
+
+def feedback_rows(display_info, failures_only=False):
+    slide_times = display_info["slide_times"]
+    cumul_slide_times = display_info["cumul_slide_times"]
+
+    for slide_i, feedback in enumerate(display_info["slide_feedback"]):
+        if failures_only and not feedback:
+            continue
+        yield [slide_i + 1, feedback,
+               cumul_slide_times[slide_i] if cumul_slide_times else None,
+               slide_times[slide_i] if slide_times else None]
+
+
+def write_feedback_table(wfile, display_info, failures_only=False):
+    table = HtmlTableWriter(wfile, FEEDBACK_COLUMNS)
+    for row in feedback_rows(display_info, failures_only):
+        table.write_row(row)
+    table.close()
+
+
+def write_general_feedback(wfile, time_estimate, display_info, pass_all_checks):
+    wfile.write("<h3>General Feedback:</h3>")
+    if time_estimate:
+        wfile.write(f"Estimate total time for presentation: {time_estimate}")
+
+    general_feedback = display_info["general_feedback"]
+
+    if not general_feedback and pass_all_checks:
+        wfile.write("<p>Presentation passed all checks!</p>")
+    else:
+        wfile.write("<p>" + general_feedback + "</p>")
+
+
+def page_path(output_file, page):
+    stem, ext = os.path.splitext(output_file)
+    return f"{stem}-{page}{ext or '.html'}"
+
+
+def write_page_links(wfile, output_file, page, num_pages):
+    links = [f'<a href="{os.path.basename(output_file)}">Index</a>']
+    if page > 1:
+        links.append(f'<a href="{os.path.basename(page_path(output_file, page - 1))}">Previous</a>')
+    if page < num_pages:
+        links.append(f'<a href="{os.path.basename(page_path(output_file, page + 1))}">Next</a>')
+    wfile.write(f"<p>Page {page} of {num_pages}: " + " | ".join(links) + "</p>")
+
+
+def write_report_file(output_file, findings, failures_only=False,
+                      page_size=DEFAULT_PAGE_SIZE):
+    """Write the report to output_file, split into pages if it has more than page_size rows.
+
+    Returns the paths of the page files (none for a single-page report).
+    """
+    time_estimate, display_info, pass_all_checks = findings
+    slide_feedback = display_info["slide_feedback"]
+    num_rows = (sum(1 for feedback in slide_feedback if feedback) if failures_only
+                else len(slide_feedback))
+
+    if not page_size or num_rows <= page_size:
+        with open(output_file, 'w') as wfile:
+            write_general_feedback(wfile, time_estimate, display_info, pass_all_checks)
+            write_feedback_table(wfile, display_info, failures_only)
+        return []
+
+    # Only a few numbers per page are kept for the index
+    num_pages = -(-num_rows // page_size)
+    pages = []
+    rows = feedback_rows(display_info, failures_only)
+    for page in range(1, num_pages + 1):
+        path = page_path(output_file, page)
+        num_failures = 0
+        first_slide = last_slide = None
+        with open(path, 'w') as wfile:
+            write_page_links(wfile, output_file, page, num_pages)
+            table = HtmlTableWriter(wfile, FEEDBACK_COLUMNS)
+            for row in rows:
+                table.write_row(row)
+                first_slide = first_slide or row[0]
+                last_slide = row[0]
+                num_failures += bool(row[1])
+                if table.num_rows == page_size:
+                    break
+            table.close()
+            write_page_links(wfile, output_file, page, num_pages)
+        pages.append((path, first_slide, last_slide, num_failures))
+
+    with open(output_file, 'w') as wfile:
+        write_general_feedback(wfile, time_estimate, display_info, pass_all_checks)
+        table = HtmlTableWriter(wfile, INDEX_COLUMNS)
+        for page, (path, first_slide, last_slide, num_failures) in enumerate(pages, 1):
+            table.write_row([f'<a href="{os.path.basename(path)}">{page}</a>',
+                             f"{first_slide}-{last_slide}", num_failures])
+        table.close()
+    return [path for path, _, _, _ in pages]
+
+
+def findings_to_dict(findings):
+    """JSON-serializable form of check_presentation's result."""
+    time_estimate, display_info, pass_all_checks = findings
+    return {"time_estimate": time_estimate, "pass_all_checks": pass_all_checks,
+            **display_info}
+
+
+def findings_from_dict(data):
+    display_info = {key: data[key] for key in
+                    ("slide_feedback", "slide_times", "cumul_slide_times", "general_feedback")}
+    return data["time_estimate"], display_info, data["pass_all_checks"]
@@ -2,15 +2,21 @@
 
 import time
 from pptx.enum.shapes import MSO_SHAPE, MSO_SHAPE_TYPE
-from pptx.enum.dml import MSO_FILL, MSO_COLOR_TYPE, MSO_THEME_COLOR
+from pptx.enum.dml import MSO_FILL
 from pptx.util import Pt
+from contrast import ContrastCache
+from engine import (
+    get_deck_snapshot,
+    iter_shapes,
+    run_visitors,
+    style_fingerprint,
+    text_fingerprint,
+)
+from findings import ERROR, WARNING, FindingsStore
+from images import covered_region, median_contrast
+from matching import ShapeMatcher, shape_identity
 from util import (
-    get_slide_notes,
-    is_backup_slide,
-    within_bounds,
-    get_color_scheme,
-    get_scheme_color_rgb,
-    calculate_contrast_ratio,
+    count_notes,
     initialize_word_set,
     convert_string_into_word_tokens,
     identify_parts_of_speech,
@@ -19,10 +25,11 @@ from util import (
 
 
 def must_end_with_summary_slide(prs):
+    deck = get_deck_snapshot(prs)
     summary_at_end = False
-    for slide in prs.slides:
-        if slide.shapes.title:
-            title = slide.shapes.title.text.lower()
+    for slide in deck.slides:
+        if slide.title is not None:
+            title = slide.title.lower()
             if "summary" in title:
                 summary_at_end = True
             elif "backup" in title:
@@ -32,404 +39,575 @@ def must_end_with_summary_slide(prs):
     return summary_at_end
 
 
-def should_have_slide_numbers(prs, slide_feedback):
-    has_slide_numbers = False
-    shape_left = 0
-    shape_top = 0
+SLIDE_NUMBER_MISPLACED = "Slide number is misplaced in a different location."
+SLIDE_NUMBER_MISSING = "Slide number is missing on this slide."
+
+
+def run_rule(deck, visitor, slide_feedback):
+    """Run one rule visitor and append its feedback text to slide_feedback."""
+    result = run_visitors(deck, [visitor])[0]
+    for index, feedback in enumerate(visitor.findings.slide_feedback(len(slide_feedback))):
+        slide_feedback[index] += feedback
+    return result
+
 
-    slide_num = 1
-    slide_height = prs.slide_height
+class SlideNumbersVisitor:
+    rule = "should_have_slide_numbers"
 
-    if len(prs.slides) < 2:
-        return True
+    def __init__(self, deck, findings):
+        self.findings = findings
+        self.slide_height = deck.slide_height
+        self.too_few_slides = deck.num_slides < 2
 
-    for slide in prs.slides:
+        self.has_slide_numbers = False
+        self.shape_left = 0
+        self.shape_top = 0
 
+    def visit(self, slide):
         # Skip title slide
-        if slide_num == 1:
-            slide_num = 2
-            continue
+        if self.too_few_slides or slide.number == 1:
+            return
 
         slide_has_slide_number = False
 
-        if is_backup_slide(slide):
-            return has_slide_numbers
-
         for shape in slide.shapes:
             if not shape.has_text_frame:
                 continue
-            num_paragraphs = len(shape.text_frame.paragraphs)
 
             # Mark as candidate for slide number
-            if num_paragraphs == 1:
+            if shape.num_paragraphs == 1:
                 shape_text = shape.text.strip()
-                if ((shape_text.isdigit() and int(shape_text) == slide_num) or
+                if ((shape_text.isdigit() and int(shape_text) == slide.number) or
                      shape_text=="‹#›"):
-                    if (shape_top > slide_height * 0.9 or
-                        shape_top < slide_height * 0.1):
+                    if (self.shape_top > self.slide_height * 0.9 or
+                        self.shape_top < self.slide_height * 0.1):
                         slide_has_slide_number = True
-                        has_slide_numbers = True
-                        if (shape_left == 0 and shape_top == 0):
-                            shape_left = shape.left
-                            shape_top = shape.top
-                        elif (shape_left != shape.left or
-                              shape_top != shape.top):
-                            slide_feedback[slide_num - 1] += ("Slide number "
-                                                              "is misplaced "
-                                                              "in a different "
-                                                              "location.\n")
+                        self.has_slide_numbers = True
+                        if (self.shape_left == 0 and self.shape_top == 0):
+                            self.shape_left = shape.left
+                            self.shape_top = shape.top
+                        elif (self.shape_left != shape.left or
+                              self.shape_top != shape.top):
+                            self.findings.add(self.rule, slide.index, SLIDE_NUMBER_MISPLACED,
+                                              shape_id=shape.shape_id)
 
-        if has_slide_numbers and not slide_has_slide_number:
-            slide_feedback[slide_num - 1] += ("Slide number is missing"
-                                              "on this slide.\n")
+        if self.has_slide_numbers and not slide_has_slide_number:
+            self.findings.add(self.rule, slide.index, SLIDE_NUMBER_MISSING)
 
-        slide_num += 1
+    def result(self):
+        return self.too_few_slides or self.has_slide_numbers
 
-    return has_slide_numbers
 
+def should_have_slide_numbers(prs, slide_feedback):
+    deck = get_deck_snapshot(prs)
+    return run_rule(deck, SlideNumbersVisitor(deck, FindingsStore()), slide_feedback)
 
-def has_smooth_slide_transitions(prs, config, slide_feedback):
-    shape_pos_threshold = config["shape_pos_threshold"]
 
-    has_smooth_transitions = True
+SLIDE_NUMBER_TRANSITION = "Slide transition for the slide number is not smooth."
+TEXT_SHAPE_TRANSITION = ("Slide transition for {} is not smooth. "
+                         "This shape object holds the following text: '{}'")
+SHAPE_TRANSITION = "Slide transition for {} is not smooth."
 
-    shapes_prev = {}
-    shapes_attr_prev = {}
 
-    slide_num = 1
+class SlideTransitionsVisitor:
+    rule = "has_smooth_slide_transitions"
 
-    if len(prs.slides) < 2:
-        return True
+    def __init__(self, deck, config, findings):
+        self.findings = findings
+        self.too_few_slides = deck.num_slides < 2
+        self.matcher = ShapeMatcher(config["shape_pos_threshold"],
+                                    deck.slide_width, deck.slide_height)
 
-    for slide in prs.slides:
+        self.has_smooth_transitions = True
+        self.shapes_prev = []
 
-        if is_backup_slide(slide):
-            return has_smooth_transitions
+    def visit(self, slide):
+        if self.too_few_slides:
+            return
 
-        shapes_curr = {}
-        shapes_attr_curr = {}
+        shapes_prev = self.shapes_prev
+        shapes_curr = slide.shapes
 
-        for shape in slide.shapes:
-            shape_index = 0
-            while True:
-                shape_attrs = [str(shape.shape_type), str(shape.width),
-                               str(shape.height), str(shape_index)]
-                shape_hash = hash(','.join(shape_attrs))
-
-                if shape_hash not in shapes_curr:
-                    break
-                shape_index += 1
-
-            shapes_curr[shape_hash] = (shape.left, shape.top)
-            if shape.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
-                shapes_attr_curr[shape_hash] = [str(shape.auto_shape_type)]
-            else:
-                shapes_attr_curr[shape_hash] = [str(shape.shape_type)]
+        if shapes_prev and shapes_curr:
+            for _, shape in self.matcher.moved_shapes(shapes_prev, shapes_curr):
+                self.has_smooth_transitions = False
+                shape_attr = shape_identity(shape)
+
+                if len(shape_attr) > 1:
+                    if shape_attr[1] == "‹#›":
+                        template, args = SLIDE_NUMBER_TRANSITION, ()
+                    else:
+                        template, args = TEXT_SHAPE_TRANSITION, shape_attr
+                else:
+                    template, args = SHAPE_TRANSITION, shape_attr
+                self.findings.add(self.rule, slide.index, template, args,
+                                  shape_id=shape.shape_id)
 
-            if shape.has_text_frame and shape.text:
-                shapes_attr_curr[shape_hash].append(shape.text)
+        self.shapes_prev = shapes_curr
 
-        if shapes_prev and shapes_curr:
-            for shape_hash, curr_shape_pos in shapes_curr.items():
-                if shape_hash in shapes_prev:
-                    prev_shape_pos = shapes_prev[shape_hash]
-                    if (prev_shape_pos == curr_shape_pos and
-                        len(shapes_attr_curr[shape_hash]) ==
-                        len(shapes_attr_prev[shape_hash])):
-                        del shapes_prev[shape_hash]
-
-            for shape_hash, prev_shape_pos in shapes_prev.items():
-                if shape_hash in shapes_curr:
-                    curr_shape_pos = shapes_curr[shape_hash]
-                    shape_attr = shapes_attr_curr[shape_hash]
-
-                    # Only match those with either the same shape or same shape and text
-                    if (len(shape_attr) == len(shapes_attr_prev[shape_hash]) and
-                        (prev_shape_pos != curr_shape_pos and
-                         within_bounds(prev_shape_pos, curr_shape_pos,
-                                       shape_pos_threshold, prs.slide_width,
-                                       prs.slide_height)) and
-                        shapes_attr_prev[shape_hash] == shape_attr):
-                        has_smooth_transitions = False
-
-                        if len(shape_attr) > 1:
-                            if shape_attr[1] == "‹#›":
-                                slide_feedback_comment = ("Slide transition for "
-                                                          "the slide number is "
-                                                          "not smooth.\n")
-                            else:
-                                slide_feedback_comment = (f"Slide transition for "
-                                                          f"{shape_attr[0]} is "
-                                                          f"not smooth. This "
-                                                          f"shape object holds "
-                                                          f"the following text: "
-                                                          f"'{shape_attr[1]}'\n")
-                        else:
-                            slide_feedback_comment = (f"Slide transition for "
-                                                      f"{shape_attr[0]} "
-                                                      f"is not smooth.\n")
-                        slide_feedback[slide_num - 1] += slide_feedback_comment
-
-        slide_num += 1
-        shapes_prev = shapes_curr
-        shapes_attr_prev = shapes_attr_curr
-
-    return has_smooth_transitions
+    def result(self):
+        return self.has_smooth_transitions
 
 
-def should_have_high_contrast_fonts_colours(prs, config, slide_feedback):
-# Only checks colours of shapes, textboxes, lines, but not pictures and graphs
-    shape_min_color_contrast_ratio = config["shape_min_color_contrast_ratio"]
-    font_min_color_contrast_ratio = config["font_min_color_contrast_ratio"]
-    min_size_font = config["min_size_font"]
-    min_line_width = config["min_line_width"]
+def has_smooth_slide_transitions(prs, config, slide_feedback):
+    deck = get_deck_snapshot(prs)
+    return run_rule(deck, SlideTransitionsVisitor(deck, config, FindingsStore()),
+                    slide_feedback)
 
-    slide_num = 1
-    result = True
 
-    color_scheme = get_color_scheme(prs)
+UNCHECKED_SHAPE_TYPES = (MSO_SHAPE_TYPE.PICTURE, MSO_SHAPE_TYPE.CHART,
+                         MSO_SHAPE_TYPE.TABLE)
 
-    for slide in prs.slides:
 
-        if is_backup_slide(slide):
-            return result
+def picture_behind(shape, pictures):
+    """(image, grid region) of the frontmost picture under the centre of shape.
 
-        if slide.background.fill.type != MSO_FILL.SOLID:
-            slide_background_color = "FFFFFF"
-        elif slide.background.fill.fore_color == MSO_COLOR_TYPE.RGB:
-            slide_background_color = slide.background.fill.fore_color.rgb.__str__()
+    Only pictures with opaque pixels behind shape count, otherwise the slide
+    background shows through.
+    """
+    import numpy as np
 
-        for shape in slide.shapes:
-            shape_type = shape.shape_type
-            shape_feedback_comment_temp = ""
+    if None in (shape.left, shape.top, shape.width, shape.height):
+        return None
+    center_x = shape.left + shape.width / 2
+    center_y = shape.top + shape.height / 2
+    for picture, image in reversed(pictures):
+        if (picture.left is None or picture.top is None or
+                not picture.left <= center_x <= picture.left + (picture.width or 0) or
+                not picture.top <= center_y <= picture.top + (picture.height or 0)):
+            continue
+        region = covered_region(image.luminance, picture, shape.left, shape.top,
+                                shape.width, shape.height)
+        if region is None:
+            continue
+        row0, row1, column0, column1 = region
+        if not np.isnan(image.luminance[row0:row1, column0:column1]).all():
+            return image, region
+    return None
+
+
+LINE_TOO_THIN = "Line width for {} is too small to be seen at {} pts."
+SHAPE_LOW_CONTRAST = "Colour contrast for {} is not sufficient from the slide background colour."
+FONT_TOO_SMALL = "Font size for text '{}' in shape {} is too small."
+FONT_LOW_CONTRAST = ("Font colour contrast for text '{}' in shape {} "
+                     "is not sufficient from the background colour.")
+PICTURE_LOW_CONTRAST = "Contrast of picture {} is not sufficient from the slide background colour."
+FONT_LOW_CONTRAST_ON_PICTURE = ("Font colour contrast for text '{}' in shape {} "
+                                "is not sufficient from the picture behind it.")
+# Pictures whose median contrast with the background is below this match it,
+# e.g. a screenshot with a white background on a white slide. Like shapes
+# filled with the background colour, they are not reported.
+PICTURE_SAME_BACKGROUND_RATIO = 1.1
+
+
+class ContrastVisitor:
+# Checks colours of shapes, textboxes, lines and pictures, but not graphs.
+# Text without a fill of its own is checked against the picture behind it
+    rule = "should_have_high_contrast_fonts_colours"
+
+    def __init__(self, deck, config, findings, contrast_cache=None):
+        self.shape_min_color_contrast_ratio = config["shape_min_color_contrast_ratio"]
+        self.font_min_color_contrast_ratio = config["font_min_color_contrast_ratio"]
+        self.min_size_font = config["min_size_font"]
+        self.min_line_width = config["min_line_width"]
+        self.findings = findings
+
+        self.result_ok = True
+        # Findings per (background, style_fingerprint) for the run
+        self.shape_findings = {}
+        # Findings per picture SHA1 and background or covered region
+        self.picture_findings = {}
+
+        # Compute every colour pair of the deck in one batch up front
+        self.contrast_cache = (contrast_cache if contrast_cache is not None
+                               else ContrastCache())
+        self.contrast_cache.prefetch(self.collect_color_pairs(deck))
+
+    def collect_color_pairs(self, deck):
+        for slide in deck.active_slides:
+            slide_background_color = slide.background_rgb or "FFFFFF"
+
+            for shape in slide.shapes:
+                if shape.shape_type in UNCHECKED_SHAPE_TYPES:
+                    continue
+
+                font_check_against_color = slide_background_color
+                if shape.fill_type == MSO_FILL.SOLID:
+                    color_rgb = shape.fill_color.rgb
+                    yield slide_background_color, color_rgb
+                    font_check_against_color = color_rgb
+
+                if shape.shape_type != MSO_SHAPE_TYPE.LINE and shape.has_text_frame:
+                    for run in shape.runs:
+                        if run.text:
+                            yield font_check_against_color, run.color.rgb
+
+    def visit(self, slide):
+        slide_background_color = slide.background_rgb or "FFFFFF"
+        pictures = [] # (shape, image) in z-order, so later pictures are in front
 
-            if (shape_type in (MSO_SHAPE_TYPE.PICTURE,
-                               MSO_SHAPE_TYPE.CHART,
-                               MSO_SHAPE_TYPE.TABLE)):
+        for shape in slide.shapes:
+            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE or shape.children:
+                for picture in iter_shapes([shape]):
+                    image = picture.image.info if picture.image is not None else None
+                    if image is not None and image.luminance is not None:
+                        self.check_picture(slide, picture, image, slide_background_color)
+                        pictures.append((picture, image))
+
+            if shape.shape_type in UNCHECKED_SHAPE_TYPES:
                 continue
 
-            if shape_type == MSO_SHAPE_TYPE.LINE:
-                shape = shape.line
-                line_width = shape.width.pt
-                if line_width < min_line_width:
-                    shape_type_str = str(shape_type)
-                    shape_width_pt = str(shape.width.pt)
-                    slide_feedback_comment = (f"Line width for {shape_type_str} "
-                                              f"is too small to be seen at "
-                                              f"{shape_width_pt} pts.\n")
-                    slide_feedback[slide_num - 1] += slide_feedback_comment
-                    result = False
-
-            fill_format = shape.fill
-
-            font_check_against_color = slide_background_color
-            at_least_one_font_visible = False # Some fonts may be intentionally greyed out
-
-            # Only check fills of shapes that have a solid fill
-            if fill_format.type == MSO_FILL.SOLID:
-                color_format = fill_format.fore_color
-                if color_format.type == MSO_COLOR_TYPE.RGB:
-                    color_rgb = color_format.rgb.__str__()
+            backdrop = None
+            if (pictures and shape.has_text_frame and shape.fill_type != MSO_FILL.SOLID and
+                    shape.shape_type != MSO_SHAPE_TYPE.LINE):
+                backdrop = picture_behind(shape, pictures)
+
+            # Logos, footers and decorations repeat on most slides
+            key = (slide_background_color, backdrop is None, style_fingerprint(shape))
+            shape_findings = self.shape_findings.get(key)
+            if shape_findings is None:
+                shape_findings = self.check_shape(shape, slide_background_color,
+                                                  check_font_contrast=backdrop is None)
+                self.shape_findings[key] = shape_findings
+            if backdrop is not None:
+                # Cached findings are shared, so extend a copy
+                shape_findings = [*shape_findings, *self.check_text_on_picture(shape, *backdrop)]
+
+            for template, args in shape_findings:
+                self.findings.add(self.rule, slide.index, template, args, shape.shape_id, ERROR)
+            if shape_findings:
+                self.result_ok = False
+
+    def check_picture(self, slide, picture, image, slide_background_color):
+        key = (image.sha1, slide_background_color)
+        picture_findings = self.picture_findings.get(key)
+        if picture_findings is None:
+            contrast_ratio = median_contrast(image.luminance, slide_background_color)
+            picture_findings = ()
+            if (contrast_ratio is not None and
+                    PICTURE_SAME_BACKGROUND_RATIO <= contrast_ratio <
+                    self.shape_min_color_contrast_ratio):
+                picture_findings = ((PICTURE_LOW_CONTRAST, (picture.descriptor,)),)
+            self.picture_findings[key] = picture_findings
+
+        # The median only estimates how a picture stands out, so this is a warning
+        for template, args in picture_findings:
+            self.findings.add(self.rule, slide.index, template, args, picture.shape_id, WARNING)
+        if picture_findings:
+            self.result_ok = False
+
+    def check_text_on_picture(self, shape, image, region):
+        """(template, args) of the font findings for shape over part of image."""
+        key = (image.sha1, region, shape.descriptor,
+               tuple((run.text, run.color.rgb) for run in shape.runs))
+        text_findings = self.picture_findings.get(key)
+        if text_findings is not None:
+            return text_findings
+
+        row0, row1, column0, column1 = region
+        luminance = image.luminance[row0:row1, column0:column1]
+        font_contrast_args = []
+        at_least_one_font_visible = False
+        for run in shape.runs:
+            if not run.text:
+                continue
+            contrast_ratio = median_contrast(luminance, run.color.rgb)
+            if contrast_ratio < self.font_min_color_contrast_ratio:
+                font_contrast_args.append((run.text, shape.descriptor))
+            else:
+                at_least_one_font_visible = True
+
+        text_findings = ()
+        if not at_least_one_font_visible:
+            text_findings = tuple((FONT_LOW_CONTRAST_ON_PICTURE, args)
+                                  for args in font_contrast_args)
+        self.picture_findings[key] = text_findings
+        return text_findings
+
+    def check_shape(self, shape, slide_background_color, check_font_contrast=True):
+        """(template, args) of every finding for shape on this background."""
+        min_size_font = self.min_size_font
+        shape_type = shape.shape_type
+        shape_findings = []
+        font_contrast_args = []
+
+        if shape_type == MSO_SHAPE_TYPE.LINE:
+            if shape.line_width_pt < self.min_line_width:
+                shape_findings.append((LINE_TOO_THIN, (str(shape_type), shape.line_width_pt)))
+
+        font_check_against_color = slide_background_color
+        at_least_one_font_visible = False # Some fonts may be intentionally greyed out
+
+        # Only check fills of shapes that have a solid fill
+        if shape.fill_type == MSO_FILL.SOLID:
+            color_rgb = shape.fill_color.rgb
+
+            is_rectangle = False
+            contrast_ratio = self.contrast_cache.ratio(slide_background_color,
+                                                       color_rgb)
+            if (contrast_ratio < self.shape_min_color_contrast_ratio and
+                not contrast_ratio==1):
+                if (shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE and
+                    shape.auto_shape_type in (MSO_SHAPE.RECTANGLE,
+                                              MSO_SHAPE.ROUNDED_RECTANGLE)):
+                    is_rectangle = True
+
+                # Ignore rectangles as they are often used to cover components
+                if not is_rectangle:
+                    shape_findings.append((SHAPE_LOW_CONTRAST, (shape.descriptor,)))
+
+            font_check_against_color = color_rgb
+
+        if shape_type != MSO_SHAPE_TYPE.LINE and shape.has_text_frame:
+            for run in shape.runs:
+                font_size = run.font_size
+
+                if (font_size and
+                        ((font_size < Pt(min_size_font) and
+                            len(run.text.split()) > 2 and
+                            not run.text.startswith('*')) or
+                         (font_size < Pt(min_size_font - 6)))):
+                    shape_findings.append((FONT_TOO_SMALL, (run.text, shape.descriptor)))
+
+                if not run.text or not check_font_contrast:
+                    continue
+
+                font_color_rgb = run.color.rgb
+
+                contrast_ratio = self.contrast_cache.ratio(font_check_against_color,
+                                                           font_color_rgb)
+                if (contrast_ratio < self.font_min_color_contrast_ratio and
+                    not at_least_one_font_visible):
+                    font_contrast_args.append((run.text, shape.descriptor))
                 else:
-                    color_rgb = get_scheme_color_rgb(color_scheme,
-                                                     shape.fill.fore_color.theme_color,
-                                                     shape.fill.fore_color.brightness)
-
-                is_rectangle = False
-                contrast_ratio = calculate_contrast_ratio(slide_background_color, color_rgb)
-                if (contrast_ratio < shape_min_color_contrast_ratio and not contrast_ratio==1):
-                    if shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
-                        shape_descriptor = shape.auto_shape_type
-                        if (shape_descriptor in (MSO_SHAPE.RECTANGLE,
-                                                 MSO_SHAPE.ROUNDED_RECTANGLE)):
-                            is_rectangle = True
-                    else:
-                        shape_descriptor = shape_type
-
-                    # Ignore rectangles as they are often used to cover components
-                    if not is_rectangle:
-                        shape_descriptor = str(shape_descriptor)
-                        slide_feedback_comment = (f"Colour contrast for "
-                                                  f"{shape_descriptor}"
-                                                  f"is not sufficient from "
-                                                  f"the slide background "
-                                                  f"colour.\n")
-                        slide_feedback[slide_num - 1] += slide_feedback_comment
-                        result = False
-
-                font_check_against_color = color_rgb
-
-            if shape_type != MSO_SHAPE_TYPE.LINE and shape.has_text_frame:
-                for paragraph in shape.text_frame.paragraphs:
-                    for run in paragraph.runs:
-                        font = run.font
-
-                        if (font.size and
-                                ((font.size < Pt(min_size_font) and
-                                    len(run.text.split()) > 2 and
-                                    not run.text.startswith('*')) or
-                                 (font.size < Pt(min_size_font - 6)))):
-                            if shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
-                                shape_descriptor = shape.auto_shape_type
-                            else:
-                                shape_descriptor = shape_type
-                            shape_descriptor = str(shape_descriptor)
-                            slide_feedback_comment = (f"Font size for text "
-                                                      f"'{run.text}' in "
-                                                      f"shape "
-                                                      f"{shape_descriptor} "
-                                                      f"is too small.\n")
-                            slide_feedback[slide_num - 1] += slide_feedback_comment
-                            result = False
-
-                        if not run.text:
-                            continue
-
-                        if font.color.type == MSO_COLOR_TYPE.RGB:
-                            font_color_rgb = font.color.rgb.__str__()
-                        else:
-                            # Set to default font if font color is not found
-                            if not font.color.type:
-                                font.color.theme_color = MSO_THEME_COLOR.DARK_1
-
-                            font_color_rgb = get_scheme_color_rgb(color_scheme,
-                                                                  font.color.theme_color,
-                                                                  font.color.brightness)
-
-                        contrast_ratio = calculate_contrast_ratio(font_check_against_color,
-                                                                  font_color_rgb)
-                        if (contrast_ratio < font_min_color_contrast_ratio and
-                            not at_least_one_font_visible):
-                            if shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
-                                shape_descriptor = shape.auto_shape_type
-                            else:
-                                shape_descriptor = shape_type
-                            shape_descriptor = str(shape_descriptor)
-                            shape_feedback_comment_temp += (f"Font colour "
-                                                            f"contrast for text "
-                                                            f"'{run.text}' "
-                                                            f"in shape "
-                                                            f"{shape_descriptor} "
-                                                            f"is not "
-                                                            f"sufficient from "
-                                                            f"the background "
-                                                            f"colour.\n")
-                        else:
-                            at_least_one_font_visible = True # Change back to true
-
-            if not at_least_one_font_visible and shape_feedback_comment_temp:
-                slide_feedback[slide_num - 1] += shape_feedback_comment_temp
-                result = False
-
-        slide_num += 1
+                    at_least_one_font_visible = True # Change back to true
 
-    return result
+        if not at_least_one_font_visible:
+            shape_findings.extend((FONT_LOW_CONTRAST, args) for args in font_contrast_args)
+        return tuple(shape_findings)
 
+    def result(self):
+        return self.result_ok
 
-def should_not_have_excessive_text(prs, config, slide_feedback):
-    max_num_words_per_slide = config["max_num_words_per_slide"]
 
-    has_excessive_text = False
-    slide_num = 1
+def should_have_high_contrast_fonts_colours(prs, config, slide_feedback):
+    deck = get_deck_snapshot(prs)
+    return run_rule(deck, ContrastVisitor(deck, config, FindingsStore()), slide_feedback)
+
 
-    for slide in prs.slides:
+EXCESSIVE_TEXT = "Excessive amount of words on this slide."
+
+
+class ExcessiveTextVisitor:
+    rule = "should_not_have_excessive_text"
+
+    def __init__(self, config, findings):
+        self.max_num_words_per_slide = config["max_num_words_per_slide"]
+        self.findings = findings
+        self.has_excessive_text = False
+        # Counted run texts per text_fingerprint, for shapes repeated across slides
+        self.shape_texts = {}
+
+    def visit(self, slide):
         slide_text = ""
+        title = slide.title.strip() if slide.title is not None else None
 
         for shape in slide.shapes:
             if not shape.has_text_frame:
                 continue
-            for paragraph in shape.text_frame.paragraphs:
-                for run in paragraph.runs:
-                    if len(run.text.split(' ')) > 2:
-                        if slide.shapes.title:
-                            title = slide.shapes.title.text
-                            if run.text.strip() == title.strip():
-                                continue
-                        slide_text += run.text.strip() + " "
+            key = text_fingerprint(shape)
+            texts = self.shape_texts.get(key)
+            if texts is None:
+                texts = self.shape_texts[key] = tuple(
+                    run.text.strip() for run in shape.runs if len(run.text.split(' ')) > 2)
+            for text in texts:
+                if text != title:
+                    slide_text += text + " "
         word_count = len(slide_text.split(' '))
 
-        if word_count > max_num_words_per_slide:
-            slide_feedback_comment = "Excessive amount of words on this slide.\n"
-            slide_feedback[slide_num - 1] += slide_feedback_comment
-            has_excessive_text = True
+        if word_count > self.max_num_words_per_slide:
+            self.findings.add(self.rule, slide.index, EXCESSIVE_TEXT)
+            self.has_excessive_text = True
 
-        slide_num += 1
+    def result(self):
+        return not self.has_excessive_text
 
-    return not has_excessive_text
 
+def should_not_have_excessive_text(prs, config, slide_feedback):
+    deck = get_deck_snapshot(prs)
+    return run_rule(deck, ExcessiveTextVisitor(config, FindingsStore()), slide_feedback)
 
-def does_not_have_complete_sentences(prs, slide_feedback):
-    result = True
-    wordset = initialize_word_set()
-    slide_num = 1
 
-    for slide in prs.slides:
+FULL_SENTENCE = "Avoid full sentences: '{}'"
+
+
+class CompleteSentencesVisitor:
+    rule = "does_not_have_complete_sentences"
+
+    def __init__(self, findings, wordset=None):
+        self.findings = findings
+        self.wordset = wordset if wordset else initialize_word_set()
+        self.result_ok = True
+        # Repeated run texts (footers, bullets) are classified once per deck
+        self.full_sentence_cache = {}
+        # Sentence-like run texts per text_fingerprint
+        self.shape_candidates = {}
+
+    def visit(self, slide):
         title = ""
-        if slide.shapes.title:
-            title = slide.shapes.title.text.lower()
+        if slide.title is not None:
+            title = slide.title.lower()
+        title = title.strip()
 
         for shape in slide.shapes:
             if not shape.has_text_frame:
                 continue
-            for paragraph in shape.text_frame.paragraphs:
-                for run in paragraph.runs:
-                    shape_text = run.text.strip()
-
-                    if shape_text:
-                        if (shape_text.strip() != title.strip() and
-                            len(shape_text.split(' ')) > 4 and
-                            not shape_text.endswith('?') and
-                            ':' not in shape_text and
-                            '-' not in shape_text):
-                            word_tokens = convert_string_into_word_tokens(shape_text)
-                            words_classified = identify_parts_of_speech(wordset, word_tokens)
-                            if is_full_sentence(words_classified):
-                                slide_feedback_comment = f"Avoid full sentences: '{run.text}'\n"
-                                slide_feedback[slide_num - 1] += slide_feedback_comment
-                                result = False
-
-        slide_num += 1
+            key = text_fingerprint(shape)
+            candidates = self.shape_candidates.get(key)
+            if candidates is None:
+                candidates = self.shape_candidates[key] = self.sentence_candidates(shape)
+
+            for shape_text, text in candidates:
+                if shape_text != title and self.is_full_sentence(shape_text):
+                    self.findings.add(self.rule, slide.index, FULL_SENTENCE,
+                                      (text,), shape.shape_id)
+                    self.result_ok = False
+
+    def sentence_candidates(self, shape):
+        candidates = []
+        for run in shape.runs:
+            shape_text = run.text.strip()
+
+            if (shape_text and
+                len(shape_text.split(' ')) > 4 and
+                not shape_text.endswith('?') and
+                ':' not in shape_text and
+                '-' not in shape_text):
+                candidates.append((shape_text, run.text))
+        return tuple(candidates)
+
+    def is_full_sentence(self, shape_text):
+        full_sentence = self.full_sentence_cache.get(shape_text)
+        if full_sentence is None:
+            word_tokens = convert_string_into_word_tokens(shape_text)
+            words_classified = identify_parts_of_speech(self.wordset, word_tokens)
+            full_sentence = is_full_sentence(words_classified)
+            self.full_sentence_cache[shape_text] = full_sentence
+        return full_sentence
+
+    def result(self):
+        return self.result_ok
 
-    return result
+
+def does_not_have_complete_sentences(prs, slide_feedback):
+    deck = get_deck_snapshot(prs)
+    return run_rule(deck, CompleteSentencesVisitor(FindingsStore()), slide_feedback)
+
+
+# Per-slide rules in the order their feedback is reported for each slide
+SLIDE_RULES = [
+    "should_have_slide_numbers",
+    "has_smooth_slide_transitions",
+    "should_have_high_contrast_fonts_colours",
+    "should_not_have_excessive_text",
+    "does_not_have_complete_sentences",
+]
+
+CHEAP = "cheap"
+MODERATE = "moderate"
+EXPENSIVE = "expensive"
+COST_TIERS = (CHEAP, MODERATE, EXPENSIVE)
+
+# Every rule with its cost tier: cheap rules read a few fields per slide,
+# moderate ones compare shapes or colours, expensive ones look up words
+RULES = {
+    "should_have_slide_numbers": CHEAP,
+    "has_smooth_slide_transitions": MODERATE,
+    "should_have_high_contrast_fonts_colours": MODERATE,
+    "should_not_have_excessive_text": CHEAP,
+    "does_not_have_complete_sentences": EXPENSIVE,
+    "must_end_with_summary_slide": CHEAP,
+    "estimate_presentation_length": CHEAP,
+}
+
+# Bump whenever a rule changes what it reports, so that cached and stored
+# results (incremental.py, corpus.py) are checked again
+RULES_VERSION = 1
+
+
+def select_rules(rules=None, skip_rules=(), max_cost=None):
+    """Names of the rules to run, or None for all of them."""
+    if rules is None and not skip_rules and max_cost is None:
+        return None
+    for rule in list(rules or ()) + list(skip_rules):
+        if rule not in RULES:
+            raise ValueError(f"Unknown rule '{rule}'; choose from {', '.join(RULES)}")
+    if max_cost is not None and max_cost not in COST_TIERS:
+        raise ValueError(f"Unknown cost tier '{max_cost}'; choose from {', '.join(COST_TIERS)}")
+
+    max_tier = COST_TIERS.index(max_cost) if max_cost is not None else len(COST_TIERS)
+    return frozenset(rule for rule, cost in RULES.items()
+                     if (rules is None or rule in rules) and rule not in skip_rules
+                     and COST_TIERS.index(cost) <= max_tier)
+
+
+def is_selected(rule, rules):
+    return rules is None or rule in rules
+
+
+def make_visitors(deck, config, findings, wordset=None, contrast_cache=None, rules=None):
+    """One visitor per entry of SLIDE_RULES (in rules, if given), all recording to findings."""
+    factories = {
+        "should_have_slide_numbers": lambda: SlideNumbersVisitor(deck, findings),
+        "has_smooth_slide_transitions": lambda: SlideTransitionsVisitor(deck, config, findings),
+        "should_have_high_contrast_fonts_colours":
+            lambda: ContrastVisitor(deck, config, findings, contrast_cache),
+        "should_not_have_excessive_text": lambda: ExcessiveTextVisitor(config, findings),
+        "does_not_have_complete_sentences": lambda: CompleteSentencesVisitor(findings, wordset),
+    }
+    return [factories[rule]() for rule in SLIDE_RULES if is_selected(rule, rules)]
+
+
+def slide_rule_results(visitors, results):
+    """One result per entry of SLIDE_RULES; rules that did not run are satisfied."""
+    by_rule = {visitor.rule: result for visitor, result in zip(visitors, results)}
+    return [by_rule.get(rule, True) for rule in SLIDE_RULES]
 
 
 def estimate_presentation_length(prs, config):
+    deck = get_deck_snapshot(prs)
+    return estimate_talk_length(((slide.title, slide.notes_runs) for slide in deck.slides),
+                                config)
+
+
+def estimate_talk_length(slide_notes, config):
+    """Time estimate from (title, notes_runs) of each slide, in slide order."""
     seconds_per_word = config["seconds_per_word"]
     seconds_per_pause = config["seconds_per_pause"]
     seconds_per_break = config["seconds_per_break"]
     seconds_between_slides = config["seconds_between_slides"]
 
     total_prs_time = 0
-    string_punctuation = ['.', '?', '!']
-    slide_num = 1
     slides_without_notes = 0
     slide_times = []
     cumul_slide_times = []
 
-    for slide in prs.slides:
-        slide_notes, num_breaks = get_slide_notes(slide)
-        if not slide_notes:
+    for title, notes_runs in slide_notes:
+        has_notes, num_words, pauses, num_breaks = count_notes(notes_runs)
+        if not has_notes:
             slides_without_notes += 1
         if slides_without_notes > 2:
             return None, None, None
 
-        if slide.shapes.title:
-            title = slide.shapes.title.text.lower()
-            if "backup" in title:
-                break
+        if title is not None and "backup" in title.lower():
+            break
 
         cumul_slide_times.append(time.strftime('%H:%M:%S', time.gmtime(total_prs_time)))
         time_per_slide = num_breaks * seconds_per_break
+        for num_pauses in pauses:
+            time_per_slide += num_pauses * seconds_per_pause
+        time_per_slide += num_words * seconds_per_word
 
-        for punctuation in string_punctuation:
-            punc_pauses = slide_notes.count(punctuation)
-            time_per_slide += punc_pauses * seconds_per_pause
-            slide_notes = slide_notes.replace(punctuation, '')
-
-        words = slide_notes.strip().split(' ')
-        time_per_slide += len(words) * seconds_per_word
-
-        slide_num += 1
         total_prs_time += time_per_slide + seconds_between_slides
         slide_times.append(time.strftime('%M:%S', time.gmtime(time_per_slide)))
 
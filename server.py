@@ -0,0 +1,142 @@
+"""Server mode for PPTChecker
+
+Keeps the config, word set and imports loaded in a pool of worker
+processes and checks decks sent over localhost HTTP, so each request only
+pays for the rules themselves.
+
+    POST /check    body: the .pptx bytes    -> findings as JSON
+    GET  /health                            -> {"status": "ok", ...}
+
+At most --max-pending decks are queued or being checked at once; further
+requests are turned away with 503 instead of piling up. client.py forwards
+to a running server and falls back to checking locally.
+"""
+
+import argparse
+import io
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from extract import build_deck_snapshot_from_zip
+from lexicon import LEXICON_PATH
+from pptchecker import check_presentation
+from report import findings_to_dict
+from util import DEFAULT_CONFIG_PATH, initialize_word_set, read_config_yaml
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+MAX_DECK_BYTES = 512 * 1024 * 1024
+
+parser = argparse.ArgumentParser(description='Serve PPTChecker over localhost HTTP')
+parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+parser.add_argument('-c', '--config', type=str, default=DEFAULT_CONFIG_PATH)
+parser.add_argument('-j', '--jobs', type=int, default=None,
+                    help="number of worker processes (default: CPU count)")
+parser.add_argument('--max-pending', type=int, default=32,
+                    help="decks queued or being checked before requests are refused")
+
+# Loaded once per worker process by init_worker
+_worker_config = None
+_worker_wordset = None
+
+
+def init_worker(config_path, lexicon_path=LEXICON_PATH):
+    global _worker_config, _worker_wordset
+    _worker_config = read_config_yaml(config_path)
+    _worker_wordset = initialize_word_set(lexicon_path)
+
+
+def check_deck_bytes(data):
+    deck = build_deck_snapshot_from_zip(io.BytesIO(data))
+    return findings_to_dict(check_presentation(deck, _worker_config, _worker_wordset))
+
+
+class CheckServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, executor, max_pending=32, max_deck_bytes=MAX_DECK_BYTES):
+        super().__init__(address, CheckHandler)
+        self.executor = executor
+        self.max_pending = max_pending
+        self.max_deck_bytes = max_deck_bytes
+        self.pending = threading.BoundedSemaphore(max_pending)
+        self.num_pending = 0
+        self.num_checked = 0
+        self._lock = threading.Lock()
+
+    def check(self, data):
+        """Findings for data, or None if the queue is full."""
+        if not self.pending.acquire(blocking=False):
+            return None
+        with self._lock:
+            self.num_pending += 1
+        try:
+            return self.executor.submit(check_deck_bytes, data).result()
+        finally:
+            with self._lock:
+                self.num_pending -= 1
+                self.num_checked += 1
+            self.pending.release()
+
+
+class CheckHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/health":
+            self.respond(404, {"error": "not found"})
+            return
+        self.respond(200, {"status": "ok", "pending": self.server.num_pending,
+                           "max_pending": self.server.max_pending,
+                           "checked": self.server.num_checked})
+
+    def do_POST(self):
+        if self.path != "/check":
+            self.respond(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            self.respond(400, {"error": "request body must be a .pptx file"})
+            return
+        if length > self.server.max_deck_bytes:
+            self.respond(413, {"error": "presentation is too large"})
+            return
+
+        data = self.rfile.read(length)
+        try:
+            findings = self.server.check(data)
+        except Exception as err:
+            self.respond(400, {"error": f"{type(err).__name__}: {err}"})
+            return
+        if findings is None:
+            self.respond(503, {"error": "server is busy, try again later"})
+            return
+        self.respond(200, findings)
+
+    def respond(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    args = parser.parse_args()
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker,
+                             initargs=(args.config,)) as executor:
+        server = CheckServer((DEFAULT_HOST, args.port), executor, args.max_pending)
+        print(f"PPTChecker server listening on http://{DEFAULT_HOST}:{server.server_port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Helpers shared by the PPTChecker tests"""
+
+import os
+import tempfile
+from lexicon import build_lexicon
+from util import initialize_word_set, load_words
+
+
+def dump(value):
+    """Plain data of a snapshot object, for comparing snapshots."""
+    if hasattr(value, "__slots__"):
+        return {name: dump(getattr(value, name)) for name in value.__slots__}
+    if isinstance(value, list):
+        return [dump(item) for item in value]
+    return repr(value)
+
+
+class WordListLexicon:
+    """Test case mixin with a wordset built from the word lists alone.
+
+    The lexicon keeps the tests independent of WordNet. It is written to
+    cls.tmp_dir, which tests may also use for their own files.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.lexicon_path = os.path.join(cls.tmp_dir.name, "lexicon.bin")
+        build_lexicon(cls.lexicon_path, load_words("verbs"), load_words("prepositions"))
+        cls.wordset = initialize_word_set(cls.lexicon_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.wordset.lexicon.close()
+        cls.tmp_dir.cleanup()
+        super().tearDownClass()
@@ -0,0 +1,34 @@
+"""Tests PPTChecker batch mode defined in batch.py"""
+
+import os
+import tempfile
+import unittest
+from batch import assign_report_names, check_one, find_presentations
+
+
+class BatchTest(unittest.TestCase):
+    def test_find_presentations(self):
+        paths = find_presentations("./test/test_pptx")
+        self.assertEqual(len(paths), 5)
+        self.assertEqual(paths, sorted(paths))
+        self.assertEqual(find_presentations("./test/test_pptx/perfect*.pptx"),
+                         ["./test/test_pptx/perfect.pptx",
+                          "./test/test_pptx/perfect_googleslides.pptx"])
+
+    def test_assign_report_names(self):
+        self.assertEqual(assign_report_names(["a/deck.pptx", "b/deck.pptx", "c.pptx"]),
+                         ["deck.html", "deck_2.html", "c.html"])
+
+    def test_bad_deck_reports_error(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "broken.pptx")
+            with open(path, "w") as wfile:
+                wfile.write("not a presentation")
+            result = check_one(path, os.path.join(tmp_dir, "broken.html"))
+        self.assertFalse(result["passed"])
+        self.assertIsNone(result["report"])
+        self.assertIn("PackageNotFoundError", result["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
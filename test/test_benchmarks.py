@@ -0,0 +1,62 @@
+"""Tests the synthetic deck generator and baseline comparison in benchmarks/"""
+
+import os
+import tempfile
+import unittest
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from benchmarks.scaling import compare_to_baseline
+from benchmarks.synthetic_deck import generate_deck
+from engine import build_deck_snapshot
+
+
+class SyntheticDeckTest(unittest.TestCase):
+    def test_parameters(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "deck.pptx")
+            generate_deck(path, num_slides=6, shapes_per_slide=8, runs_per_shape=2,
+                          notes_words=30, media_bytes=20000)
+            prs = Presentation(path)
+            deck = build_deck_snapshot(prs)
+
+            self.assertEqual(deck.num_slides, 6)
+            self.assertEqual(deck.slides[-1].title, "Summary")
+            for slide in deck.slides:
+                # Title, the generated shapes, slide number and picture
+                self.assertEqual(len(slide.shapes), 8 + 3)
+                self.assertEqual(sum(len(shape.runs) for shape in slide.shapes),
+                                 6 * 2 + 2)
+                self.assertTrue(slide.notes_runs)
+
+            pictures = [shape for slide in prs.slides for shape in slide.shapes
+                        if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+            self.assertEqual(len(pictures), 6)
+            self.assertEqual(len({picture.image.sha1 for picture in pictures}), 1)
+            self.assertGreater(len(pictures[0].image.blob), 15000)
+
+    def test_same_seed_same_deck(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = [os.path.join(tmp_dir, f"deck_{i}.pptx") for i in range(2)]
+            for path in paths:
+                generate_deck(path, num_slides=3, seed=7)
+            titles = [[slide.shapes.title.text for slide in Presentation(path).slides]
+                      for path in paths]
+            self.assertEqual(titles[0], titles[1])
+
+
+class BaselineTest(unittest.TestCase):
+    def test_compare_to_baseline(self):
+        baseline = {"sizes": [{"slides": 100, "end_to_end": 1.0, "peak_memory_mb": 10.0,
+                               "rules": {"should_have_slide_numbers": 0.001}}]}
+        results = {"sizes": [{"slides": 100, "end_to_end": 1.5, "peak_memory_mb": 10.5,
+                              "rules": {"should_have_slide_numbers": 0.004}},
+                             {"slides": 500, "end_to_end": 9.0, "peak_memory_mb": 50.0,
+                              "rules": {}}]}
+        regressions = compare_to_baseline(results, baseline, 0.25)
+        # Slide numbers quadrupled but stays under the noise floor
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("100 slides, end_to_end"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+"""Tests the batched contrast computation defined in contrast.py"""
+
+import random
+import unittest
+from contrast import ContrastCache, batch_contrast_ratios
+from util import calculate_contrast_ratio
+
+
+class ContrastTest(unittest.TestCase):
+    def test_matches_scalar_contrast_ratio(self):
+        rng = random.Random(0)
+        pairs = [("FFFFFF", "000000"), ("000000", "FFFFFF"), ("FF0000", "00FF00"),
+                 ("123456", "123456"), ("0000ff", "FFFFFF")]
+        pairs += [(f"{rng.randrange(1 << 24):06X}", f"{rng.randrange(1 << 24):06X}")
+                  for _ in range(200)]
+        for pair, contrast_ratio in zip(pairs, batch_contrast_ratios(pairs)):
+            self.assertAlmostEqual(contrast_ratio, calculate_contrast_ratio(*pair),
+                                   places=12, msg=pair)
+
+    def test_cache(self):
+        contrast_cache = ContrastCache()
+        contrast_cache.prefetch([("FFFFFF", "000000"), ("FFFFFF", "000000")])
+        self.assertEqual(len(contrast_cache), 1)
+
+        self.assertAlmostEqual(contrast_cache.ratio("FFFFFF", "000000"), 21)
+        self.assertEqual(contrast_cache.ratio("ABCDEF", "ABCDEF"), 1)
+        self.assertEqual((contrast_cache.hits, contrast_cache.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
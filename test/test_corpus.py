@@ -0,0 +1,105 @@
+"""Tests PPTChecker corpus mode defined in corpus.py"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.util import Inches
+from corpus import deck_counts, failing_decks, open_database, rule_summary, run_corpus
+from rules import RULES_VERSION
+from util import DEFAULT_CONFIG_PATH
+
+CONTRAST_RULE = "should_have_high_contrast_fonts_colours"
+
+
+def save_deck(path, shape_color):
+    # Shapes without text keep the check independent of WordNet
+    prs = Presentation()
+    for _ in range(2):
+        shape = prs.slides.add_slide(prs.slide_layouts[6]).shapes.add_shape(
+            MSO_SHAPE.OVAL, Inches(1), Inches(1), Inches(2), Inches(1))
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = RGBColor.from_string(shape_color)
+    prs.save(path)
+
+
+class CorpusTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "corpus.sqlite")
+        self.paths = [os.path.join(self.tmp_dir.name, name)
+                      for name in ("broken.pptx", "dark.pptx", "light.pptx")]
+        with open(self.paths[0], "w") as wfile:
+            wfile.write("not a presentation")
+        save_deck(self.paths[1], "1F4E79")
+        save_deck(self.paths[2], "F0F0F0")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_corpus(self, config_path=DEFAULT_CONFIG_PATH):
+        return run_corpus(self.paths, self.db_path, config_path, max_workers=1)
+
+    def query(self, query, *args):
+        connection = open_database(self.db_path)
+        try:
+            return query(connection, *args)
+        finally:
+            connection.close()
+
+    def test_records_results(self):
+        self.assertEqual(self.run_corpus(), 3)
+        self.assertEqual(self.query(failing_decks, CONTRAST_RULE), [self.paths[2]])
+        self.assertEqual(self.query(deck_counts), (3, 0, 1))
+
+        summary = {rule: counts for rule, *counts in self.query(rule_summary)}
+        self.assertEqual(summary[CONTRAST_RULE], [1, 2])
+        self.assertEqual(summary["should_have_slide_numbers"], [2, 0])
+
+    def test_skips_unchanged_decks(self):
+        self.run_corpus()
+        # Only the broken deck is tried again
+        self.assertEqual(self.run_corpus(), 1)
+
+        # Touched but unchanged decks are hashed, not checked
+        os.utime(self.paths[1], ns=(0, 0))
+        self.assertEqual(self.run_corpus(), 1)
+
+        shutil.copy(self.paths[1], self.paths[2])
+        self.assertEqual(self.run_corpus(), 2)
+        self.assertEqual(self.query(failing_decks, CONTRAST_RULE), [])
+
+    def test_resumes_and_rechecks_on_config_change(self):
+        self.run_corpus()
+        # As if the run had been interrupted before the last deck was stored
+        connection = open_database(self.db_path)
+        with connection:
+            connection.execute("DELETE FROM decks WHERE path = ?", (self.paths[2],))
+        connection.close()
+        self.assertEqual(self.run_corpus(), 2)
+
+        config_path = os.path.join(self.tmp_dir.name, "config.yaml")
+        with open(DEFAULT_CONFIG_PATH) as rfile, open(config_path, "w") as wfile:
+            wfile.write(rfile.read() + "\nmax_findings_per_rule: 1\n")
+        self.assertEqual(self.run_corpus(config_path), 3)
+
+    def test_rechecks_on_rules_change(self):
+        self.run_corpus()
+        with mock.patch("corpus.RULES_VERSION", RULES_VERSION + 1):
+            self.assertEqual(self.run_corpus(), 3)
+
+    def test_forgets_deleted_decks(self):
+        self.run_corpus()
+        os.remove(self.paths[2])
+        del self.paths[2]
+        self.assertEqual(self.run_corpus(), 1)
+        self.assertEqual(self.query(deck_counts), (2, 0, 1))
+        self.assertEqual(self.query(failing_decks, CONTRAST_RULE), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
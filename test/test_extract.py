@@ -0,0 +1,87 @@
+"""Tests the streaming deck extraction defined in extract.py"""
+
+import glob
+import os
+import tempfile
+import unittest
+from pptx import Presentation
+from pptx.util import Emu
+from engine import build_deck_snapshot
+from extract import ZipDeck, build_deck_snapshot_from_zip
+from pptchecker import check_presentation, estimate_presentation_file
+from rules import estimate_presentation_length
+from util import read_config_yaml
+from helpers import dump
+from test_theme import build_dark_background_deck
+
+
+class ExtractTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = read_config_yaml("./config/default.yaml")
+        cls.paths = sorted(glob.glob("./test/test_pptx/*.pptx"))
+
+    def assertSameSnapshot(self, expected, actual):
+        self.assertEqual(actual.slide_width, expected.slide_width)
+        self.assertEqual(actual.slide_height, expected.slide_height)
+        self.assertEqual(actual.num_active_slides, expected.num_active_slides)
+        self.assertEqual([dump(slide) for slide in actual.slides],
+                         [dump(slide) for slide in expected.slides])
+
+    def test_same_snapshot(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                self.assertSameSnapshot(build_deck_snapshot(Presentation(path)),
+                                        build_deck_snapshot_from_zip(path))
+
+    def test_same_findings(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    check_presentation(build_deck_snapshot_from_zip(path), self.config),
+                    check_presentation(Presentation(path), self.config))
+
+    def test_same_time_estimate(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                with ZipDeck(path) as zip_deck:
+                    titles_and_notes = list(zip_deck.iter_titles_and_notes())
+                deck = build_deck_snapshot(Presentation(path))
+                self.assertEqual(titles_and_notes,
+                                 [(slide.title, slide.notes_runs) for slide in deck.slides])
+                self.assertEqual(estimate_presentation_file(path, self.config),
+                                 estimate_presentation_length(deck, self.config))
+
+    def test_dark_background(self):
+        for on_layout in (False, True):
+            prs = build_dark_background_deck(on_layout)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, "dark.pptx")
+                prs.save(path)
+                deck = build_deck_snapshot_from_zip(path)
+            self.assertSameSnapshot(build_deck_snapshot(prs), deck)
+            self.assertEqual(deck.slides[0].background_rgb, "101010")
+
+    def test_groups(self):
+        prs = Presentation()
+        group = prs.slides.add_slide(prs.slide_layouts[6]).shapes.add_group_shape()
+        group.shapes.add_textbox(Emu(100000), Emu(200000), Emu(300000), Emu(100000)).text = "A"
+        inner_group = group.shapes.add_group_shape()
+        inner_group.shapes.add_textbox(Emu(500000), Emu(600000), Emu(300000), Emu(100000))
+        # Moves the group without changing its child coordinates
+        group.left = Emu(2000000)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "groups.pptx")
+            prs.save(path)
+            deck = build_deck_snapshot_from_zip(path)
+        self.assertSameSnapshot(build_deck_snapshot(prs), deck)
+
+        children = deck.slides[0].shapes[0].children
+        self.assertEqual((children[0].left, children[0].top), (2000000, 200000))
+        self.assertEqual((children[1].children[0].left, children[1].children[0].top),
+                         (2400000, 600000))
+
+
+if __name__ == '__main__':
+    unittest.main()
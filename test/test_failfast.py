@@ -0,0 +1,73 @@
+"""Tests rule selection and fail-fast checking defined in rules.py and failfast.py"""
+
+import glob
+import unittest
+from pptx import Presentation
+from engine import DeckSnapshot
+from failfast import first_violation
+from findings import FindingsStore
+from pptchecker import check_presentation
+from rules import CHEAP, RULES, SLIDE_RULES, make_visitors, select_rules
+from util import read_config_yaml
+from helpers import WordListLexicon
+
+
+class FailFastTest(WordListLexicon, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = read_config_yaml("./config/default.yaml")
+        cls.paths = sorted(glob.glob("./test/test_pptx/*.pptx"))
+
+    def test_select_rules(self):
+        self.assertIsNone(select_rules())
+        self.assertEqual(select_rules(["should_have_slide_numbers"]),
+                         {"should_have_slide_numbers"})
+        self.assertEqual(select_rules(skip_rules=["does_not_have_complete_sentences"]),
+                         set(RULES) - {"does_not_have_complete_sentences"})
+        self.assertEqual(select_rules(max_cost=CHEAP),
+                         {rule for rule, cost in RULES.items() if cost == CHEAP})
+        with self.assertRaises(ValueError):
+            select_rules(["no_such_rule"])
+        with self.assertRaises(ValueError):
+            select_rules(max_cost="free")
+
+    def test_selected_visitors(self):
+        rules = select_rules(["should_not_have_excessive_text", "should_have_slide_numbers"])
+        deck = DeckSnapshot(12192000, 6858000, [])
+        visitors = make_visitors(deck, self.config, FindingsStore(), rules=rules)
+        self.assertEqual([visitor.rule for visitor in visitors],
+                         [rule for rule in SLIDE_RULES if rule in rules])
+
+    def test_skipped_rules_report_nothing(self):
+        rules = select_rules(["should_not_have_excessive_text"])
+        prs = Presentation("./test/test_pptx/bad.pptx")
+        time_estimate, display_info, _ = check_presentation(prs, self.config, rules=rules)
+
+        self.assertIsNone(time_estimate)
+        self.assertEqual(display_info["general_feedback"],
+                         "Please ensure that slides do not have too much text.<br>")
+        self.assertEqual([bool(feedback) for feedback in display_info["slide_feedback"]],
+                         [False, False, False, False, False, True, False])
+
+    def test_same_verdict_as_full_check(self):
+        for rules in (None, select_rules(max_cost=CHEAP)):
+            for path in self.paths:
+                with self.subTest(path=path, rules=rules):
+                    _, display_info, pass_all_checks = check_presentation(
+                        Presentation(path), self.config, self.wordset, rules)
+                    passed = pass_all_checks and not display_info["general_feedback"]
+                    violation = first_violation(path, self.config, rules, self.wordset)
+                    self.assertEqual(violation is None, passed, str(violation))
+
+    def test_stops_at_first_violation(self):
+        violation = first_violation("./test/test_pptx/bad.pptx", self.config,
+                                    select_rules(["should_not_have_excessive_text"]))
+        self.assertEqual((violation.rule, violation.slide_number),
+                         ("should_not_have_excessive_text", 6))
+        self.assertEqual(str(violation), "Slide 6: should_not_have_excessive_text: "
+                                         "Excessive amount of words on this slide.")
+
+
+if __name__ == "__main__":
+    unittest.main()
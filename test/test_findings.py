@@ -0,0 +1,74 @@
+"""Tests the findings store defined in findings.py"""
+
+import unittest
+from findings import ERROR, WARNING, Finding, FindingsStore
+from pptchecker import combine_findings
+from rules import SLIDE_NUMBER_MISSING
+
+
+class TestFindingsStore(unittest.TestCase):
+
+    def test_findings_round_trip(self):
+        findings = FindingsStore()
+        self.assertTrue(findings.add("contrast", 2, "Low contrast in {}.", ("Title",), 7, ERROR))
+        self.assertTrue(findings.add("slide_numbers", 3, SLIDE_NUMBER_MISSING))
+
+        self.assertEqual(len(findings), 2)
+        finding = findings[0]
+        self.assertEqual((finding.rule, finding.slide_index, finding.shape_id, finding.severity),
+                         ("contrast", 2, 7, ERROR))
+        self.assertEqual(finding.message, "Low contrast in Title.")
+        self.assertEqual(findings[1].to_dict(), {
+            "rule": "slide_numbers", "shape_id": None, "severity": "warning",
+            "message": "Slide number is missing on this slide."})
+
+    def test_messages_are_interned(self):
+        findings = FindingsStore()
+        for index in range(100):
+            findings.add("excessive_text", index, "Too many words ({}).", (42,))
+        self.assertEqual(len(findings), 100)
+        self.assertEqual(len(findings._messages), 1)
+        self.assertEqual(len(findings._rule_names), 1)
+
+    def test_repeats_on_a_slide_are_dropped(self):
+        findings = FindingsStore()
+        self.assertTrue(findings.add("contrast", 0, "Low contrast in {}.", ("A",), 1))
+        self.assertFalse(findings.add("contrast", 0, "Low contrast in {}.", ("A",), 1))
+        self.assertTrue(findings.add("contrast", 0, "Low contrast in {}.", ("A",), 2))
+        self.assertTrue(findings.add("contrast", 1, "Low contrast in {}.", ("A",), 1))
+        self.assertEqual(len(findings), 3)
+
+    def test_cap_per_rule(self):
+        findings = FindingsStore(max_per_rule=3)
+        for index in range(5):
+            findings.add("excessive_text", index, "Too many words.")
+        findings.add("slide_numbers", 0, SLIDE_NUMBER_MISSING)
+
+        self.assertEqual(len(findings), 4)
+        self.assertEqual(findings.count("excessive_text"), 5)
+        self.assertEqual(findings.num_omitted, {"excessive_text": 2})
+        self.assertEqual(FindingsStore().num_omitted, {})
+
+    def test_slide_feedback(self):
+        findings = FindingsStore()
+        findings.add("slide_numbers", 0, SLIDE_NUMBER_MISSING)
+        findings.add("contrast", 0, "Low contrast in {}.", ("Title",), 4)
+        findings.add_finding(Finding("excessive_text", 0, "Too many words."), 2)
+
+        self.assertEqual(findings.slide_feedback(3), [
+            "Slide number is missing on this slide.\nLow contrast in Title.\n",
+            "",
+            "Too many words.\n",
+        ])
+        self.assertEqual(sorted(findings.findings_by_slide()), [0, 2])
+        self.assertEqual(findings.findings_by_slide()[2][0].severity, WARNING)
+
+    def test_omitted_findings_are_reported(self):
+        _, display_info, _ = combine_findings(["", ""], [True] * 5, True, ("00:01:00", [], []),
+                                              {"excessive_text": 12})
+        self.assertIn("12 more findings of excessive_text are not shown.",
+                      display_info["general_feedback"])
+
+
+if __name__ == "__main__":
+    unittest.main()
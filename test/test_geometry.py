@@ -0,0 +1,32 @@
+"""Tests the columnar shape tables defined in geometry.py"""
+
+import unittest
+from geometry import pairs_within_bounds, shape_table
+from test_matching import SLIDE_HEIGHT, SLIDE_WIDTH, make_shape
+
+
+class GeometryTest(unittest.TestCase):
+    def test_shape_table(self):
+        placed = make_shape(100, 200, 300, 400)
+        unsized = make_shape(100, 200)
+        unsized.width = None
+
+        table = shape_table([placed, unsized])
+        self.assertEqual(table["placed"].tolist(), [True, False])
+        self.assertEqual(table[["left", "top"]].tolist(), [(100, 200), (0, 0)])
+
+    def test_pairs_within_bounds(self):
+        prev = shape_table([make_shape(1000000, 1000000), make_shape(5000000, 1000000),
+                            make_shape(0, 0)])
+        curr = shape_table([make_shape(5000000 + 1219200, 1000000),
+                            make_shape(1000000, 1000000 + 685801),
+                            make_shape(1100000, 1000000), make_shape(0, 0)])
+        curr["placed"][3] = False
+        # The threshold is inclusive, in slide widths and heights
+        prev_rows, curr_rows = pairs_within_bounds(prev, curr, 0.1, SLIDE_WIDTH, SLIDE_HEIGHT)
+        self.assertEqual(list(zip(prev_rows.tolist(), curr_rows.tolist())),
+                         [(0, 2), (1, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
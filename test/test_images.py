@@ -0,0 +1,135 @@
+"""Tests the picture contrast checks defined in images.py and rules.py"""
+
+import io
+import math
+import os
+import tempfile
+import unittest
+from PIL import Image, ImageDraw
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.util import Inches, Pt
+from engine import build_deck_snapshot, iter_shapes
+from extract import ZipDeck, build_deck_snapshot_from_zip
+from images import GRID_SIZE, ImageCache, decode_luminance, median_contrast
+from pptchecker import check_presentation
+from util import read_config_yaml
+
+
+def png(color, size=(200, 100), mode="RGB"):
+    stream = io.BytesIO()
+    Image.new(mode, size, color).save(stream, "PNG")
+    return stream.getvalue()
+
+
+def add_text(slide, text, color):
+    run = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1)
+                                   ).text_frame.paragraphs[0].add_run()
+    run.text = text
+    run.font.size = Pt(28)
+    run.font.color.rgb = RGBColor.from_string(color)
+
+
+def build_picture_deck():
+    prs = Presentation()
+    layout = prs.slide_layouts[6]
+    dark_logo = png((0x20, 0x20, 0x20))
+
+    # A dark logo on a dark background, and white text over a white picture
+    slide = prs.slides.add_slide(layout)
+    slide.background.fill.solid()
+    slide.background.fill.fore_color.rgb = RGBColor(0x10, 0x10, 0x10)
+    slide.shapes.add_picture(io.BytesIO(dark_logo), Inches(8), Inches(6), Inches(1))
+    slide.shapes.add_picture(io.BytesIO(png((0xF8, 0xF8, 0xF8))), 0, 0,
+                             prs.slide_width, prs.slide_height)
+    add_text(slide, "Hidden", "FFFFFF")
+
+    # White text over a dark photo on a white background
+    slide = prs.slides.add_slide(layout)
+    slide.shapes.add_picture(io.BytesIO(dark_logo), 0, 0, prs.slide_width, prs.slide_height)
+    add_text(slide, "Visible", "FFFFFF")
+
+    # The same logo again, on a background it stands out from
+    slide = prs.slides.add_slide(layout)
+    slide.shapes.add_picture(io.BytesIO(dark_logo), Inches(8), Inches(6), Inches(1))
+    return prs
+
+
+class ImagesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = read_config_yaml("./config/default.yaml")
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp_dir.name, "pictures.pptx")
+        build_picture_deck().save(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_decode_luminance(self):
+        luminance = decode_luminance(png((255, 255, 255), size=(1000, 10)))
+        self.assertEqual(luminance.shape, (1, GRID_SIZE))
+        self.assertAlmostEqual(float(luminance.max()), 1)
+        self.assertAlmostEqual(median_contrast(luminance, "000000"), 21)
+
+        transparent = decode_luminance(png((0, 0, 0, 0), mode="RGBA"))
+        self.assertTrue(math.isnan(transparent[0, 0]))
+        self.assertIsNone(median_contrast(transparent, "FFFFFF"))
+        self.assertIsNone(decode_luminance(b"not an image"))
+
+    def test_cache(self):
+        image_cache = ImageCache(maxsize=1)
+        blob = png((0, 0, 0))
+        first = image_cache.get("a", lambda: blob)
+        self.assertIs(image_cache.get("a", lambda: self.fail("decoded twice")), first)
+        image_cache.get("b", lambda: blob)
+        self.assertEqual((len(image_cache), image_cache.hits, image_cache.misses), (1, 1, 2))
+
+    def test_repeated_picture_decoded_once(self):
+        with ZipDeck(self.path) as zip_deck:
+            zip_deck.image_cache = ImageCache()
+            for index in range(zip_deck.num_slides):
+                zip_deck.read_slide(index)
+            self.assertEqual(zip_deck.image_cache.misses, 2)
+
+    def test_pictures_not_read_without_contrast_rule(self):
+        deck = build_deck_snapshot_from_zip(self.path, load_images=False)
+        self.assertTrue(all(shape.image is None for slide in deck.slides
+                            for shape in iter_shapes(slide.shapes)))
+
+    def test_picture_contrast(self):
+        _, display_info, pass_all_checks = check_presentation(
+            Presentation(self.path), self.config)
+        self.assertFalse(pass_all_checks)
+        first, second, third = display_info["slide_feedback"]
+        self.assertIn("Contrast of picture", first)
+        self.assertIn("Font colour contrast for text 'Hidden'", first)
+        self.assertIn("from the picture behind it", first)
+        self.assertEqual(second, "")
+        self.assertEqual(third, "")
+
+    def test_light_screenshot_on_light_slide(self):
+        screenshot = Image.new("RGB", (400, 300), (0xFF, 0xFF, 0xFF))
+        ImageDraw.Draw(screenshot).rectangle((40, 40, 360, 70), fill=(0x20, 0x20, 0x20))
+        stream = io.BytesIO()
+        screenshot.save(stream, "PNG")
+        prs = Presentation()
+        prs.slides.add_slide(prs.slide_layouts[6]).shapes.add_picture(
+            io.BytesIO(stream.getvalue()), Inches(1), Inches(1), Inches(4))
+
+        _, display_info, _ = check_presentation(
+            prs, self.config, rules={"should_have_high_contrast_fonts_colours"})
+        self.assertEqual(display_info["slide_feedback"], [""])
+
+    def test_same_as_zip(self):
+        deck = build_deck_snapshot_from_zip(self.path)
+        self.assertEqual([repr(shape.image) for shape in deck.slides[0].shapes],
+                         [repr(shape.image) for shape in
+                          build_deck_snapshot(Presentation(self.path)).slides[0].shapes])
+        self.assertEqual(check_presentation(deck, self.config),
+                         check_presentation(Presentation(self.path), self.config))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests incremental re-checking defined in incremental.py"""
+
+import glob
+import os
+import unittest
+from pptx import Presentation
+from incremental import IncrementalChecker
+from pptchecker import check_presentation, check_presentation_incremental
+from util import read_config_yaml
+from helpers import WordListLexicon
+
+
+class IncrementalTest(WordListLexicon, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = read_config_yaml("./config/default.yaml")
+
+    def full_check(self, path):
+        return check_presentation(Presentation(path), self.config, self.wordset)
+
+    def test_same_findings(self):
+        cache_dir = os.path.join(self.tmp_dir.name, "cache_same")
+        for path in sorted(glob.glob("./test/test_pptx/*.pptx")):
+            expected = self.full_check(path)
+            for _ in range(2):
+                checker = IncrementalChecker(self.config, self.wordset, cache_dir)
+                with self.subTest(path=path):
+                    self.assertEqual(check_presentation_incremental(checker, path),
+                                     expected)
+            # The second run is served from the on-disk cache
+            self.assertEqual(checker.num_parsed, 0)
+
+    def test_only_changed_slides(self):
+        cache_dir = os.path.join(self.tmp_dir.name, "cache_changed")
+        path = os.path.join(self.tmp_dir.name, "deck.pptx")
+        # python-pptx re-serializes every part on save, so save once up front
+        Presentation("./test/test_pptx/bad.pptx").save(path)
+
+        checker = IncrementalChecker(self.config, self.wordset, cache_dir)
+        check_presentation_incremental(checker, path)
+
+        prs = Presentation(path)
+        shape = prs.slides[3].shapes.add_textbox(0, 0, 100, 100)
+        shape.text_frame.text = "An extra text box was added to this slide"
+        prs.save(path)
+
+        findings = check_presentation_incremental(checker, path)
+        self.assertEqual(findings, self.full_check(path))
+        # The changed slide is analysed; its neighbours are read again for transitions
+        self.assertEqual(checker.num_analysed, 1)
+        self.assertEqual(checker.num_parsed, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests lazy package loading defined in lazypackage.py"""
+
+import os
+import tempfile
+import unittest
+from pptx import Presentation
+from pptx.exc import PackageNotFoundError
+from pptx.util import Inches
+from engine import build_deck_snapshot
+from lazypackage import LazyBlob, lazy_presentation, open_presentation
+from helpers import dump
+
+PNG_PIXEL = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010802000000907753de"
+    "0000000c4944415408d763f8cfc000000301010018dd8db00000000049454e44ae426082")
+
+
+def lazy_parts(prs):
+    return [part for part in prs.part.package.iter_parts() if isinstance(part, LazyBlob)]
+
+
+class LazyPackageTest(unittest.TestCase):
+    def test_same_snapshot(self):
+        path = "./test/test_pptx/demo.pptx"
+        expected = build_deck_snapshot(Presentation(path))
+        actual = build_deck_snapshot(open_presentation(path))
+        self.assertEqual([dump(slide) for slide in actual.slides],
+                         [dump(slide) for slide in expected.slides])
+
+    def test_media_is_not_read(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            image_path = os.path.join(tmp_dir, "pixel.png")
+            with open(image_path, "wb") as wfile:
+                wfile.write(PNG_PIXEL)
+            prs = Presentation()
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            slide.shapes.add_picture(image_path, Inches(1), Inches(1))
+            path = os.path.join(tmp_dir, "picture.pptx")
+            prs.save(path)
+
+            prs = open_presentation(path)
+            build_deck_snapshot(prs)
+            image_parts = [part for part in lazy_parts(prs)
+                           if part.content_type == "image/png"]
+            self.assertEqual(len(image_parts), 1)
+            self.assertFalse(image_parts[0].is_loaded)
+
+            # The bytes are still there for whoever asks for them
+            self.assertEqual(prs.slides[0].shapes[0].image.blob, PNG_PIXEL)
+            self.assertTrue(image_parts[0].is_loaded)
+
+    def test_closed_on_exit(self):
+        with lazy_presentation("./test/test_pptx/demo.pptx") as prs:
+            build_deck_snapshot(prs)
+            mapped_zip = prs.part.package._reader._blob_reader
+            self.assertFalse(mapped_zip._mmap.closed)
+        self.assertTrue(mapped_zip._mmap.closed)
+
+    def test_not_a_package(self):
+        with tempfile.NamedTemporaryFile(suffix=".pptx") as tmp_file:
+            tmp_file.write(b"not a presentation")
+            tmp_file.flush()
+            with self.assertRaises(PackageNotFoundError):
+                open_presentation(tmp_file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
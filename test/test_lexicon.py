@@ -0,0 +1,70 @@
+"""Tests the compiled lexicon defined in lexicon.py"""
+
+import os
+import tempfile
+import unittest
+from lexicon import LEXICON_VERSION, Lexicon, build_lexicon
+from util import WordSet, classify_word, load_words
+
+FAKE_WORDNET = {
+    "run": {'n', 'v'},
+    "quickly": {'r'},
+    "cat": {'n'},
+    "café": {'n'},
+}
+
+
+class LexiconTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.lexicon_path = os.path.join(cls.tmp_dir.name, "lexicon.bin")
+        cls.verbs = load_words("verbs")
+        cls.prepositions = load_words("prepositions")
+        build_lexicon(cls.lexicon_path, cls.verbs, cls.prepositions, FAKE_WORDNET,
+                      lambda word: FAKE_WORDNET.get(word, set()))
+        cls.lexicon = Lexicon(cls.lexicon_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.lexicon.close()
+        cls.tmp_dir.cleanup()
+
+    def test_lookup(self):
+        self.assertEqual(len(self.lexicon),
+                         len(set(self.verbs) | set(self.prepositions) | set(FAKE_WORDNET)))
+        self.assertTrue(self.lexicon.lookup("café"))
+        self.assertEqual(self.lexicon.lookup("notaword"), 0)
+
+    def test_matches_word_lists(self):
+        articles = ['the', 'a', 'an']
+        list_wordset = WordSet(frozenset(self.verbs), frozenset(self.prepositions),
+                               articles)
+        lexicon_wordset = WordSet(frozenset(), frozenset(), articles,
+                                  lexicon=self.lexicon)
+
+        import util
+        wordnet_parts_of_speech = util.wordnet_parts_of_speech
+        util.wordnet_parts_of_speech = lambda word: set(FAKE_WORDNET.get(word, set()))
+        try:
+            words = (list(FAKE_WORDNET) + self.verbs[:50] + self.prepositions +
+                     ["the", "running", "painted", "notaword"])
+            for word in words:
+                self.assertEqual(classify_word(lexicon_wordset, word),
+                                 classify_word(list_wordset, word), word)
+        finally:
+            util.wordnet_parts_of_speech = wordnet_parts_of_speech
+
+    def test_rejects_other_versions(self):
+        path = os.path.join(self.tmp_dir.name, "old.bin")
+        with open(self.lexicon_path, "rb") as rfile:
+            data = bytearray(rfile.read())
+        data[8:12] = (LEXICON_VERSION + 1).to_bytes(4, "little")
+        with open(path, "wb") as wfile:
+            wfile.write(data)
+        with self.assertRaises(ValueError):
+            Lexicon(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
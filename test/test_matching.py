@@ -0,0 +1,101 @@
+"""Tests shape matching between slides defined in matching.py"""
+
+import time
+import unittest
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.util import Emu
+from engine import ShapeInfo, group_transform
+from matching import ShapeMatcher
+from lxml import etree
+
+SLIDE_WIDTH = 12192000
+SLIDE_HEIGHT = 6858000
+
+
+def make_shape(left, top, width=100000, height=50000, text="",
+               shape_type=MSO_SHAPE_TYPE.TEXT_BOX, children=()):
+    shape = ShapeInfo()
+    shape.shape_type = shape_type
+    shape.left, shape.top = Emu(left), Emu(top)
+    shape.width, shape.height = Emu(width), Emu(height)
+    shape.has_text_frame = bool(text)
+    shape.text = text
+    shape.children = list(children)
+    return shape
+
+
+def make_group(left, top, children):
+    return make_shape(left, top, 1000000, 1000000, shape_type=MSO_SHAPE_TYPE.GROUP,
+                      children=children)
+
+
+class ShapeMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.matcher = ShapeMatcher(0.1, SLIDE_WIDTH, SLIDE_HEIGHT)
+
+    def moved(self, prev_shapes, curr_shapes):
+        return [(prev.text, curr.text) for prev, curr in
+                self.matcher.moved_shapes(prev_shapes, curr_shapes)]
+
+    def test_nearest_identical_shape(self):
+        prev_shapes = [make_shape(1000000, 1000000, text="A"),
+                       make_shape(5000000, 1000000, text="B")]
+        # Same size, reordered; only B moved, and only slightly
+        curr_shapes = [make_shape(5100000, 1050000, text="B"),
+                       make_shape(1000000, 1000000, text="A")]
+        self.assertEqual(self.moved(prev_shapes, curr_shapes), [("B", "B")])
+
+    def test_far_or_changed_shapes_are_not_matched(self):
+        prev_shapes = [make_shape(1000000, 1000000, text="A"),
+                       make_shape(3000000, 3000000, text="B")]
+        curr_shapes = [make_shape(9000000, 5000000, text="A"),
+                       make_shape(3050000, 3000000, text="C")]
+        self.assertEqual(self.moved(prev_shapes, curr_shapes), [])
+
+    def test_many_identical_connectors(self):
+        prev_shapes = [make_shape(20000 * i, 20000 * (i % 50), shape_type=MSO_SHAPE_TYPE.LINE)
+                       for i in range(400)]
+        curr_shapes = list(reversed(prev_shapes))
+        nudged = make_shape(20000 * 7 + 5000, 20000 * 7, shape_type=MSO_SHAPE_TYPE.LINE)
+        curr_shapes[399 - 7] = nudged
+
+        start = time.perf_counter()
+        moved = self.matcher.moved_shapes(prev_shapes, curr_shapes)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual([(prev.left, curr.left) for prev, curr in moved],
+                         [(20000 * 7, nudged.left)])
+
+    def test_groups(self):
+        def diagram(offset):
+            return [make_group(0, 0, [make_shape(100000, 100000, text="A"),
+                                      make_shape(400000 + offset, 100000, text="B")])]
+
+        # Group in place: its children are matched
+        self.assertEqual(self.moved(diagram(0), diagram(50000)), [("B", "B")])
+
+        # Group nudged: reported once as a group
+        prev_group = diagram(0)
+        curr_group = [make_group(30000, 0, prev_group[0].children)]
+        moved = self.matcher.moved_shapes(prev_group, curr_group)
+        self.assertEqual([shape.shape_type for shape, _ in moved], [MSO_SHAPE_TYPE.GROUP])
+
+        # Group resized: children are matched on their own
+        resized = [make_shape(0, 0, 2000000, 1000000, shape_type=MSO_SHAPE_TYPE.GROUP,
+                              children=diagram(50000)[0].children)]
+        self.assertEqual(self.moved(diagram(0), resized), [("B", "B")])
+
+    def test_group_transform(self):
+        grp_sp = etree.fromstring(
+            '<p:grpSp xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+            'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+            '<p:grpSpPr><a:xfrm><a:off x="1000" y="2000"/><a:ext cx="200" cy="100"/>'
+            '<a:chOff x="10" y="20"/><a:chExt cx="100" cy="100"/></a:xfrm></p:grpSpPr>'
+            '</p:grpSp>')
+        scale_x, scale_y, offset_x, offset_y = group_transform(grp_sp)
+        # The child origin maps to the group offset, scaled by ext / chExt
+        self.assertEqual((10 * scale_x + offset_x, 20 * scale_y + offset_y), (1000, 2000))
+        self.assertEqual((scale_x, scale_y), (2.0, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Tests streaming NDJSON output defined in ndjson.py"""
+
+import glob
+import io
+import json
+import unittest
+from pptx import Presentation
+from ndjson import stream_findings
+from pptchecker import check_presentation
+from util import read_config_yaml
+from helpers import WordListLexicon
+
+
+class NdjsonTest(WordListLexicon, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = read_config_yaml("./config/default.yaml")
+
+    def stream(self, path):
+        wfile = io.StringIO()
+        stream_findings(path, self.config, wfile, self.wordset)
+        return [json.loads(line) for line in wfile.getvalue().splitlines()]
+
+    def test_same_findings(self):
+        for path in sorted(glob.glob("./test/test_pptx/*.pptx")):
+            with self.subTest(path=path):
+                time_estimate, display_info, pass_all_checks = check_presentation(
+                    Presentation(path), self.config, self.wordset)
+                records = self.stream(path)
+                deck, slides, summary = records[0], records[1:-1], records[-1]
+
+                self.assertEqual(deck["slides"], len(slides))
+                active = [slide for slide in slides if slide["active"]]
+                self.assertEqual(
+                    ["".join(finding["message"] + "<br>" for finding in slide["findings"])
+                     for slide in active],
+                    display_info["slide_feedback"])
+                self.assertEqual(summary["time_estimate"], time_estimate)
+                self.assertEqual(summary["slide_times"], display_info["slide_times"])
+                self.assertEqual("".join(message + "<br>" for message in summary["general_feedback"]),
+                                 display_info["general_feedback"])
+                self.assertEqual(summary["passed"],
+                                 pass_all_checks and not display_info["general_feedback"])
+
+    def test_findings_name_their_rule(self):
+        slides = self.stream("./test/test_pptx/bad.pptx")[1:-1]
+        rules = {finding["rule"] for slide in slides for finding in slide["findings"]}
+        self.assertIn("should_have_high_contrast_fonts_colours", rules)
+        self.assertNotIn(None, rules)
+
+
+if __name__ == '__main__':
+    unittest.main()
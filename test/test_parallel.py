@@ -0,0 +1,64 @@
+"""Tests intra-deck parallel checking defined in parallel.py"""
+
+import glob
+import os
+import unittest
+from pptx import Presentation
+from pptx.util import Inches
+from benchmarks.synthetic_deck import generate_deck
+from parallel import check_parallel, chunk_ranges
+from pptchecker import check_presentation, summarize_findings
+from util import read_config_yaml
+from helpers import WordListLexicon
+
+
+class ParallelTest(WordListLexicon, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = read_config_yaml("./config/default.yaml")
+
+    def assertSameFindings(self, path, chunk_size):
+        expected = check_presentation(Presentation(path), self.config, self.wordset)
+        deck, findings, satisfied_all = check_parallel(
+            path, self.config, jobs=2, chunk_size=chunk_size, lexicon_path=self.lexicon_path)
+        self.assertEqual(summarize_findings(deck, self.config, findings, satisfied_all),
+                         expected)
+
+    def test_same_findings(self):
+        for path in sorted(glob.glob("./test/test_pptx/*.pptx")):
+            for chunk_size in (1, 2, 100):
+                with self.subTest(path=path, chunk_size=chunk_size):
+                    self.assertSameFindings(path, chunk_size)
+
+    def test_same_findings_synthetic(self):
+        path = os.path.join(self.tmp_dir.name, "synthetic.pptx")
+        generate_deck(path, num_slides=40, shapes_per_slide=8, notes_words=20)
+        self.assertSameFindings(path, 7)
+
+    def test_two_misplaced_slide_numbers(self):
+        prs = Presentation()
+        bottom = prs.slide_height - Inches(0.5)
+        for lefts in ((), (Inches(9),), (Inches(1), Inches(5))):
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            for left in lefts:
+                slide.shapes.add_textbox(left, bottom, Inches(0.5), Inches(0.4)
+                                         ).text_frame.text = str(len(prs.slides))
+        path = os.path.join(self.tmp_dir.name, "slide_numbers.pptx")
+        prs.save(path)
+
+        _, findings, _ = check_parallel(path, self.config, jobs=2, chunk_size=1,
+                                        lexicon_path=self.lexicon_path)
+        self.assertEqual(findings.count("should_have_slide_numbers"), 2)
+        self.assertSameFindings(path, 1)
+
+    def test_chunk_ranges(self):
+        self.assertEqual(chunk_ranges(10, 2, 4), [(0, 4), (4, 8), (8, 10)])
+        self.assertEqual(chunk_ranges(0, 2, 4), [])
+        ranges = chunk_ranges(1000, 4)
+        self.assertEqual(len(ranges), 16)
+        self.assertEqual(ranges[-1][1], 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,9 +9,19 @@ from rules import (
     should_have_high_contrast_fonts_colours,
     should_not_have_excessive_text,
     does_not_have_complete_sentences,
-    estimate_presentation_length
+    estimate_presentation_length,
+    ContrastVisitor,
 )
-from util import read_config_yaml, is_backup_slide
+from util import (
+    read_config_yaml,
+    count_notes,
+    is_backup_slide,
+    identify_parts_of_speech,
+    PartsOfSpeechCache,
+    WordSet,
+)
+from engine import DeckSnapshot, SlideInfo, get_deck_snapshot, run_visitors
+from findings import FindingsStore
 
 class PPTCheckerTest(unittest.TestCase):
     @classmethod
@@ -52,7 +62,8 @@ class PPTCheckerTest(unittest.TestCase):
         self.assertFalse(has_smooth_slide_transitions(self.prs_bad,
                                                       self.config,
                                                       prs_bad_slide_feedback))
-        self.assertTrue(assert_slide_feedback(prs_bad_slide_feedback, [5]))
+        # The 'Vertex' label on slide 4 is nudged from where it was on slide 3
+        self.assertTrue(assert_slide_feedback(prs_bad_slide_feedback, [3, 5]))
 
         self.assertTrue(has_smooth_slide_transitions(self.prs_perfect_g,
                                                      self.config,
@@ -61,7 +72,7 @@ class PPTCheckerTest(unittest.TestCase):
         self.assertFalse(has_smooth_slide_transitions(self.prs_bad_g,
                                                       self.config,
                                                       prs_bad_g_slide_feedback))
-        self.assertTrue(assert_slide_feedback(prs_bad_g_slide_feedback, [5]))
+        self.assertTrue(assert_slide_feedback(prs_bad_g_slide_feedback, [3, 5]))
 
     def test_should_have_high_contrast_fonts_colours(self):
         self.assertTrue(should_have_high_contrast_fonts_colours(self.prs_perfect,
@@ -118,6 +129,53 @@ class PPTCheckerTest(unittest.TestCase):
         self.assertEqual(len(slide_times), len(cumul_slide_times))
         self.assertEqual(len(self.prs_perfect_slide_feedback), len(slide_times))
 
+    def test_count_notes(self):
+        self.assertEqual(count_notes([]), (False, 1, (0, 0, 0), 0))
+        self.assertEqual(count_notes(["[Break]", "[Slide 2]"]), (False, 1, (0, 0, 0), 1))
+        self.assertEqual(count_notes([" Hello world. Is it?", "[Break]", "Yes! Yes!! "]),
+                         (True, 5, (1, 1, 3), 1))
+
+    def test_deck_snapshot(self):
+        deck = get_deck_snapshot(self.prs_perfect)
+        self.assertIs(deck, get_deck_snapshot(self.prs_perfect))
+        self.assertIs(deck, get_deck_snapshot(deck))
+        self.assertEqual(deck.num_slides, len(self.prs_perfect.slides))
+        self.assertEqual(deck.num_active_slides, len(self.prs_perfect_slide_feedback))
+
+    def test_repeated_shapes_are_checked_once(self):
+        bad_slide = get_deck_snapshot(self.prs_bad).slides[2]
+        slides = []
+        for index in range(5):
+            slide = SlideInfo(index)
+            slide.title = bad_slide.title
+            slide.background_rgb = bad_slide.background_rgb
+            slide.shapes = bad_slide.shapes
+            slides.append(slide)
+        deck = DeckSnapshot(self.prs_bad.slide_width, self.prs_bad.slide_height, slides)
+
+        findings = FindingsStore()
+        visitor = ContrastVisitor(deck, self.config, findings)
+        self.assertEqual(run_visitors(deck, [visitor]), [False])
+        self.assertLessEqual(len(visitor.shape_findings), len(bad_slide.shapes))
+        slide_feedback = findings.slide_feedback(len(slides))
+        self.assertTrue(slide_feedback[0])
+        self.assertEqual(slide_feedback, [slide_feedback[0]] * len(slides))
+
+    def test_parts_of_speech_cache(self):
+        pos_cache = PartsOfSpeechCache(maxsize=2)
+        pos_cache.put("cat", frozenset('n'))
+        pos_cache.put("runs", frozenset('v'))
+        wordset = WordSet([], [], ['the', 'a', 'an'], pos_cache)
+
+        words_classified = identify_parts_of_speech(wordset, ["cat", "runs", "cat"])
+        self.assertEqual(list(words_classified), ["cat", "runs"])
+        self.assertEqual((pos_cache.hits, pos_cache.misses), (3, 0))
+
+        pos_cache.put("dog", frozenset('n'))
+        self.assertEqual(len(pos_cache), 2)
+        self.assertIsNone(pos_cache.get("runs"))
+        self.assertEqual(pos_cache.misses, 1)
+
     @classmethod
     def __load_prs(cls, path_to_presentation):
         return Presentation(path_to_presentation)
@@ -0,0 +1,68 @@
+"""Tests the profiling report defined in profiling.py"""
+
+import glob
+import json
+import time
+import unittest
+from unittest import mock
+from pptx import Presentation
+from engine import build_deck_snapshot
+from pptchecker import check_presentation
+from profiling import profile_presentation
+from rules import SLIDE_RULES, ContrastVisitor
+from util import read_config_yaml
+from helpers import WordListLexicon
+
+
+class ProfilingTest(WordListLexicon, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = read_config_yaml("./config/default.yaml")
+
+    def test_same_findings(self):
+        for path in sorted(glob.glob("./test/test_pptx/*.pptx")):
+            with self.subTest(path=path):
+                findings, _ = profile_presentation(Presentation(path), self.config, self.wordset)
+                self.assertEqual(findings, check_presentation(Presentation(path), self.config,
+                                                              self.wordset))
+
+    def test_report(self):
+        deck = build_deck_snapshot(Presentation("./test/test_pptx/bad.pptx"))
+        _, profile = profile_presentation(deck, self.config, self.wordset)
+        report = json.loads(json.dumps(profile.to_dict()))
+
+        for rule in SLIDE_RULES:
+            self.assertEqual(report["rules"][rule]["calls"], deck.num_active_slides)
+        self.assertIn("estimate_presentation_length", report["rules"])
+        self.assertIn("must_end_with_summary_slide", report["rules"])
+
+        self.assertEqual(report["counters"]["shapes"],
+                         sum(len(slide.shapes) for slide in deck.slides))
+        self.assertEqual(report["counters"]["runs"],
+                         sum(len(shape.runs) for slide in deck.slides for shape in slide.shapes))
+        self.assertGreater(report["counters"]["contrast_computations"], 0)
+        self.assertGreater(report["counters"]["word_lookups"] +
+                           report["counters"]["word_cache_hits"], 0)
+
+        self.assertEqual(len(report["slides"]), deck.num_active_slides)
+        slowest = [slide["wall"] for slide in report["slowest_slides"]]
+        self.assertEqual(slowest, sorted(slowest, reverse=True))
+        self.assertIn("Slowest slides", profile.summary_table())
+
+    def test_visitor_setup_counts_towards_rule(self):
+        def slow_color_pairs(visitor, deck):
+            time.sleep(0.05)
+            return []
+
+        deck = build_deck_snapshot(Presentation("./test/test_pptx/bad.pptx"))
+        with mock.patch.object(ContrastVisitor, "collect_color_pairs", slow_color_pairs):
+            _, profile = profile_presentation(deck, self.config, self.wordset)
+        contrast = profile.rules["should_have_high_contrast_fonts_colours"]
+        self.assertGreaterEqual(contrast.wall, 0.05)
+        self.assertEqual(contrast.calls, deck.num_active_slides)
+        self.assertLess(profile.phases["setup"].wall, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
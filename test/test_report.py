@@ -0,0 +1,73 @@
+"""Tests the report writer defined in report.py"""
+
+import io
+import os
+import tempfile
+import unittest
+from report import write_feedback_table, write_report_file
+
+
+def make_findings(num_slides, failing):
+    display_info = {
+        "slide_feedback": [f"Problem on slide {index + 1}<br>" if index in failing else ""
+                           for index in range(num_slides)],
+        "slide_times": None,
+        "cumul_slide_times": None,
+        "general_feedback": "Please add slide numbers.<br>",
+    }
+    return None, display_info, not failing
+
+
+class ReportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.tmp_dir.name, "report.html")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read(self, path):
+        with open(path) as rfile:
+            return rfile.read()
+
+    def test_single_page(self):
+        findings = make_findings(5, {1, 3})
+        self.assertEqual(write_report_file(self.output_file, findings, page_size=5), [])
+        report = self.read(self.output_file)
+        self.assertIn("Please add slide numbers.", report)
+        self.assertEqual(report.count("<tr>"), 5)
+
+    def test_failures_only(self):
+        findings = make_findings(5, {1, 3})
+        wfile = io.StringIO()
+        write_feedback_table(wfile, findings[1], failures_only=True)
+        self.assertEqual(wfile.getvalue().count("<tr>"), 2)
+        self.assertIn("Problem on slide 4", wfile.getvalue())
+
+        write_report_file(self.output_file, findings, failures_only=True)
+        self.assertEqual(self.read(self.output_file).count("<tr>"), 2)
+
+    def test_pages(self):
+        findings = make_findings(25, {0, 12, 24})
+        pages = write_report_file(self.output_file, findings, page_size=10)
+        self.assertEqual([os.path.basename(path) for path in pages],
+                         ["report-1.html", "report-2.html", "report-3.html"])
+
+        index = self.read(self.output_file)
+        self.assertIn("Please add slide numbers.", index)
+        self.assertIn('<a href="report-2.html">2</a>', index)
+        self.assertIn("11-20", index)
+        self.assertEqual([self.read(path).count("<tr>") for path in pages], [10, 10, 5])
+        self.assertIn("Problem on slide 13", self.read(pages[1]))
+        self.assertIn('<a href="report-1.html">Previous</a>', self.read(pages[1]))
+        self.assertNotIn("Next", self.read(pages[2]))
+
+    def test_pages_failures_only(self):
+        findings = make_findings(1000, set(range(0, 1000, 100)))
+        pages = write_report_file(self.output_file, findings, failures_only=True, page_size=4)
+        self.assertEqual([self.read(path).count("<tr>") for path in pages], [4, 4, 2])
+        self.assertIn("801-901", self.read(self.output_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
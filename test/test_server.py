@@ -0,0 +1,68 @@
+"""Tests server mode and its client defined in server.py and client.py"""
+
+import glob
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pptx import Presentation
+from client import ServerError, check_remote, server_is_running
+from pptchecker import check_presentation
+from server import CheckServer, init_worker
+from util import DEFAULT_CONFIG_PATH, initialize_word_set, read_config_yaml
+from helpers import WordListLexicon
+
+
+class ServerTest(WordListLexicon, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.executor = ThreadPoolExecutor(max_workers=1, initializer=init_worker,
+                                          initargs=(DEFAULT_CONFIG_PATH, cls.lexicon_path))
+        cls.server = CheckServer(("127.0.0.1", 0), cls.executor, max_pending=4)
+        cls.server_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        cls.executor.shutdown()
+        super().tearDownClass()
+
+    def test_same_findings(self):
+        config = read_config_yaml(DEFAULT_CONFIG_PATH)
+        wordset = initialize_word_set(self.lexicon_path)
+        for path in sorted(glob.glob("./test/test_pptx/*.pptx")):
+            with self.subTest(path=path):
+                self.assertEqual(check_remote(path, self.server_url),
+                                 check_presentation(Presentation(path), config, wordset))
+
+    def test_server_is_running(self):
+        self.assertTrue(server_is_running(self.server_url))
+        self.assertFalse(server_is_running("http://127.0.0.1:9", timeout=0.2))
+
+    def test_bad_deck(self):
+        path = os.path.join(self.tmp_dir.name, "broken.pptx")
+        with open(path, "w") as wfile:
+            wfile.write("not a presentation")
+        with self.assertRaises(ServerError) as context:
+            check_remote(path, self.server_url)
+        self.assertEqual(context.exception.code, 400)
+
+    def test_busy(self):
+        for _ in range(self.server.max_pending):
+            self.server.pending.acquire()
+        try:
+            with self.assertRaises(ServerError) as context:
+                check_remote("./test/test_pptx/demo.pptx", self.server_url)
+            self.assertEqual(context.exception.code, 503)
+        finally:
+            for _ in range(self.server.max_pending):
+                self.server.pending.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
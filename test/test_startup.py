@@ -0,0 +1,13 @@
+"""Tests that importing PPTChecker does not load heavy modules"""
+
+import unittest
+from benchmarks.import_time import measure_import
+
+
+class StartupTest(unittest.TestCase):
+    def test_heavy_modules_are_lazy(self):
+        self.assertEqual(measure_import()["loaded"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests theme colour and background resolution defined in theme.py"""
+
+import unittest
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.util import Inches, Pt
+from engine import build_deck_snapshot
+from rules import should_have_high_contrast_fonts_colours
+from util import read_config_yaml
+
+
+def build_dark_background_deck(on_layout):
+    prs = Presentation()
+    layout = prs.slide_layouts[6]
+    if on_layout:
+        layout.background.fill.solid()
+        layout.background.fill.fore_color.rgb = RGBColor(0x10, 0x10, 0x10)
+
+    slide = prs.slides.add_slide(layout)
+    if not on_layout:
+        slide.background.fill.solid()
+        slide.background.fill.fore_color.rgb = RGBColor(0x10, 0x10, 0x10)
+
+    run = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1)
+                                   ).text_frame.paragraphs[0].add_run()
+    run.text = "Dark"
+    run.font.size = Pt(28)
+    run.font.color.theme_color = MSO_THEME_COLOR.TEXT_1
+    return prs
+
+
+class ThemeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = read_config_yaml("./config/default.yaml")
+
+    def test_theme_colors(self):
+        deck = build_deck_snapshot(build_dark_background_deck(on_layout=False))
+        run_color = deck.slides[0].shapes[0].runs[0].color
+        # The default template maps tx1 to dk1, which is the windowText system colour
+        self.assertEqual(run_color.rgb, "000000")
+
+    def test_slide_background(self):
+        prs = build_dark_background_deck(on_layout=False)
+        self.assertEqual(build_deck_snapshot(prs).slides[0].background_rgb, "101010")
+
+        slide_feedback = [""]
+        self.assertFalse(should_have_high_contrast_fonts_colours(prs, self.config,
+                                                                 slide_feedback))
+        self.assertIn("Font colour contrast", slide_feedback[0])
+
+    def test_inherited_background(self):
+        prs = build_dark_background_deck(on_layout=True)
+        self.assertEqual(build_deck_snapshot(prs).slides[0].background_rgb, "101010")
+
+        slide_feedback = [""]
+        self.assertFalse(should_have_high_contrast_fonts_colours(prs, self.config,
+                                                                 slide_feedback))
+
+    def test_multiple_masters(self):
+        prs = Presentation("./test/test_pptx/perfect_googleslides.pptx")
+        self.assertEqual(len(prs.slide_masters), 2)
+        deck = build_deck_snapshot(prs)
+        self.assertTrue(all(slide.background_rgb == "FFFFFF" for slide in deck.slides))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests watch mode defined in watch.py"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from watch import PresentationWatcher
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+class WatchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "deck.pptx")
+        shutil.copy("./test/test_pptx/demo.pptx", self.path)
+
+        self.checked = []
+        self.watcher = PresentationWatcher(self.path, self.check, port=0,
+                                           poll_interval=0.02, settle_time=0.05)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.watcher.run, args=(self.stop_event,))
+        self.thread.start()
+
+    def tearDown(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.watcher.close()
+        self.tmp_dir.cleanup()
+
+    def check(self, path):
+        with open(path, "rb") as rfile:
+            self.checked.append(len(rfile.read()))
+        display_info = {"slide_feedback": [f"Check {len(self.checked)}"], "slide_times": None,
+                        "cumul_slide_times": None, "general_feedback": ""}
+        return None, display_info, False
+
+    def wait_for_version(self, version):
+        deadline = time.monotonic() + 5
+        while self.watcher.live_report.version < version:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_live_report(self):
+        self.wait_for_version(1)
+        self.assertEqual(fetch(self.watcher.url + "version"), "1")
+        self.assertIn("Check 1", fetch(self.watcher.url))
+
+        shutil.copy("./test/test_pptx/bad.pptx", self.path)
+        self.wait_for_version(2)
+        self.assertIn("Check 2", fetch(self.watcher.url))
+        self.assertEqual(self.checked[-1], os.path.getsize("./test/test_pptx/bad.pptx"))
+
+    def test_partial_write_is_not_checked(self):
+        self.wait_for_version(1)
+        with open(self.path, "wb") as wfile:
+            wfile.write(b"PK\x03\x04 half written")
+        time.sleep(0.3)
+        self.assertEqual(len(self.checked), 1)
+
+        shutil.copy("./test/test_pptx/bad.pptx", self.path)
+        self.wait_for_version(2)
+        self.assertEqual(len(self.checked), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
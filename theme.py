@@ -0,0 +1,192 @@
+"""Theme colour resolution for PPTChecker
+
+Each slide master's theme is parsed once. Scheme colours are resolved
+through the master's colour map (and any slide or layout override), and
+every (colour, brightness) combination is computed once and then served
+from a lookup table. Slide backgrounds are resolved through the
+slide -> layout -> master inheritance chain.
+"""
+
+from lxml import etree
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from util import adjust_brightness
+
+# python-pptx theme colour values to DrawingML scheme colour names. Non-theme
+# colours (0) fall back to the first scheme colour, as before.
+THEME_COLOR_NAMES = {
+    MSO_THEME_COLOR.NOT_THEME_COLOR: "dk1",
+    MSO_THEME_COLOR.DARK_1: "dk1",
+    MSO_THEME_COLOR.LIGHT_1: "lt1",
+    MSO_THEME_COLOR.DARK_2: "dk2",
+    MSO_THEME_COLOR.LIGHT_2: "lt2",
+    MSO_THEME_COLOR.ACCENT_1: "accent1",
+    MSO_THEME_COLOR.ACCENT_2: "accent2",
+    MSO_THEME_COLOR.ACCENT_3: "accent3",
+    MSO_THEME_COLOR.ACCENT_4: "accent4",
+    MSO_THEME_COLOR.ACCENT_5: "accent5",
+    MSO_THEME_COLOR.ACCENT_6: "accent6",
+    MSO_THEME_COLOR.HYPERLINK: "hlink",
+    MSO_THEME_COLOR.FOLLOWED_HYPERLINK: "folHlink",
+    MSO_THEME_COLOR.TEXT_1: "tx1",
+    MSO_THEME_COLOR.BACKGROUND_1: "bg1",
+    MSO_THEME_COLOR.TEXT_2: "tx2",
+    MSO_THEME_COLOR.BACKGROUND_2: "bg2",
+}
+
+DEFAULT_COLOR_MAP = {"bg1": "lt1", "tx1": "dk1", "bg2": "lt2", "tx2": "dk2"}
+
+
+def localname(element):
+    return etree.QName(element).localname
+
+
+def read_brightness(color_element):
+    # Same convention as python-pptx's ColorFormat.brightness
+    lum_off = color_element.find(qn("a:lumOff"))
+    if lum_off is not None:
+        return int(lum_off.get("val")) / 100000.0
+    lum_mod = color_element.find(qn("a:lumMod"))
+    if lum_mod is not None:
+        return int(lum_mod.get("val")) / 100000.0 - 1.0
+    return 0
+
+
+def read_color_map(element):
+    if element is None:
+        return None
+    return {alias: name for alias, name in element.attrib.items()}
+
+
+class ColorContext:
+    """Scheme colours of one theme under one colour map."""
+
+    def __init__(self, theme_element, color_map):
+        base = {}
+        clr_scheme = theme_element.find(f"{qn('a:themeElements')}/{qn('a:clrScheme')}")
+        for slot in clr_scheme:
+            if not len(slot):
+                continue
+            entry = slot[0]
+            if localname(entry) == "sysClr":
+                base[localname(slot)] = entry.get("lastClr")
+            elif localname(entry) == "srgbClr":
+                base[localname(slot)] = entry.get("val")
+
+        self.scheme = dict(base)
+        for alias, name in {**DEFAULT_COLOR_MAP, **(color_map or {})}.items():
+            if name in base:
+                self.scheme[alias] = base[name]
+
+        bg_fill_styles = theme_element.find(
+            f"{qn('a:themeElements')}/{qn('a:fmtScheme')}/{qn('a:bgFillStyleLst')}")
+        self.bg_fill_styles = list(bg_fill_styles) if bg_fill_styles is not None else []
+        self._table = {}
+
+    def rgb(self, name, brightness=0):
+        key = (name, brightness)
+        color_rgb = self._table.get(key)
+        if color_rgb is None:
+            color_rgb = self.scheme.get(name)
+            if color_rgb and brightness:
+                color_rgb = adjust_brightness(color_rgb, brightness)
+            self._table[key] = color_rgb
+        return color_rgb
+
+    def theme_color_rgb(self, theme_color, brightness=0):
+        return self.rgb(THEME_COLOR_NAMES.get(theme_color, "dk1"), brightness)
+
+    def xml_color_rgb(self, color_element, placeholder=None):
+        """Resolve a DrawingML colour element; phClr resolves to placeholder."""
+        tag = localname(color_element)
+        if tag == "srgbClr":
+            return color_element.get("val")
+        if tag == "sysClr":
+            return color_element.get("lastClr")
+        if tag == "schemeClr":
+            name = color_element.get("val")
+            if name == "phClr":
+                if placeholder is None:
+                    return None
+                return self.xml_color_rgb(placeholder)
+            return self.rgb(name, read_brightness(color_element))
+        return None
+
+    def fill_rgb(self, fill_element, placeholder=None):
+        """RGB of a solid fill element, or None for any other kind of fill."""
+        if fill_element is None or localname(fill_element) != "solidFill":
+            return None
+        if not len(fill_element):
+            return None
+        return self.xml_color_rgb(fill_element[0], placeholder)
+
+    def background_rgb(self, bg_element):
+        """RGB of a solid p:bg background, or None if it is not solid."""
+        bg_pr = bg_element.find(qn("p:bgPr"))
+        if bg_pr is not None:
+            return self.fill_rgb(bg_pr[0] if len(bg_pr) else None)
+
+        bg_ref = bg_element.find(qn("p:bgRef"))
+        if bg_ref is not None:
+            idx = int(bg_ref.get("idx", 0))
+            if 1001 <= idx < 1001 + len(self.bg_fill_styles):
+                placeholder = bg_ref[0] if len(bg_ref) else None
+                return self.fill_rgb(self.bg_fill_styles[idx - 1001], placeholder)
+        return None
+
+
+def effective_color_map(master_element, override_elements):
+    """Master p:clrMap, replaced by the last p:clrMapOvr that overrides it."""
+    color_map = read_color_map(master_element.find(qn("p:clrMap")))
+    for override_element in override_elements:
+        if override_element is None:
+            continue
+        override = override_element.find(qn("a:overrideClrMapping"))
+        if override is not None:
+            color_map = read_color_map(override)
+    return color_map
+
+
+def first_background(bg_elements, context):
+    """The first p:bg of slide, layout and master decides the background."""
+    for bg_element in bg_elements:
+        if bg_element is not None:
+            return context.background_rgb(bg_element)
+    return None
+
+
+class ThemeResolver:
+    """Builds and caches a ColorContext per (theme, colour map) in a deck."""
+
+    def __init__(self):
+        self._themes = {}
+        self._contexts = {}
+
+    def get_context(self, theme_key, load_theme, color_map):
+        theme_element = self._themes.get(theme_key)
+        if theme_element is None:
+            theme_element = etree.fromstring(load_theme())
+            self._themes[theme_key] = theme_element
+
+        key = (theme_key, tuple(sorted((color_map or {}).items())))
+        context = self._contexts.get(key)
+        if context is None:
+            context = ColorContext(theme_element, color_map)
+            self._contexts[key] = context
+        return context
+
+    def context_for_slide(self, slide):
+        layout = slide.slide_layout
+        master = layout.slide_master
+        theme_part = master.part.part_related_by(RT.THEME)
+
+        color_map = effective_color_map(master._element,
+                                        [layout._element.find(qn("p:clrMapOvr")),
+                                         slide._element.find(qn("p:clrMapOvr"))])
+        return self.get_context(theme_part.partname, lambda: theme_part.blob, color_map)
+
+    def background_for_slide(self, slide, context):
+        layout = slide.slide_layout
+        return first_background([slide._element.cSld.bg, layout._element.cSld.bg,
+                                 layout.slide_master._element.cSld.bg], context)
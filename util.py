@@ -1,40 +1,61 @@
 """Helper methods for PPTChecker"""
 
 import colorsys
+import os
 import string
-import webbrowser
-import yaml
-import numpy as np
-import pandas as pd
-from pretty_html_table import build_table
+from collections import OrderedDict
+
+from lexicon import (
+    LEXICON_PATH,
+    PREPOSITION,
+    VERB,
+    Lexicon,
+    parts_of_speech_from_flags,
+    wordnet_parts_of_speech,
+)
+from report import (
+    DEFAULT_PAGE_SIZE,
+    write_feedback_table,
+    write_general_feedback,
+    write_report_file,
+)
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CONFIG_PATH = os.path.join(PACKAGE_DIR, "config", "default.yaml")
+
+
+def read_config_yaml(yaml_file_path=DEFAULT_CONFIG_PATH):
+    import yaml
 
-from nltk.corpus import wordnet
-
-from pptx.enum.dml import MSO_THEME_COLOR
-from pptx.opc.constants import RELATIONSHIP_TYPE as RT
-from pptx.oxml import parse_xml
-
-
-def read_config_yaml(yaml_file_path):
     with open(yaml_file_path, "r") as yaml_file:
         config = yaml.safe_load(yaml_file)
     return config
 
 
-def get_slide_notes(slide):
-    result = ""
-    num_breaks = 0
+# Each of these marks a pause when the notes are read out
+PAUSE_MARKS = ('.', '?', '!')
+DROP_PAUSE_MARKS = str.maketrans("", "", "".join(PAUSE_MARKS))
 
-    if slide.notes_slide:
-        for paragraph in slide.notes_slide.notes_text_frame.paragraphs:
-            for run in paragraph.runs:
-                if '[' in run.text and ']' in run.text:
-                    if "[Break]" in run.text:
-                        num_breaks += 1
-                    continue
-                result += run.text + "\n"
 
-    return result, num_breaks
+def count_notes(notes_runs):
+    """(has_notes, words, pauses per PAUSE_MARKS, breaks) of a slide's speaker notes."""
+    lines = []
+    num_breaks = 0
+    for run_text in notes_runs:
+        if '[' in run_text and ']' in run_text:
+            if "[Break]" in run_text:
+                num_breaks += 1
+            continue
+        lines.append(run_text)
+    if not lines:
+        return False, 1, (0,) * len(PAUSE_MARKS), num_breaks
+
+    notes = "\n".join(lines)
+    pauses = tuple(notes.count(mark) for mark in PAUSE_MARKS)
+    # Every pause mark is dropped in one pass; words are separated by
+    # single spaces only, as in the original estimate
+    words = notes.translate(DROP_PAUSE_MARKS)
+    return True, words.strip().count(" ") + 1, pauses, num_breaks
 
 
 def is_backup_slide(slide):
@@ -46,62 +67,21 @@ def is_backup_slide(slide):
     return False
 
 
-def within_bounds(prev_shape_pos, curr_shape_pos, shape_pos_threshold, slide_width, slide_height):
-    prev_shape_pos_x = prev_shape_pos[0]
-    prev_shape_pos_y = prev_shape_pos[1]
-    curr_shape_pos_x = curr_shape_pos[0]
-    curr_shape_pos_y = curr_shape_pos[1]
-
-    step_x = slide_width * shape_pos_threshold
-    step_y = slide_height * shape_pos_threshold
-
-    shape_min_x = prev_shape_pos_x - step_x
-    shape_max_x = prev_shape_pos_x + step_x
-    shape_min_y = prev_shape_pos_y - step_y
-    shape_max_y = prev_shape_pos_y + step_y
-
-    return (shape_min_x <= curr_shape_pos_x <= shape_max_x and
-            shape_min_y <= curr_shape_pos_y <= shape_max_y)
+def adjust_brightness(color_rgb, brightness):
+    import numpy as np
 
-
-# Solution from https://groups.google.com/g/python-pptx/c/iTaK8if8Dck
-def get_color_scheme(prs):
-    presentation_part = prs.part
-    theme_part = presentation_part.part_related_by(RT.THEME)
-    theme_element = parse_xml(theme_part.blob)
-    xpath = 'a:themeElements/a:clrScheme'
-    color_scheme = theme_element.xpath(xpath)[0]
-    return color_scheme
-
-
-def get_scheme_color_rgb(color_scheme, theme_color, brightness):
-    theme_color_wrap_around = int(MSO_THEME_COLOR.FOLLOWED_HYPERLINK)
-    if theme_color >= MSO_THEME_COLOR.DARK_1:
-        entry = color_scheme[theme_color - theme_color_wrap_around - 1][0]
-    elif theme_color == 0:
-        entry = color_scheme[theme_color][0]
+    color_code = get_hex_code(color_rgb)
+    srgb = np.array(color_code)
+    srgb = srgb / 255
+    hue, luminance, sat = colorsys.rgb_to_hls(*srgb)
+    if brightness > 0:
+        luminance = luminance * (1 - brightness) + (brightness)
     else:
-        entry = color_scheme[theme_color - 1][0]
-    if entry.tag[-6:] == 'sysClr':
-        color_rgb = entry.get('lastClr')
-    elif entry.tag[-7:] == 'srgbClr':
-        color_rgb = entry.get('val')
-
-    if brightness:
-        color_code = get_hex_code(color_rgb)
-        srgb = np.array(color_code)
-        srgb = srgb / 255
-        hue, luminance, sat = colorsys.rgb_to_hls(*srgb)
-        if brightness > 0:
-            luminance = luminance * (1 - brightness) + (brightness)
-        else:
-            luminance = luminance * (1 + brightness)
-        srgb = np.array(colorsys.hls_to_rgb(hue, luminance, sat))
-        srgb = (srgb * 255).round(0).astype(int)
-        rgb2hex = lambda r,g,b: '%02X%02X%02X' %(r,g,b)
-        return rgb2hex(*srgb)
-
-    return color_rgb
+        luminance = luminance * (1 + brightness)
+    srgb = np.array(colorsys.hls_to_rgb(hue, luminance, sat))
+    srgb = (srgb * 255).round(0).astype(int)
+    rgb2hex = lambda r,g,b: '%02X%02X%02X' %(r,g,b)
+    return rgb2hex(*srgb)
 
 
 def get_hex_code(color):
@@ -139,23 +119,64 @@ def calculate_contrast_ratio(color_a, color_b):
 
 def load_words(part_type):
     result = []
-    with open(f"./data/{part_type}.txt") as part_file:
+    with open(os.path.join(PACKAGE_DIR, "data", f"{part_type}.txt")) as part_file:
         for word in part_file:
             result.append(word.strip())
     return result
 
 
+class PartsOfSpeechCache:
+    """Bounded LRU cache of word -> parts of speech, with hit/miss counters."""
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, word):
+        pos_l = self._entries.get(word)
+        if pos_l is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(word)
+        return pos_l
+
+    def put(self, word, pos_l):
+        self._entries[word] = pos_l
+        self._entries.move_to_end(word)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries.clear()
+
+
 class WordSet:
-    def __init__(self, verbs, prepositions, articles):
+    # pos_cache is kept with the word lists so that it is reused for every
+    # deck checked with the same WordSet (e.g. per batch worker)
+    def __init__(self, verbs, prepositions, articles, pos_cache=None, lexicon=None):
         self.verbs = verbs
         self.prepositions = prepositions
         self.articles = articles
+        self.pos_cache = pos_cache if pos_cache is not None else PartsOfSpeechCache()
+        self.lexicon = lexicon
 
 
-def initialize_word_set():
-    verbs = load_words("verbs")
-    prepositions = load_words("prepositions")
+def initialize_word_set(lexicon_path=LEXICON_PATH):
     articles = ['the', 'a', 'an']
+    # Prefer the compiled lexicon, which needs neither the word lists nor WordNet
+    if lexicon_path and os.path.exists(lexicon_path):
+        return WordSet(frozenset(), frozenset(), articles,
+                       lexicon=Lexicon(lexicon_path))
+    verbs = frozenset(load_words("verbs"))
+    prepositions = frozenset(load_words("prepositions"))
     return WordSet(verbs, prepositions, articles)
 
 
@@ -170,39 +191,51 @@ def convert_string_into_word_tokens(wordtext):
 
 
 def identify_parts_of_speech(wordset, word_list):
-    verbs = wordset.verbs
-    prepositions = wordset.prepositions
-    articles = wordset.articles
+    pos_cache = wordset.pos_cache
 
     pos_all = {}
     for word in word_list:
-        pos_l = set()
-        for tmp in wordnet.synsets(word):
-            if tmp.name().split('.')[0] == word:
-                pos_l.add(tmp.pos())
-        if word in prepositions:
-            pos_l.add('p')
-        elif word in articles:
-            pos_l.clear()
-            pos_l.add('at')
-        elif word in verbs:
-            pos_l.clear()
-            pos_l.add('v')
-            if word.endswith("ing"):
-                pos_l.add('n')
-        elif word.endswith("ing"):
-            pos_l.add('a')
-            pos_l.add('n')
-            pos_l.add('v')
-        elif word.endswith("ed"):
-            pos_l.clear()
-            pos_l.add('a')
-        elif not pos_l:
-            pos_l.add('n')
+        pos_l = pos_cache.get(word)
+        if pos_l is None:
+            pos_l = classify_word(wordset, word)
+            pos_cache.put(word, pos_l)
         pos_all[word] = pos_l
     return pos_all
 
 
+def classify_word(wordset, word):
+    if wordset.lexicon is not None:
+        flags = wordset.lexicon.lookup(word)
+        pos_l = parts_of_speech_from_flags(flags)
+        is_preposition = bool(flags & PREPOSITION)
+        is_verb = bool(flags & VERB)
+    else:
+        pos_l = wordnet_parts_of_speech(word)
+        is_preposition = word in wordset.prepositions
+        is_verb = word in wordset.verbs
+
+    if is_preposition:
+        pos_l.add('p')
+    elif word in wordset.articles:
+        pos_l.clear()
+        pos_l.add('at')
+    elif is_verb:
+        pos_l.clear()
+        pos_l.add('v')
+        if word.endswith("ing"):
+            pos_l.add('n')
+    elif word.endswith("ing"):
+        pos_l.add('a')
+        pos_l.add('n')
+        pos_l.add('v')
+    elif word.endswith("ed"):
+        pos_l.clear()
+        pos_l.add('a')
+    elif not pos_l:
+        pos_l.add('n')
+    return frozenset(pos_l)
+
+
 def is_full_sentence(classified_words):
     # Find patterns where: 'n','v','n'
     word_count = 0
@@ -223,29 +256,30 @@ def is_full_sentence(classified_words):
     return sentence_comp_count >= 3
 
 
+def display_findings(findings, output_file, open_browser=True, failures_only=False,
+                     page_size=DEFAULT_PAGE_SIZE):
+    time_estimate, display_info, pass_all_checks = findings
+    if time_estimate:
+        print("Estimate total time for presentation: ", time_estimate)
+    else:
+        print("Cannot estimate presentation time without any speaker notes provided!\n")
+
+    display_comments_on_webpage(time_estimate, display_info,
+                                pass_all_checks, output_file, open_browser,
+                                failures_only, page_size)
+
+
 def display_comments_on_webpage(time_estimate, display_info,
-                                pass_all_checks, output_file):
-    dataframe = pd.DataFrame(display_info["slide_feedback"], columns=["Feedback"])
-    dataframe.index += 1
-    dataframe = dataframe.rename_axis("Slide #").reset_index()
-    dataframe["Time at Slide Start"] = display_info["cumul_slide_times"]
-    dataframe["Time Spent on Slide"] = display_info["slide_times"]
-
-    html_table_blue_light = build_table(dataframe, 'blue_dark',
-                                        index=False, escape=False)
-    with open(output_file, 'w') as wfile:
-        wfile.write("<h3>General Feedback:</h3>")
-        if time_estimate:
-            wfile.write(f"Estimate total time for presentation: {time_estimate}")
-
-        general_feedback = display_info["general_feedback"]
-
-        if not general_feedback and pass_all_checks:
-            wfile.write("<p>Presentation passed all checks!</p>")
-        else:
-            wfile.write("<p>" + general_feedback + "</p>")
+                                pass_all_checks, output_file, open_browser=True,
+                                failures_only=False, page_size=DEFAULT_PAGE_SIZE):
+    write_report_file(output_file, (time_estimate, display_info, pass_all_checks),
+                      failures_only, page_size)
 
-        wfile.write(html_table_blue_light)
+    if open_browser:
+        import webbrowser
+        webbrowser.open_new_tab(output_file)
 
-    webbrowser.open_new_tab(output_file)
 
+def write_report(wfile, time_estimate, display_info, pass_all_checks, failures_only=False):
+    write_general_feedback(wfile, time_estimate, display_info, pass_all_checks)
+    write_feedback_table(wfile, display_info, failures_only)
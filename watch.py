@@ -0,0 +1,167 @@
+"""Watch mode for PPTChecker
+
+Keeps the checker (word set, per-slide cache) loaded and polls the
+presentation for saves. A save is only checked once the file has stopped
+changing and is a complete zip, so half-written files are never read. The
+report is served from a local port as a single page that reloads itself
+whenever a newer report is ready, instead of opening a new browser tab per
+run.
+"""
+
+import html
+import io
+import os
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from util import write_report
+
+DEFAULT_PORT = 8765
+POLL_INTERVAL = 0.2
+# A save is only read once the file has been unchanged for this long
+SETTLE_TIME = 0.3
+
+REFRESH_SCRIPT = """<script>
+(function () {
+  var version = "%d";
+  setInterval(function () {
+    fetch("/version", {cache: "no-store"}).then(function (response) {
+      return response.text();
+    }).then(function (latest) {
+      if (latest !== version) { location.reload(); }
+    }).catch(function () {});
+  }, 500);
+})();
+</script>"""
+
+
+class LiveReport:
+    """Latest report body and its version, shared with the HTTP server."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.body = "<p>Checking presentation...</p>"
+
+    def update(self, body):
+        with self._lock:
+            self.version += 1
+            self.body = body
+
+    def page(self):
+        with self._lock:
+            return self.body + REFRESH_SCRIPT % self.version
+
+
+def render_findings(findings):
+    time_estimate, display_info, pass_all_checks = findings
+    wfile = io.StringIO()
+    write_report(wfile, time_estimate, display_info, pass_all_checks)
+    return wfile.getvalue()
+
+
+def render_error(path_to_presentation, err, previous_body):
+    return (f"<p><b>Could not check {html.escape(path_to_presentation)}: "
+            f"{html.escape(type(err).__name__)}: {html.escape(str(err))}</b></p>"
+            + previous_body)
+
+
+def make_handler(live_report):
+    class ReportHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/version":
+                self.respond(str(live_report.version), "text/plain")
+            elif self.path in ("/", "/index.html"):
+                self.respond(live_report.page(), "text/html")
+            else:
+                self.send_error(404)
+
+        def respond(self, text, content_type):
+            body = text.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return ReportHandler
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PresentationWatcher:
+    """Re-checks a presentation on every save and serves the live report.
+
+    check is called with the path and returns the same tuple as
+    check_presentation.
+    """
+
+    def __init__(self, path_to_presentation, check, port=DEFAULT_PORT,
+                 poll_interval=POLL_INTERVAL, settle_time=SETTLE_TIME):
+        self.path_to_presentation = path_to_presentation
+        self.check = check
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.live_report = LiveReport()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(self.live_report))
+        self.server.daemon_threads = True
+        self._server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._server_thread.start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def check_once(self):
+        start = time.perf_counter()
+        try:
+            findings = self.check(self.path_to_presentation)
+        except Exception as err:
+            # Keep showing the last good report until the next save
+            self.live_report.update(render_error(self.path_to_presentation, err,
+                                                 self.live_report.body))
+            print(f"Could not check {self.path_to_presentation}: {err}")
+            return
+        self.live_report.update(render_findings(findings))
+        print(f"Checked {self.path_to_presentation} in {time.perf_counter() - start:.2f}s")
+
+    def wait_for_save(self, last_signature, stop_event):
+        """Block until the file differs from last_signature and has settled."""
+        signature = file_signature(self.path_to_presentation)
+        settled_at = time.monotonic()
+        while not stop_event.is_set():
+            if (signature is not None and signature != last_signature and
+                    time.monotonic() - settled_at >= self.settle_time and
+                    zipfile.is_zipfile(self.path_to_presentation)):
+                return signature
+            stop_event.wait(self.poll_interval)
+            current = file_signature(self.path_to_presentation)
+            if current != signature:
+                signature = current
+                settled_at = time.monotonic()
+        return None
+
+    def run(self, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        last_signature = None
+        while not stop_event.is_set():
+            signature = self.wait_for_save(last_signature, stop_event)
+            if signature is None:
+                break
+            last_signature = signature
+            self.check_once()